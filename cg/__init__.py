@@ -0,0 +1 @@
+from cg.batch import canonical_forms
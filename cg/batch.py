@@ -0,0 +1,131 @@
+import multiprocessing as mp
+import os
+import queue
+from collections import deque
+from itertools import islice
+
+from cg.universe import GameUniverse
+
+
+def canonical_forms(games, workers=None, chunksize=256, ordered=False, cache_size=None):
+    """Compute the canonical forms of many games.
+
+    The games are sent to the workers in chunks of CGN strings. Each worker reduces
+    the games in its own :py:class:`~cg.universe.GameUniverse`, which it keeps for
+    the whole run, so options that are shared between games are reduced only once
+    per worker. Results are streamed: only a few chunks per
+    worker are in flight at any time, so `games` can be a large generator.
+
+    Parameters
+    ----------
+    games : iterable of str or Game
+        The games to reduce, as CGN or as :py:class:`~cg.game.Game`.
+
+    workers : int, optional
+        The number of worker processes. Defaults to the number of CPUs.
+        When 1, the games are reduced in this process, in a new universe.
+
+    chunksize : int, optional
+        The number of games sent to a worker at once. Defaults to 256.
+
+    ordered : bool, optional
+        When :py:const:`True`, the results are yielded in the order of `games`.
+        Otherwise, results are yielded as soon as a chunk is finished.
+        Defaults to :py:const:`False`.
+
+    cache_size : int, optional
+        The maximum number of entries in each table of the universes of the workers.
+
+    Yields
+    ------
+    game : str
+        The game in CGN, as given or as serialised from the :py:class:`~cg.game.Game`.
+
+    canonical : str
+        The canonical form of the game in CGN.
+
+    Examples
+    --------
+    >>> for game, canonical in canonical_forms(["{*|*}", "{^,*|0}"], workers=2, ordered=True):
+    ...     print(game, canonical)
+    {*|*} 0
+    {^,*|0} ^*
+    """
+    if chunksize < 1:
+        raise ValueError("The chunk size must be positive.")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    chunks = _chunks((g if isinstance(g, str) else str(g) for g in games), chunksize)
+
+    if workers <= 1:
+        # Reduce in this process, the default universe is not changed
+        universe = _new_universe(cache_size)
+        for chunk in chunks:
+            yield from _reduce(chunk, universe)
+        return
+
+    # Limit the number of chunks in flight, so the input is consumed lazily
+    window = 2 * workers
+    with mp.Pool(workers, initializer=_init_worker, initargs=(cache_size,)) as pool:
+        if ordered:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.apply_async(_canonical_chunk, (chunk,)))
+                if len(pending) >= window:
+                    yield from pending.popleft().get()
+            while pending:
+                yield from pending.popleft().get()
+        else:
+            finished = queue.SimpleQueue()
+            in_flight = 0
+            for chunk in chunks:
+                pool.apply_async(
+                    _canonical_chunk, (chunk,), callback=finished.put, error_callback=finished.put
+                )
+                in_flight += 1
+                if in_flight >= window:
+                    yield from _result(finished.get())
+                    in_flight -= 1
+            while in_flight:
+                yield from _result(finished.get())
+                in_flight -= 1
+
+
+def _chunks(iterable, size):
+    # Split an iterable in lists of at most `size` items
+    it = iter(iterable)
+    chunk = list(islice(it, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(it, size))
+
+
+def _new_universe(cache_size):
+    # All tables of the universe are bounded by the cache size
+    return GameUniverse() if cache_size is None else GameUniverse(table_size=cache_size)
+
+
+def _init_worker(cache_size):
+    # Create the universe of this process
+    global _universe
+    _universe = _new_universe(cache_size)
+
+
+def _canonical_chunk(chunk):
+    # Reduce a chunk of games, the tables of the universe stay warm between chunks
+    return _reduce(chunk, _universe)
+
+
+def _reduce(chunk, universe):
+    return [(cgn, str(universe.canonical_form(universe.from_cgn(cgn)))) for cgn in chunk]
+
+
+def _result(result):
+    # Raise the exception of a failed chunk
+    if isinstance(result, BaseException):
+        raise result
+    return result
+
+
+# The universe of a worker process, see _init_worker
+_universe = None
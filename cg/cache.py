@@ -0,0 +1,146 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+class Cache:
+    """A mapping with a bounded size that keeps statistics of its lookups.
+
+    When the cache is full, the least recently used entry is evicted
+    to make room for a new one.
+
+    Attributes
+    ----------
+    max_size : int
+        The maximum number of entries in the cache.
+
+    hits : int
+        The number of lookups that found an entry.
+
+    misses : int
+        The number of lookups that did not find an entry.
+
+    evictions : int
+        The number of entries that were evicted because the cache was full.
+    """
+
+    def __init__(self, max_size=2 ** 20):
+        if max_size < 1:
+            raise ValueError("The maximum size must be positive.")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __setitem__(self, key, value):
+        if key in self._data:
+            self._data.move_to_end(key)
+        elif len(self._data) >= self.max_size:
+            # Evict the least recently used entry
+            self._data.popitem(last=False)
+            self.evictions += 1
+        self._data[key] = value
+
+    def get(self, key, default=None):
+        """Look up an entry and update the statistics.
+
+        Parameters
+        ----------
+        key : hashable
+            The key of the entry.
+
+        default : object, optional
+            The value to return when there is no entry for `key`.
+
+        Returns
+        -------
+        value : object
+            The value of the entry, or `default` when it is missing.
+        """
+        value = self._data.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._data.move_to_end(key)
+        return value
+
+    def resize(self, max_size):
+        """Change the maximum size of the cache.
+        When the cache holds more entries, the least recently used ones are evicted.
+
+        Parameters
+        ----------
+        max_size : int
+            The new maximum number of entries.
+        """
+        if max_size < 1:
+            raise ValueError("The maximum size must be positive.")
+        self.max_size = max_size
+        while len(self._data) > max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Remove all entries and reset the statistics."""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @contextmanager
+    def scoped(self, max_size=None):
+        """Use an empty cache within a with-block.
+        The entries and statistics from before the block are restored afterwards.
+
+        Parameters
+        ----------
+        max_size : int, optional
+            The maximum size within the block. Defaults to the current maximum size.
+
+        Yields
+        ------
+        cache : Cache
+            This cache.
+
+        Examples
+        --------
+        >>> with default_universe().canonicals.scoped(max_size=1024) as cache:
+        ...     g.canonical_form()
+        ...     print(cache.stats())
+        """
+        saved = (self._data, self.max_size, self.hits, self.misses, self.evictions)
+        self._data = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+        if max_size is not None:
+            self.resize(max_size)
+        try:
+            yield self
+        finally:
+            self._data, self.max_size, self.hits, self.misses, self.evictions = saved
+
+    def stats(self):
+        """Get the statistics of the cache.
+
+        Returns
+        -------
+        stats : dict
+            The number of `hits`, `misses` and `evictions`, the current `size` and the `max_size`.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "max_size": self.max_size,
+        }
+
+
+# Sentinel for missing entries, None can be a cached value
+_MISSING = object()
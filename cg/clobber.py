@@ -1,19 +1,81 @@
+import os
+from itertools import chain
+
+import numpy as np
+
+from cg.cache import Cache
 from cg.game import Game
+from cg.store import GameStore, write_games
+from cg.traversal import UNKNOWN, evaluate, refute
+from cg.universe import default_universe
 
 
 class Clobber(Game):
     """
+    The board is kept as two bitboards, integers with a bit for the stones of
+    Left and of Right. The cell in row `i` and column `j` is bit ``i * columns + j``.
+    Moves are generated with shifts and masks of the bitboards, so the options
+    are created without any string operations. The board strings are only
+    used for input and output.
+
+    The options of a position are generated from its board when they are first
+    accessed and then cached, so only the positions that are visited are created.
+
+    The stones that are connected horizontally or vertically form groups. Stones
+    never move out of their group, so a board with multiple groups is the
+    disjunctive sum of its groups, see :py:meth:`components`. Groups with stones
+    of one colour have no moves and are equal to 0.
+
+    Outcomes and canonical forms are kept in the transposition table
+    :py:attr:`table`, which stores equivalent positions once, see :py:class:`ClobberTable`.
+
     Attributes
     ----------
     board
     rows
     columns
+    table
     """
 
+    _lazy_options = True
+    # Whether options were assigned, then the position is not described by its board
+    _assigned = False
+
     def __init__(self, board=""):
         self.board = board
-        self.left_options = [Clobber(b) for b in self.moves("L")]
-        self.right_options = [Clobber(b) for b in self.moves("R")]
+        # The options are generated when first accessed
+        self._left_options = None
+        self._right_options = None
+
+    @property
+    def left_options(self):
+        if self._left_options is None:
+            self._left_options = tuple(
+                self._position(left, right) for left, right in self._stone_moves("L")
+            )
+        return self._left_options
+
+    @left_options.setter
+    def left_options(self, options):
+        Game.left_options.fset(self, options)
+        self._assigned = True
+
+    @property
+    def right_options(self):
+        if self._right_options is None:
+            self._right_options = tuple(
+                self._position(left, right) for left, right in self._stone_moves("R")
+            )
+        return self._right_options
+
+    @right_options.setter
+    def right_options(self, options):
+        Game.right_options.fset(self, options)
+        self._assigned = True
+
+    def clear(self):
+        Game.clear(self)
+        self._assigned = True
 
     @property
     def board(self):
@@ -32,17 +94,63 @@ class Clobber(Game):
         if not all(len(row) == n for row in rows):
             raise ValueError("All rows must be the same length.")
 
-        self._board = rows if n else []
+        self._rows = len(rows) if n else 0
+        self._columns = n
+        # The first cell is the lowest bit, so the cells are read in reverse
+        cells = "".join(rows)[::-1]
+        self._left = int(cells.replace("R", "_").replace("L", "1").replace("_", "0") or "0", 2)
+        self._right = int(cells.replace("L", "_").replace("R", "1").replace("_", "0") or "0", 2)
+        self._key = None
+        self._groups = None
 
     @property
     def rows(self):
         """int: Number of rows of the board."""
-        return len(self._board)
+        return self._rows
 
     @property
     def columns(self):
         """int: Number of columns of the board."""
-        return len(self._board[0]) if self._board else 0
+        return self._columns
+
+    def _position(self, left, right):
+        # Create a position on the same board from its bitboards
+        return _board_position(self._rows, self._columns, left, right)
+
+    def _symmetry(self):
+        # Get the key of the position in the table and whether the position is negated
+        # Groups of one colour are equal to 0, so they are left out of the key
+        if self._key is None:
+            left = right = 0
+            for group_left, group_right in self._live_groups():
+                left |= group_left
+                right |= group_right
+            self._key = _symmetry_key(self._rows, self._columns, left, right)
+        return self._key
+
+    def _live_groups(self):
+        # Get the bitboards (left, right) of the groups with stones of both colours
+        if self._groups is None:
+            self._groups = _live_groups(self._rows, self._columns, self._left, self._right)
+        return self._groups
+
+    def components(self):
+        """Split the position into its independent components.
+
+        Every component is a group of connected stones with stones of both
+        colours, on a board of the same size. The position is equal to the sum
+        of its components, groups with stones of only one colour are left out.
+
+        Returns
+        -------
+        components : list of Clobber
+            The components, ordered by their first cell.
+        """
+        return [self._position(left, right) for left, right in self._live_groups()]
+
+    # Positions are hashed by their canonical form, like interned games
+    def __hash__(self):
+        return hash(self.canonical_form())
 
     def clone(self):
         """Clone a Clobber game.
@@ -50,58 +158,84 @@ class Clobber(Game):
         Returns
         -------
         clone : Clobber
-            A deep copy of the Clobber game.
+            A copy of the Clobber game, the options are shared.
         """
-        clone = Clobber()
-        clone._board = self._board.copy()
-        clone.left_options = [option.clone() for option in self.left_options]
-        clone.right_options = [option.clone() for option in self.right_options]
+        clone = self._position(self._left, self._right)
+        # The options are immutable, so they do not need to be copied
+        # Options that are not generated yet are generated by the clone itself
+        clone._left_options = self._left_options
+        clone._right_options = self._right_options
+        clone._assigned = self._assigned
+        clone._key = self._key
+        clone._groups = self._groups
         return clone
 
     def inverse(self):
         """Inverse a Clobber game.
-        All options for Left are swapped with those of Right recursively.
+        The colors of the stones are swapped, so the options of Left are the
+        inverses of those of Right. They are generated from the board when needed.
 
         Returns
         -------
         inverse : Clobber
             The inverse Clobber game.
         """
-        inverse = self.clone()
         # Swap colors on the board
-        inverse._board = [row.replace("L", "T") for row in inverse._board]
-        inverse._board = [row.replace("R", "L") for row in inverse._board]
-        inverse._board = [row.replace("T", "R") for row in inverse._board]
-        # Swap Left and Right options
-        inverse.left_options, inverse.right_options = inverse.right_options, inverse.left_options
-        # Invert all options
-        inverse.left_options = [lo.inverse() for lo in inverse.left_options]
-        inverse.right_options = [ro.inverse() for ro in inverse.right_options]
-        return inverse
+        return self._position(self._right, self._left)
+
+    # The outcome is searched in the transposition table
+    def geq_zero(self):
+        return self.table.geq_zero(self)
+
+    def leq_zero(self):
+        return self.table.leq_zero(self)
+
+    # Like a disjunctive sum, the position is interned as the canonical form of its value
+    # Positions with assigned options are interned by their options
+    def _interned(self):
+        if self._assigned:
+            return default_universe().game(self.left_options, self.right_options)
+        return self.table.canonical_form(self)
+
+    # Impartiality depends on the options, not only on the value
+    def is_impartial(self):
+        node = self._structure()
+        return node.universe.grundy(node) is not None
+
+    def grundy_value(self):
+        node = self._structure()
+        value = node.universe.grundy(node)
+        if value is None:
+            raise ValueError("Game is not impartial.")
+        return value
+
+    def _structure(self):
+        # Intern the options of all subpositions, instead of their values
+        return evaluate(self, id, _all_options, _structure_node)
 
     def add(self, other):
         """Add a Clobber game.
+        The boards are stacked with an empty row in between, so the options of the
+        sum are generated from its board when needed.
 
         Returns
         -------
         summed : Clobber
             The summed Clobber game.
         """
-        summed = Clobber()
-
         # Add rows of other to self
-        summed._board = [row.ljust(other.columns, "_") for row in self._board]
-        summed._board.append("_" * len(summed._board[0]))
-        summed._board += [row.ljust(self.columns, "_") for row in other._board]
-
-        # Add all options
-        left_self = [slo.add(other) for slo in self.left_options]
-        left_other = [self.add(olo) for olo in other.left_options]
-        summed.left_options = left_self + left_other
-        right_self = [sro.add(other) for sro in self.right_options]
-        right_other = [self.add(oro) for oro in other.right_options]
-        summed.right_options = right_self + right_other
-        return summed
+        rows = [row.ljust(other.columns, "_") for row in self._row_strs()]
+        rows.append("_" * max(self.columns, other.columns))
+        rows += [row.ljust(self.columns, "_") for row in other._row_strs()]
+        return Clobber("|".join(rows))
+
+    def _row_strs(self):
+        # The rows of the board as strings of '_LR' characters
+        cells = [
+            "L" if self._left >> k & 1 else "R" if self._right >> k & 1 else "_"
+            for k in range(self._rows * self._columns)
+        ]
+        return ["".join(cells[i : i + self._columns]) for i in range(0, len(cells), self._columns)]
 
     def board_str(self, colsep=" ", rowsep="\n"):
         """Return the board as :py:class:`str`.
@@ -119,7 +253,7 @@ class Clobber(Game):
         board : str
             The board in string format.
         """
-        return rowsep.join(colsep.join(r) for r in self._board)
+        return rowsep.join(colsep.join(r) for r in self._row_strs())
 
     def moves(self, player):
         """Generate the moves a player can do.
@@ -134,61 +268,563 @@ class Clobber(Game):
         move : str
             The board string of a move.
         """
-        for i in range(self.rows):
-            for j in range(self.columns):
-                if self._board[i][j] == player:
-                    # Move by going up
-                    if (
-                        i > 0
-                        and self._board[i - 1][j] != self._board[i][j]
-                        and self._board[i - 1][j] != "_"
-                    ):
-                        optboard = self._board.copy()
-                        srow = list(self._board[i])
-                        srow[j] = "_"
-                        optboard[i] = "".join(srow)
-                        trow = list(self._board[i - 1])
-                        trow[j] = player
-                        optboard[i - 1] = "".join(trow)
-                        yield "|".join("".join(r) for r in optboard)
-
-                    # Move by going left
-                    if (
-                        j > 0
-                        and self._board[i][j - 1] != self._board[i][j]
-                        and self._board[i][j - 1] != "_"
-                    ):
-                        optboard = self._board.copy()
-                        row = list(self._board[i])
-                        row[j] = "_"
-                        row[j - 1] = player
-                        optboard[i] = "".join(row)
-                        yield "|".join("".join(r) for r in optboard)
-
-                    # Move by going right
-                    if (
-                        j < self.columns - 1
-                        and self._board[i][j + 1] != self._board[i][j]
-                        and self._board[i][j + 1] != "_"
-                    ):
-                        optboard = self._board.copy()
-                        row = list(self._board[i])
-                        row[j] = "_"
-                        row[j + 1] = player
-                        optboard[i] = "".join(row)
-                        yield "|".join("".join(r) for r in optboard)
-
-                    # Move by going down
-                    if (
-                        i < self.rows - 1
-                        and self._board[i + 1][j] != self._board[i][j]
-                        and self._board[i + 1][j] != "_"
-                    ):
-                        optboard = self._board.copy()
-                        srow = list(self._board[i])
-                        srow[j] = "_"
-                        optboard[i] = "".join(srow)
-                        trow = list(self._board[i + 1])
-                        trow[j] = player
-                        optboard[i + 1] = "".join(trow)
-                        yield "|".join("".join(r) for r in optboard)
+        for left, right in self._stone_moves(player):
+            yield self._position(left, right).board
+
+    def _stone_moves(self, player):
+        # Generate the moves as bitboards (left, right)
+        # The stones are moved in order of their cell, each up, left, right and then down
+        if player == "L":
+            own, other = self._left, self._right
+        elif player == "R":
+            own, other = self._right, self._left
+        else:
+            return
+        columns = self._columns
+        not_first, not_last = _column_masks(self._rows, columns)
+        # The stones that can clobber a stone of the other player in each direction
+        up = own & other << columns
+        left = own & other << 1 & not_first
+        right = own & other >> 1 & not_last
+        down = own & other >> columns
+
+        stones = up | left | right | down
+        while stones:
+            stone = stones & -stones
+            stones ^= stone
+            for movable, target in (
+                (up, stone >> columns),
+                (left, stone >> 1),
+                (right, stone << 1),
+                (down, stone << columns),
+            ):
+                if movable & stone:
+                    moved, clobbered = own ^ stone ^ target, other ^ target
+                    yield (moved, clobbered) if player == "L" else (clobbered, moved)
+
+
+class ClobberTable:
+    """A transposition table of Clobber positions.
+
+    Positions are stored by a key of their board that is the same for all
+    equivalent boards. Empty border rows and columns are trimmed, and all
+    reflections and rotations of a board have the same key. The board with the
+    colours of the stones swapped is the negative of the position, so it has the
+    same key as well and is marked as negated. The outcome and the canonical form
+    of equivalent positions are therefore computed once, however they are reached.
+
+    A position with multiple components, see :py:meth:`Clobber.components`, is
+    valued by the sum of the canonical forms of its components, and groups with
+    stones of one colour are left out of the key.
+
+    Components that are in the :py:attr:`database` are looked up before they are searched.
+
+    The table assumes that the options of a position are generated from its board.
+    Positions with assigned options are searched without the table.
+
+    Parameters
+    ----------
+    table_size : int, optional
+        The maximum number of entries in each of the tables.
+
+    database : ClobberDatabase, optional
+        The canonical forms of small positions, see :py:func:`write_database`.
+
+    Attributes
+    ----------
+    outcomes : Cache
+        The results of G>=0 and G<=0 by the key of the position.
+
+    canonicals : Cache
+        The canonical forms of the positions that are not negated, by their key.
+
+    database : ClobberDatabase or None
+        The database that is consulted before positions are searched.
+    """
+
+    def __init__(self, table_size=2 ** 20, database=None):
+        self.outcomes = Cache(table_size)
+        self.canonicals = Cache(table_size)
+        self.database = database
+
+    def geq_zero(self, position):
+        """Check whether a position is greater than or equal to zero.
+
+        Parameters
+        ----------
+        position : Clobber
+            The position to check.
+
+        Returns
+        -------
+        geq : bool
+            :py:const:`True` when G>=0, i.e. when Right starts and loses.
+        """
+        if position._assigned:
+            return Game.geq_zero(position)
+        return refute(
+            (position, 0), _outcome_key, _outcome_options, self.outcomes, self._known_outcome
+        )
+
+    def leq_zero(self, position):
+        """Check whether a position is less than or equal to zero.
+
+        Parameters
+        ----------
+        position : Clobber
+            The position to check.
+
+        Returns
+        -------
+        leq : bool
+            :py:const:`True` when G<=0, i.e. when Left starts and loses.
+        """
+        if position._assigned:
+            return Game.leq_zero(position)
+        return refute(
+            (position, 1), _outcome_key, _outcome_options, self.outcomes, self._known_outcome
+        )
+
+    def _known_outcome(self, item):
+        # The outcome of a sum follows from the canonical forms of its components
+        position, leq = item
+        groups = len(position._live_groups())
+        if groups == 1 and (self.database is None or position._symmetry()[0] not in self.database):
+            return UNKNOWN
+        if not groups:
+            # Without moves the position is 0
+            return True
+        canon = self.canonical_form(position)
+        return canon.universe.leq_zero(canon) if leq else canon.universe.geq_zero(canon)
+
+    def canonical_form(self, position):
+        """Compute the canonical form of a position.
+
+        Parameters
+        ----------
+        position : Clobber
+            The position to reduce.
+
+        Returns
+        -------
+        canonical : InternedGame
+            The canonical form of the position in the default universe.
+        """
+        universe = default_universe()
+        if position._assigned:
+            return universe.canonical_form(universe.intern(position))
+        canon = evaluate(
+            position,
+            _table_key,
+            _dependencies,
+            self._canonical_node,
+            self.canonicals,
+            self._known_canonical,
+        )
+        return _oriented(canon, position)
+
+    def _known_canonical(self, position):
+        # Components are looked up in the database before they are searched
+        if self.database is None or len(position._live_groups()) != 1:
+            return UNKNOWN
+        key = position._symmetry()[0]
+        canon = self.database._lookup(key)
+        if canon is None:
+            return UNKNOWN
+        self.canonicals[key] = canon
+        return canon
+
+    def _canonical_node(self, position, value):
+        # The canonical forms of all options or components are known,
+        # for the positions that are not negated
+        universe = default_universe()
+        if len(position._live_groups()) != 1:
+            canon = universe.sum(_oriented(value(c), c) for c in position.components())
+        else:
+            left = [_oriented(value(gl), gl) for gl in position.left_options]
+            right = [_oriented(value(gr), gr) for gr in position.right_options]
+            canon = universe.canonical_form(universe.game(left, right))
+        return _oriented(canon, position)
+
+    def stats(self):
+        """Get the statistics of the tables.
+
+        Returns
+        -------
+        stats : dict
+            The statistics of the `outcomes` and `canonicals` tables.
+        """
+        return {"outcomes": self.outcomes.stats(), "canonicals": self.canonicals.stats()}
+
+    def clear(self):
+        """Clear all entries of the tables."""
+        self.outcomes.clear()
+        self.canonicals.clear()
+
+
+# The table of all Clobber positions
+Clobber.table = ClobberTable()
+
+
+class ClobberDatabase:
+    """A read-only file of the canonical forms of small Clobber positions.
+
+    The file is written by :py:func:`write_database`. The positions are stored
+    by their key in :py:class:`ClobberTable`, in a sorted index that is searched
+    with binary search. The canonical forms are stored as a
+    :py:class:`~cg.store.GameStore` in the same file. The file is memory-mapped,
+    so opening a database is fast and processes share its pages.
+
+    Assign the database to :py:attr:`ClobberTable.database` to look up positions
+    before they are searched.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        The file of the database.
+
+    Examples
+    --------
+    >>> write_database("clobber.cgdb", 6)
+    >>> Clobber.table.database = ClobberDatabase("clobber.cgdb")
+    >>> str(Clobber("LLR").canonical_form())
+    '^'
+    """
+
+    def __init__(self, path):
+        self._path = os.fspath(path)
+        data = np.memmap(self._path, dtype=np.uint8, mode="r")
+        header = len(_DATABASE_MAGIC) + _KEY_DTYPE.itemsize
+        if len(data) < header or bytes(data[: len(_DATABASE_MAGIC)]) != _DATABASE_MAGIC:
+            raise ValueError(f"{self._path} is not a Clobber database.")
+        n = int(data[len(_DATABASE_MAGIC) : header].view(_KEY_DTYPE)[0])
+        if len(data) < header + 2 * n * _KEY_DTYPE.itemsize:
+            raise ValueError(f"{self._path} does not have the size given by its header.")
+        # The keys are sorted by their high and then by their low words
+        self._high = data[header : header + n * _KEY_DTYPE.itemsize].view(_KEY_DTYPE)
+        self._low = data[
+            header + n * _KEY_DTYPE.itemsize : header + 2 * n * _KEY_DTYPE.itemsize
+        ].view(_KEY_DTYPE)
+        self._store = GameStore(self._path, header + 2 * n * _KEY_DTYPE.itemsize)
+        if len(self._store) != n:
+            raise ValueError(f"{self._path} does not have a canonical form for every position.")
+
+    def __len__(self):
+        return len(self._high)
+
+    def __contains__(self, key):
+        # Positions and their keys can be looked up
+        if isinstance(key, Clobber):
+            key = key._symmetry()[0]
+        return self._index(key) is not None
+
+    def __reduce__(self):
+        # Map the file again instead of pickling the arrays
+        return ClobberDatabase, (self._path,)
+
+    @property
+    def path(self):
+        """str: The file of the database."""
+        return self._path
+
+    def canonical_form(self, position):
+        """Look up the canonical form of a position.
+
+        Parameters
+        ----------
+        position : Clobber
+            The position to look up.
+
+        Returns
+        -------
+        canonical : InternedGame or None
+            The canonical form of the position in the default universe,
+            :py:const:`None` when the position is not in the database.
+        """
+        canon = self._lookup(position._symmetry()[0])
+        if canon is None:
+            return None
+        return _oriented(canon, position)
+
+    def _lookup(self, key):
+        # Get the canonical form of the position of a key in the default universe
+        i = self._index(key)
+        if i is None:
+            return None
+        game = self._store[i]
+        # The file holds canonical forms, so they are not reduced again
+        game._mark_canonical()
+        return default_universe().intern(game)
+
+    def _index(self, key):
+        # Get the number of a key in the index, or None
+        words = _key_words(key)
+        if words is None:
+            return None
+        high, low = (_KEY_DTYPE.type(word) for word in words)
+        start = int(np.searchsorted(self._high, high, side="left"))
+        end = int(np.searchsorted(self._high, high, side="right"))
+        i = start + int(np.searchsorted(self._low[start:end], low))
+        if i < end and self._low[i] == low:
+            return i
+        return None
+
+
+def write_database(path, max_cells, max_strip=0):
+    """Write the canonical forms of all small Clobber positions to a database.
+
+    The positions are all boards with one group of connected stones of both
+    colours, up to reflections, rotations and swapping the colours. Groups of
+    up to `max_cells` stones of every shape are written, and the full 1xn strips
+    up to `max_strip` stones. The file can be opened as a :py:class:`ClobberDatabase`.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        The file to write.
+
+    max_cells : int
+        The maximum number of stones of the groups of all shapes.
+
+    max_strip : int, optional
+        The maximum number of stones of the strips, no more strips by default.
+
+    Returns
+    -------
+    None
+    """
+    shapes = list(_shapes(max_cells))
+    shapes += [(1, n, (1 << n) - 1) for n in range(max_cells + 1, max_strip + 1)]
+    keys = set()
+    for rows, columns, cells in shapes:
+        # All colourings with stones of both colours
+        left = cells & (cells - 1)
+        while left:
+            keys.add(_symmetry_key(rows, columns, left, cells ^ left)[0])
+            left = (left - 1) & cells
+    keys = sorted(keys, key=_key_words)
+    if keys and _key_words(keys[-1]) is None:
+        raise ValueError("The boards of the positions are too large for the database.")
+
+    table = ClobberTable()
+    canonicals = [table.canonical_form(_board_position(*key)) for key in keys]
+    words = np.array([_key_words(key) for key in keys], dtype=_KEY_DTYPE).reshape(len(keys), 2)
+    with open(path, "wb") as file:
+        file.write(_DATABASE_MAGIC)
+        file.write(np.array([len(keys)], dtype=_KEY_DTYPE).tobytes())
+        file.write(words[:, 0].tobytes())
+        file.write(words[:, 1].tobytes())
+        write_games(file, canonicals)
+
+
+def _shapes(max_cells):
+    # Generate the shapes of connected cells of up to max_cells cells as (rows, columns, cells)
+    # Every shape is generated once, up to reflections and rotations
+    shapes = {frozenset([(0, 0)])} if max_cells > 0 else set()
+    while shapes:
+        free = {}
+        for shape in shapes:
+            rows = max(i for i, _ in shape) + 1
+            columns = max(j for _, j in shape) + 1
+            cells = sum(1 << i * columns + j for i, j in shape)
+            free.setdefault(_symmetry_key(rows, columns, cells, 0)[0], (rows, columns, cells))
+        yield from free.values()
+        if len(next(iter(shapes))) >= max_cells:
+            break
+        # Grow the shapes by one cell, they are moved to the first row and column
+        grown = set()
+        for shape in shapes:
+            for i, j in shape:
+                for cell in ((i - 1, j), (i, j - 1), (i, j + 1), (i + 1, j)):
+                    if cell not in shape:
+                        new = shape | {cell}
+                        top = min(i for i, _ in new)
+                        first = min(j for _, j in new)
+                        grown.add(frozenset((i - top, j - first) for i, j in new))
+        shapes = grown
+
+
+def _key_words(key):
+    # Get a key as two 64-bit words, or None when the board is too large
+    rows, columns, left, right = key
+    if rows * columns > 48 or rows > 255 or columns > 255:
+        return None
+    return rows << 56 | columns << 48 | left, right
+
+
+def _board_position(rows, columns, left, right):
+    # Create a position from its bitboards, nothing is parsed
+    position = Clobber.__new__(Clobber)
+    position._rows = rows
+    position._columns = columns
+    position._left = left
+    position._right = right
+    position._left_options = None
+    position._right_options = None
+    position._key = None
+    position._groups = None
+    return position
+
+
+def _table_key(position):
+    return position._symmetry()[0]
+
+
+def _outcome_key(item):
+    # G>=0 for a negated position is -G<=0 for the position in the table
+    position, leq = item
+    key, negated = position._symmetry()
+    return key, leq ^ negated
+
+
+def _outcome_options(item):
+    # G>=0 when no G^R<=0, G<=0 when no G^L>=0
+    position, leq = item
+    if leq:
+        return ((gl, 0) for gl in position.left_options)
+    return ((gr, 1) for gr in position.right_options)
+
+
+def _dependencies(position):
+    # A sum depends on its components, a single component on its options
+    if len(position._live_groups()) != 1:
+        return position.components()
+    return chain(position.left_options, position.right_options)
+
+
+def _all_options(position):
+    return [*position.left_options, *position.right_options]
+
+
+def _structure_node(position, value):
+    left = [value(gl) for gl in position.left_options]
+    right = [value(gr) for gr in position.right_options]
+    return default_universe().game(left, right)
+
+
+def _oriented(canon, position):
+    # Convert between the canonical form of a position and that of the position in the table
+    if position._symmetry()[1]:
+        return default_universe().inverse(canon)
+    return canon
+
+
+def _symmetry_key(rows, columns, left, right):
+    # Get the smallest (rows, columns, left, right) of all equivalent boards,
+    # and whether it has the colours swapped
+    stones = left | right
+    if not stones:
+        return (0, 0, 0, 0), False
+
+    # Trim the empty border rows and columns
+    row_mask = (1 << columns) - 1
+    occupied = [i for i in range(rows) if stones >> i * columns & row_mask]
+    used = 0
+    for i in occupied:
+        used |= stones >> i * columns & row_mask
+    first = (used & -used).bit_length() - 1
+    width = used.bit_length() - first
+    top, height = occupied[0], occupied[-1] - occupied[0] + 1
+    left = _crop(left, columns, top, height, first, width)
+    right = _crop(right, columns, top, height, first, width)
+
+    keys = []
+    for new_rows, new_columns, cells in _transforms(height, width):
+        new_left, new_right = _permute(left, cells), _permute(right, cells)
+        keys.append(((new_rows, new_columns, new_left, new_right), False))
+        keys.append(((new_rows, new_columns, new_right, new_left), True))
+    return min(keys)
+
+
+def _live_groups(rows, columns, left, right):
+    # Find the groups of connected stones by growing each group until it stops changing
+    not_first, not_last = _column_masks(rows, columns)
+    stones = left | right
+    groups = []
+    while stones:
+        group = stones & -stones
+        while True:
+            grown = (
+                group
+                | group << 1 & not_first
+                | group >> 1 & not_last
+                | group << columns
+                | group >> columns
+            )
+            grown &= stones
+            if grown == group:
+                break
+            group = grown
+        stones ^= group
+        # A group of one colour has no moves
+        if group & left and group & right:
+            groups.append((group & left, group & right))
+    return groups
+
+
+def _crop(stones, columns, top, height, first, width):
+    # Get the bitboard of a rectangle of a board
+    mask = (1 << width) - 1
+    cropped = 0
+    for i in range(height):
+        cropped |= (stones >> (top + i) * columns + first & mask) << i * width
+    return cropped
+
+
+def _permute(stones, cells):
+    # Move the stone of every cell k to cell cells[k]
+    permuted = 0
+    while stones:
+        stone = stones & -stones
+        stones ^= stone
+        permuted |= 1 << cells[stone.bit_length() - 1]
+    return permuted
+
+
+def _transforms(rows, columns):
+    # Get the reflections and rotations of a board as (rows, columns, new cell of each cell)
+    transforms = _TRANSFORMS.get((rows, columns))
+    if transforms is None:
+        r, c = rows - 1, columns - 1
+        maps = [
+            (rows, columns, lambda i, j: (i, j)),
+            (rows, columns, lambda i, j: (i, c - j)),
+            (rows, columns, lambda i, j: (r - i, j)),
+            (rows, columns, lambda i, j: (r - i, c - j)),
+            (columns, rows, lambda i, j: (j, i)),
+            (columns, rows, lambda i, j: (j, r - i)),
+            (columns, rows, lambda i, j: (c - j, i)),
+            (columns, rows, lambda i, j: (c - j, r - i)),
+        ]
+        transforms = []
+        for new_rows, new_columns, cell in maps:
+            cells = []
+            for i in range(rows):
+                for j in range(columns):
+                    new_i, new_j = cell(i, j)
+                    cells.append(new_i * new_columns + new_j)
+            transforms.append((new_rows, new_columns, cells))
+        _TRANSFORMS[rows, columns] = transforms
+    return transforms
+
+
+def _column_masks(rows, columns):
+    # Get the bitboards of all cells but the first column, and all cells but the last column
+    masks = _COLUMN_MASKS.get((rows, columns))
+    if masks is None:
+        first = sum(1 << i * columns for i in range(rows))
+        full = (1 << rows * columns) - 1
+        masks = _COLUMN_MASKS[rows, columns] = (
+            full & ~first,
+            full & ~(first << columns - 1) if columns else 0,
+        )
+    return masks
+
+
+# The column masks by the size of the board
+_COLUMN_MASKS = {}
+# The reflections and rotations by the size of the board
+_TRANSFORMS = {}
+
+_DATABASE_MAGIC = b"CGCLOBDB"
+_KEY_DTYPE = np.dtype("<u8")
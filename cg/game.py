@@ -1,14 +1,32 @@
+import io
+from collections import deque
+from itertools import chain
+from operator import attrgetter
+
 import cg.game_notations as gn
+from cg.traversal import UNKNOWN, evaluate, refute
 
 
 class Game:
-    def __init__(self, cgn=""):
-        self.left_options = []
-        self.right_options = []
+    # Whether the game is known to be in canonical form
+    # Canonical games and their subgames are not reduced again
+    _canonical = False
+    # Whether the options are generated when first accessed, e.g. from a board
+    # The outcome of such games is searched without interning all their positions
+    _lazy_options = False
+
+    def __init__(self, cgn="", assume_canonical=False):
+        self._left_options = ()
+        self._right_options = ()
+        # The view of the inverse, created when first needed
+        self._negation = None
 
         # Speed up if 0-game
         if cgn and cgn != "0" and cgn != "zero":
             self.set_cgn(cgn)
+        # Trust the input, e.g. games read from a file of canonical forms
+        if assume_canonical:
+            self._mark_canonical()
 
     def __str__(self):
         return self.get_cgn()
@@ -16,116 +34,196 @@ class Game:
     def __repr__(self):
         return str(self)
 
-    def clear(self):
-        self.left_options.clear()
-        self.right_options.clear()
-
-    # Clone a game by duplicating the game tree recursively
-    # Replaces/implements deepcopy functionality
-    def clone(self):
-        c = Game()
-        c.left_options = [option.clone() for option in self.left_options]
-        c.right_options = [option.clone() for option in self.right_options]
-        return c
-
-    def _set_node_cgn(self, expanded_cgn, index):
-        """Create a Game from expanded cgn.
+    # The options are immutable tuples, so subgames can be shared instead of copied
+    # Assigning a list or other iterable stores it as a tuple
+    @property
+    def left_options(self):
+        return self._left_options
 
-        Assumes the `expanded_cgn` is in expanded combinatorial game notation.
-        Only characters '{', ',', '|' and '}' are valid.
+    @left_options.setter
+    def left_options(self, options):
+        self._left_options = tuple(options)
+        self._canonical = False
 
-        Parameters
-        ----------
-        expanded_cgn : str
-            The game in CGN that this node is part of.
+    @property
+    def right_options(self):
+        return self._right_options
 
-        index : int
-            The index in expanded_cgn that this node represents.
-        """
-        letter = expanded_cgn[index]
-        currently_left = True
-        while letter != "}":
-            if letter == "{":
-                opt = Game()
-                index += 1
-                index = opt._set_node_cgn(expanded_cgn, index=index)
-                if currently_left:
-                    self.left_options.append(opt)
-                else:
-                    self.right_options.append(opt)
-            elif letter == "|":
-                currently_left = False
-
-            # In the other cases (',' or '}'), do nothing
-            # Go to the next letter
-            index += 1
-            letter = expanded_cgn[index]
-        return index
+    @right_options.setter
+    def right_options(self, options):
+        self._right_options = tuple(options)
+        self._canonical = False
 
+    def clear(self):
+        self._left_options = ()
+        self._right_options = ()
+        self._canonical = False
+
+    def _mark_canonical(self):
+        # Mark the game and all its subgames as canonical
+        stack = [self]
+        while stack:
+            game = stack.pop()
+            if not game._canonical:
+                game._canonical = True
+                stack.extend(_options(game))
+
+    # Clone a game by duplicating the game graph
+    # Replaces/implements deepcopy functionality, shared subgames stay shared
+    def clone(self):
+        return evaluate(
+            self,
+            id,
+            _options,
+            lambda g, value: _game(
+                [value(gl) for gl in g.left_options], [value(gr) for gr in g.right_options]
+            ),
+        )
+
+    # The notation is parsed in one pass, see cg.game_notations.parse_cgn
     def set_cgn(self, cgn):
-        self.clear()
-        expanded = gn.expand_cgn(cgn)
-        self._set_node_cgn(expanded, 1)
+        game = gn.parse_cgn(cgn, _game)
+        self.left_options = game.left_options
+        self.right_options = game.right_options
         return self
 
     def get_cgn(self):
         return self._get_node_cgn()
 
     def _get_node_cgn(self):
-        # Get and sort all left options
-        left_list = sorted([opt._get_node_cgn() for opt in self.left_options])
-        # Get and sort all right options
-        right_list = sorted([opt._get_node_cgn() for opt in self.right_options])
-        # Compress and return
-        return gn.compress_cgn("{" + ",".join(left_list) + "|" + ",".join(right_list) + "}")
+        return evaluate(self, id, _options, _node_cgn)
 
     def get_cgn_dot(self):
-        return "digraph Game {\n" + self._get_node_cgn_dot("", 0)[0] + "}"
+        dot = io.StringIO()
+        self.write_dot(dot)
+        return dot.getvalue()
 
-    def _get_node_cgn_dot(self, dot, index):
-        me = index
-        dot += f'\t{me:d}[label="{self}"];\n'
-        for lo in self.left_options:
-            dot, new_index = lo._get_node_cgn_dot(dot, index + 1)
-            dot += f'\t{me:d} -> {index+1:d}[label="L"];\n'
-            index = new_index
-        for ro in self.right_options:
-            dot, new_index = ro._get_node_cgn_dot(dot, index + 1)
-            dot += f'\t{me:d} -> {index+1:d}[label="R"];\n'
-            index = new_index
-        return dot, index
+    def write_dot(self, file, max_depth=None, max_nodes=None, max_label_length=100):
+        """Write the game graph in the DOT language of Graphviz.
+
+        The graph is written while it is traversed breadth-first, so it is never
+        built in memory. Every distinct subgame object is written once, so shared
+        subgames form a DAG. Each label is the CGN of the subgame, and every
+        subgame is formatted only once. Only the subgames that are written are
+        labelled, and formatting a label stops once it is longer than
+        `max_label_length` or it needs too many subgames that were not formatted
+        yet.
+
+        Parameters
+        ----------
+        file : file-like object
+            The file to write the graph to.
+
+        max_depth : int, optional
+            The depth up to which options are written. Unlimited by default.
+
+        max_nodes : int, optional
+            The maximum number of nodes to write. Unlimited by default.
+
+        max_label_length : int, optional
+            The maximum length of a label. Nodes with a longer CGN, or with too
+            many subgames to format, are labelled by their number, such as
+            ``#3``. 100 by default.
+
+        Notes
+        -----
+        Nodes of which not all options are written, because of `max_depth` or
+        `max_nodes`, are drawn dashed.
+        """
+        labels = {}
+        # The ids of the subgames with a CGN longer than max_label_length
+        long_labels = set()
+
+        def known_label(game):
+            if id(game) in long_labels:
+                raise _LongLabel
+            return UNKNOWN
+
+        def label_of(game, value):
+            # The budget is set for every label, see below
+            if len(labels) >= budget:
+                raise _LongLabel
+            label = _node_cgn(game, value)
+            if len(label) > max_label_length:
+                long_labels.add(id(game))
+                raise _LongLabel
+            return label
+
+        # The index of every subgame that is written, by its id
+        index = {id(self): 0}
+        nodes = [self]
+        queue = deque([(self, 0)])
+        file.write("digraph Game {\n")
+        while queue:
+            game, depth = queue.popleft()
+            me = index[id(game)]
+            edges = []
+            complete = not (game.left_options or game.right_options)
+            if max_depth is None or depth < max_depth:
+                complete = True
+                for player, options in (("L", game.left_options), ("R", game.right_options)):
+                    for option in options:
+                        child = index.get(id(option))
+                        if child is None:
+                            if max_nodes is not None and len(nodes) >= max_nodes:
+                                complete = False
+                                continue
+                            child = index[id(option)] = len(nodes)
+                            nodes.append(option)
+                            queue.append((option, depth + 1))
+                        edges.append(f'\t{me:d} -> {child:d}[label="{player}"];\n')
+
+            # Stops as soon as a subgame has a long label, or too many subgames are
+            # formatted, so large games are not traversed
+            budget = len(labels) + _DOT_LABEL_SUBGAMES
+            try:
+                label = evaluate(game, id, _options, label_of, labels, known_label)
+            except _LongLabel:
+                label = f"#{me:d}"
+            style = "" if complete else ",style=dashed"
+            file.write(f'\t{me:d}[label="{label}"{style}];\n')
+            file.writelines(edges)
+        file.write("}")
+
+    def _interned(self):
+        """Get the game as node of the default universe.
+
+        Returns
+        -------
+        node : cg.universe.InternedGame
+            The interned game with the same structure.
+        """
+        # Imported here, the universe module depends on this module
+        from cg.universe import default_universe
+
+        return default_universe().intern(self)
 
     # Greater than or equal to zero (right starts -> loses)
     # None of Right's options can be leq_zero
+    # The result is stored in the transposition table of the universe
     def geq_zero(self):
-        for option in self.right_options:
-            if option.leq_zero():
-                return False
-        return True
+        if self._lazy_options:
+            return refute((self, 0), _outcome_key, _outcome_options)
+        node = self._interned()
+        return node.universe.geq_zero(node)
 
     # Less than or equal to zero (left starts -> loses)
     # None of Left's options can be geq_zero
     def leq_zero(self):
-        for option in self.left_options:
-            if option.geq_zero():
-                return False
-        return True
+        if self._lazy_options:
+            return refute((self, 1), _outcome_key, _outcome_options)
+        node = self._interned()
+        return node.universe.leq_zero(node)
 
     # Greater than or incomparable to zero (left starts -> wins)
-    # There must be a Left option geq_zero
+    # There must be a Left option geq_zero, i.e. G is not leq_zero
     def gin_zero(self):
-        for option in self.left_options:
-            if option.geq_zero():
-                return True
-        return False
+        return not self.leq_zero()
 
     # Less than or incomparable to zero (right starts -> wins)
-    # There must be a Right option leq_zero
+    # There must be a Right option leq_zero, i.e. G is not geq_zero
     def lin_zero(self):
-        for option in self.right_options:
-            if option.leq_zero():
-                return True
-        return False
+        return not self.geq_zero()
 
     # Greater than zero (Left player win)
     def gtr_zero(self):
@@ -143,37 +241,49 @@ class Game:
     def incomparable_zero(self):
         return self.gin_zero() and self.lin_zero()
 
-    # Inverse: Swap Left and Right options recursively
-    # Deepcopy is required, since the inverse is applied top-down
+    # Inverse: Swap Left and Right options of all subgames
+    # The inverse is a view of this game, so no mirrored copy is built
+    # The same view is returned every time, so shared subgames stay shared
     def inverse(self):
-        inv = self.clone()
-        # Swap Left and Right options
-        inv.left_options, inv.right_options = inv.right_options, inv.left_options
-        # Invert all options
-        inv.left_options = [lo.inverse() for lo in inv.left_options]
-        inv.right_options = [ro.inverse() for ro in inv.right_options]
-        return inv
+        if self._negation is None:
+            self._negation = NegatedGame(self)
+        return self._negation
 
     # Add: Add two games together
-    # No deepcopy is required, since the new game is
-    # constructed from new zero games recursively
+    # Numbers in canonical form are added by their values
+    # and impartial games by the XOR of their Grundy values
     def add(self, other):
-        s = Game()
-        left_self = [slo.add(other) for slo in self.left_options]
-        left_other = [self.add(olo) for olo in other.left_options]
-        s.left_options = left_self + left_other
-        right_self = [sro.add(other) for sro in self.right_options]
-        right_other = [self.add(oro) for oro in other.right_options]
-        s.right_options = right_self + right_other
-        return s
+        if isinstance(self, DisjunctiveSum) or isinstance(other, DisjunctiveSum):
+            # Sums are flattened without folding them, so chained + stays linear
+            return DisjunctiveSum([self, other])
+        node = self._interned()
+        universe = node.universe
+        value = universe.number(node)
+        if value is not None:
+            other_value = universe.number(other)
+            if other_value is not None:
+                return universe.number_game(value + other_value)
+        nim_value = universe.grundy(node)
+        if nim_value is not None:
+            other_nim_value = universe.grundy(other)
+            if other_nim_value is not None:
+                return universe.nimber(nim_value ^ other_nim_value)
+        # Other sums are kept as components, their options are generated when needed
+        return DisjunctiveSum([self, other])
 
     def subtract(self, other):
         return self.add(other.inverse())
 
     # Overloads
     def __eq__(self, other):
+        if not isinstance(other, Game):
+            return NotImplemented
         return self.equal(other)
 
+    # The options of a game can be changed, so games are not hashable
+    # Interned games and immutable positions are hashed by their canonical form
+    __hash__ = None
+
     def __add__(self, other):
         return self.add(other)
 
@@ -183,37 +293,40 @@ class Game:
     def __neg__(self):
         return self.inverse()
 
-    # Check whether G>=H, True when G-H>=0
+    # Check whether G>=H, True when no G^R<=H and no H^L>=G
+    # The games are compared directly, G-H is never constructed
     def geq(self, other):
-        return (self - other).geq_zero()
+        node = self._interned()
+        return node.universe.geq(node, other)
 
-    # Check whether G<=H, True when G-H<=0
+    # Check whether G<=H, True when H>=G
     def leq(self, other):
-        return (self - other).leq_zero()
+        node = self._interned()
+        return node.universe.geq(other, node)
 
-    # Check whether G>~H, True when G-H>~0
+    # Check whether G>~H, True when not G<=H
     def gin(self, other):
-        return (self - other).gin_zero()
+        return not self.leq(other)
 
-    # Check whether G<~H, True when G-H<~0
+    # Check whether G<~H, True when not G>=H
     def lin(self, other):
-        return (self - other).lin_zero()
+        return not self.geq(other)
 
-    # Check whether G>H, True when G-H>0
+    # Check whether G>H, True when G>=H and not G<=H
     def gtr(self, other):
-        return (self - other).gtr_zero()
+        return self.geq(other) and not self.leq(other)
 
-    # Check whether G<H, True when G-H<0
+    # Check whether G<H, True when G<=H and not G>=H
     def lss(self, other):
-        return (self - other).lss_zero()
+        return self.leq(other) and not self.geq(other)
 
-    # Check whether G=H, True when G-H=0
+    # Check whether G=H, True when G>=H and G<=H
     def equal(self, other):
-        return (self - other).equal_zero()
+        return self.geq(other) and self.leq(other)
 
-    # Check whether G~H, True when G-H~0
+    # Check whether G~H, True when not G>=H and not G<=H
     def incomparable(self, other):
-        return (self - other).incomparable_zero()
+        return not self.geq(other) and not self.leq(other)
 
     def outcome_class(self):
         """Get the outcome class of the game.
@@ -267,54 +380,65 @@ class Game:
         # Create a new companion with all options as companion
         comp = Game()
         # Add all option's companions
-        comp.left_options += [gl.companion() for gl in self.left_options]
-        comp.right_options += [gr.companion() for gr in self.right_options]
+        left = [gl.companion() for gl in self.left_options]
+        right = [gr.companion() for gr in self.right_options]
 
         # Add 0 options based on outcome class
         if outcome == "L":
             # G is a win for Left
-            comp.left_options.append(Game())
+            left.append(Game())
         elif outcome == "R":
             # G is a win for Right
-            comp.right_options.append(Game())
+            right.append(Game())
+        comp.left_options = left
+        comp.right_options = right
 
         # Return the resulting companion
         return comp
 
     # Remove dominated options
+    # The remaining options are shared with this game, not copied
     def remove_dominated(self, return_change=False):
-        nodom = Game()
+        if self._canonical:
+            # A canonical game has no dominated options
+            return (self, False) if return_change else self
+        left, right = [], []
         change = False
         # Check Left options
         for lc1, lo1 in enumerate(self.left_options):
-            for lo2 in self.left_options[lc1 + 1 :] + nodom.left_options:
+            for lo2 in chain(self.left_options[lc1 + 1 :], left):
                 if lo2.geq(lo1):
                     # lo1 is dominated by lo2
                     change = True
                     break
             else:
                 # lo1 was not dominated
-                nodom.left_options.append(lo1.clone())
+                left.append(lo1)
 
         # Check Right options
         for rc1, ro1 in enumerate(self.right_options):
-            for ro2 in self.right_options[rc1 + 1 :] + nodom.right_options:
+            for ro2 in chain(self.right_options[rc1 + 1 :], right):
                 if ro2.leq(ro1):
                     # ro1 is dominated by ro2
                     change = True
                     break
             else:
                 # ro1 was not dominated
-                nodom.right_options.append(ro1.clone())
+                right.append(ro1)
 
         # Return the game without dominated options
+        nodom = _game(left, right)
         if return_change:
             return nodom, change
         return nodom
 
     # Replace reversible options
+    # The options are shared with this game, not copied
     def replace_reversible(self, return_change=False):
-        reprev = Game()
+        if self._canonical:
+            # A canonical game has no reversible options
+            return (self, False) if return_change else self
+        left, right = [], []
         change = False
         # Check Left options
         for lo in self.left_options:
@@ -325,10 +449,10 @@ class Game:
                 if lro.leq(self):
                     # L is reversible through LR, replace with LR's Left options
                     change = rev = True
-                    reprev.left_options.extend([lrl.clone() for lrl in lro.left_options])
+                    left.extend(lro.left_options)
             if not rev:
                 # Left option was not reversible, leave it intact
-                reprev.left_options.append(lo.clone())
+                left.append(lo)
 
         # Check Right options
         for ro in self.right_options:
@@ -339,32 +463,33 @@ class Game:
                 if rlo.geq(self):
                     # R is reversible through RL, replace with RL's Right options
                     change = rev = True
-                    reprev.right_options.extend([rlr.clone() for rlr in rlo.right_options])
+                    right.extend(rlo.right_options)
             if not rev:
                 # Right option was not reversible, leave it intact
-                reprev.right_options.append(ro.clone())
+                right.append(ro)
 
         # Return the game without reversible options
+        reprev = _game(left, right)
         if return_change:
             return reprev, change
         return reprev
 
     # Canonical form
+    # Canonical forms are memoised in the universe, the result is shared and immutable
     def canonical_form(self):
-        canon = Game()
-        # Compute the canonical form of all Left and Right options
-        canon.left_options = [lo.canonical_form() for lo in self.left_options]
-        canon.right_options = [ro.canonical_form() for ro in self.right_options]
-        # Replace reversible options
-        change = True
-        while change:
-            canon, change = canon.replace_reversible(return_change=True)
-        # Remove dominated options
-        change = True
-        while change:
-            canon, change = canon.remove_dominated(return_change=True)
-        # Return the canonical form
-        return canon
+        node = self._interned()
+        return node.universe.canonical_form(node)
+
+    # Add an option for player "L" or "R" to the canonical form of the game
+    # Only the domination and reversibility relations that change are checked again
+    def with_option(self, option, player):
+        node = self._interned()
+        return node.universe.with_option(node, option, player)
+
+    # Remove an option for player "L" or "R" from the canonical form of the game
+    def without_option(self, option, player):
+        node = self._interned()
+        return node.universe.without_option(node, option, player)
 
     def left_incentive(self, option):
         """Compute a Left incentive.
@@ -432,22 +557,59 @@ class Game:
         for gr in self.right_options:
             yield self.right_incentive(gr)
 
+    def _number(self):
+        # Get the value of the game when it is equal to a number, otherwise None
+        node = self._interned()
+        universe = node.universe
+        value = universe.number(node)
+        if value is None:
+            value = universe.number(universe.canonical_form(node))
+        return value
+
+    def is_number(self):
+        """Whether the game is equal to a number or not.
+
+        Returns
+        -------
+        num_type : bool
+            :py:const:`True` when the game is a number, :py:const:`False` otherwise.
+
+        Notes
+        -----
+        The canonical forms of numbers are recognised by their structure,
+        the result is memoised in the universe.
+        """
+        return self._number() is not None
+
+    def number_value(self):
+        """Compute the game's number value.
+
+        Returns
+        -------
+        value : fractions.Fraction
+            The value of the game, a dyadic rational.
+
+        Raises
+        ------
+        ValueError
+            When the game is not a number.
+        """
+        value = self._number()
+        if value is None:
+            raise ValueError("Game is not a number.")
+        return value
+
     def is_integer(self):
         """Whether the game is an integer or not.
-        A game is *not* an integer when it has both a Left and Right incentive > -1.
+        A game is an integer when its canonical form is an integer.
 
         Returns
         -------
         int_type : bool
             :py:const:`True` when the game is an integer, :py:const:`False` otherwise.
-
-        Notes
-        -----
-        See Siegel, p. 80, Theorem 3.27.
         """
-        return not any(
-            left_incentive.gtr(Game("-1")) for left_incentive in self.left_incentives()
-        ) or not any(right_incentive.gtr(Game("-1")) for right_incentive in self.right_incentives())
+        value = self._number()
+        return value is not None and value.denominator == 1
 
     def integer_value(self):
         """Compute the game's integer value.
@@ -464,21 +626,39 @@ class Game:
         """
         if not self.is_integer():
             raise ValueError("Game is not an integer.")
+        return int(self._number())
 
-        value = 0
-        cpy = self.clone()
-        if self.geq_zero():
-            # Game is >= 0
-            while cpy.gtr_zero():
-                cpy = (cpy + Game("-1")).canonical_form()
-                value += 1
-            return value
-        else:
-            # Game is < 0
-            while cpy.lss_zero():
-                cpy = (cpy + Game("1")).canonical_form()
-                value -= 1
-            return value
+    def is_impartial(self):
+        """Whether the game is impartial or not.
+        A game is impartial when both players have the same options and all options are impartial.
+
+        Returns
+        -------
+        impartial : bool
+            :py:const:`True` when the game is impartial, :py:const:`False` otherwise.
+        """
+        node = self._interned()
+        return node.universe.grundy(node) is not None
+
+    def grundy_value(self):
+        """Compute the game's Grundy value.
+        An impartial game with Grundy value n is equal to the nimber *n.
+
+        Returns
+        -------
+        value : int
+            The Grundy value.
+
+        Raises
+        ------
+        ValueError
+            When the game is not impartial.
+        """
+        node = self._interned()
+        value = node.universe.grundy(node)
+        if value is None:
+            raise ValueError("Game is not impartial.")
+        return value
 
     def norton(self, other):
         """Compute the Norton product of the game with another game.
@@ -516,14 +696,221 @@ class Game:
                 return -norton
 
         # Not an integer, compute {G^L*U+U+D|G^R*U-U-D}
+        left, right = [], []
         # Loop all incentives
         for inc in list(self.left_incentives()) + list(self.right_incentives()):
             # Loop all G^L
             for left_option in self.left_options:
                 # Compute G^L*U+U+D
-                norton.left_options.append(left_option.norton(other) + other + inc)
+                left.append(left_option.norton(other) + other + inc)
             # Loop all G^R
             for right_option in self.left_options:
                 # Compute G^R*U-U-D
-                norton.right_options.append(right_option.norton(other) - other - inc)
-        return norton
+                right.append(right_option.norton(other) - other - inc)
+        return _game(left, right)
+
+
+class NegatedGame(Game):
+    """A view of the inverse of a game.
+
+    The Left options of the view are the inverses of the Right options of the game,
+    and the other way around. They are negated when first accessed and cached,
+    so no mirrored copy of the game is built. The view follows changes of the
+    options of the game, and options assigned to the view are assigned to the game.
+    The inverse of the view is the game itself.
+
+    Parameters
+    ----------
+    game : Game
+        The game to negate.
+
+    Attributes
+    ----------
+    game
+    left_options
+    right_options
+    """
+
+    def __init__(self, game):
+        self._game = game
+        # The options of the game that the cached options were negated from
+        self._left_source = None
+        self._right_source = None
+
+    @property
+    def game(self):
+        """Game: The game that this view negates."""
+        return self._game
+
+    @property
+    def left_options(self):
+        options = self._game.right_options
+        if options is not self._left_source:
+            self._left_options = tuple(option.inverse() for option in options)
+            self._left_source = options
+        return self._left_options
+
+    @left_options.setter
+    def left_options(self, options):
+        self._game.right_options = [option.inverse() for option in options]
+
+    @property
+    def right_options(self):
+        options = self._game.left_options
+        if options is not self._right_source:
+            self._right_options = tuple(option.inverse() for option in options)
+            self._right_source = options
+        return self._right_options
+
+    @right_options.setter
+    def right_options(self, options):
+        self._game.left_options = [option.inverse() for option in options]
+
+    def clear(self):
+        self._game.clear()
+
+    def inverse(self):
+        return self._game
+
+
+class DisjunctiveSum(Game):
+    """A disjunctive sum of games, kept as a list of its components.
+
+    The options of the sum are the sums with one component replaced by one of
+    its options. They are generated when first accessed, and options that are
+    reached in multiple ways, such as G^L+H^R, are the same object. Components
+    that are sums themselves are flattened.
+
+    The value of the sum is computed from the canonical forms of its components,
+    see :py:meth:`cg.universe.GameUniverse.sum`, so the full sum is never
+    constructed to compare or reduce it.
+
+    Parameters
+    ----------
+    components : iterable of Game
+        The games to sum.
+
+    Attributes
+    ----------
+    components
+    left_options
+    right_options
+
+    Examples
+    --------
+    >>> s = DisjunctiveSum([Game("^"), Game("^"), Game("v")])
+    >>> str(s.canonical_form())
+    '^'
+    """
+
+    def __init__(self, components=()):
+        self._components = tuple(
+            chain.from_iterable(
+                c.components if isinstance(c, DisjunctiveSum) else (c,) for c in components
+            )
+        )
+        self._left_options = None
+        self._right_options = None
+        self._negation = None
+        # The options of all sums reached from the same sum, by the ids of their components
+        self._sums = {}
+
+    @property
+    def components(self):
+        """tuple of Game: The components of the sum."""
+        return self._components
+
+    @property
+    def left_options(self):
+        if self._left_options is None:
+            self._left_options = self._sum_options(attrgetter("left_options"))
+        return self._left_options
+
+    @property
+    def right_options(self):
+        if self._right_options is None:
+            self._right_options = self._sum_options(attrgetter("right_options"))
+        return self._right_options
+
+    def _sum_options(self, options_of):
+        # Replace one component by one of its options
+        components = self._components
+        sums = []
+        for i, component in enumerate(components):
+            for option in options_of(component):
+                sums.append(self._option((*components[:i], option, *components[i + 1 :])))
+        return tuple(sums)
+
+    def _option(self, components):
+        key = tuple(map(id, components))
+        option = self._sums.get(key)
+        if option is None:
+            option = self._sums[key] = DisjunctiveSum(components)
+            option._sums = self._sums
+        return option
+
+    def clear(self):
+        raise AttributeError("The options of a sum cannot be changed.")
+
+    # A sum is immutable, so it is hashed by its canonical form
+    def __hash__(self):
+        return hash(self.canonical_form())
+
+    def inverse(self):
+        if self._negation is None:
+            self._negation = DisjunctiveSum([c.inverse() for c in self._components])
+            self._negation._negation = self
+        return self._negation
+
+    def is_impartial(self):
+        return all(c.is_impartial() for c in self._components)
+
+    def grundy_value(self):
+        value = 0
+        for c in self._components:
+            value ^= c.grundy_value()
+        return value
+
+
+# The number of new subgames that may be formatted for one label of write_dot
+_DOT_LABEL_SUBGAMES = 100
+
+
+class _LongLabel(Exception):
+    # Raised to stop formatting a label that is too long
+    pass
+
+
+def _game(left_options, right_options):
+    # Create a game with the given options
+    g = Game()
+    g.left_options = left_options
+    g.right_options = right_options
+    return g
+
+
+def _outcome_key(item):
+    # The subgames are kept alive by their parents, so their ids stay valid during a search
+    game, leq = item
+    return id(game), leq
+
+
+def _outcome_options(item):
+    # G>=0 when no G^R<=0, G<=0 when no G^L>=0
+    game, leq = item
+    if leq:
+        return ((gl, 0) for gl in game.left_options)
+    return ((gr, 1) for gr in game.right_options)
+
+
+def _options(game):
+    return [*game.left_options, *game.right_options]
+
+
+def _node_cgn(game, value):
+    # Get and sort all left options
+    left_list = sorted([value(opt) for opt in game.left_options])
+    # Get and sort all right options
+    right_list = sorted([value(opt) for opt in game.right_options])
+    # Format, known values are written directly
+    return gn.format_cgn(left_list, right_list)
@@ -1,4 +1,7 @@
 import re
+from fractions import Fraction
+
+from cg.traversal import evaluate
 
 
 def expand_stars(cgn):
@@ -15,28 +18,18 @@ def expand_stars(cgn):
         The CGN string with expanded stars.
     """
     regex = re.compile(r"\*(\d*)")
-    match = re.search(regex, cgn)
-    while match:
-        # A star has been found
-        if match.group(1):
-            # The star has a number after it
-            star_num = int(match.group(1))
-        else:
-            # No number -> *1
-            star_num = 1
+    # The expanded stars of all nimbers up to the largest one, built once
+    stars = ["0"]
 
-        # Replace the star
-        expanded_star = "0"
-        for i in range(1, star_num):
-            expanded_star += ",*" + str(i)
-        replace_game = "{" + expanded_star + "|" + expanded_star + "}"
-        cgn = cgn.replace(match.group(0), replace_game, 1)
+    def expand_star(match):
+        # No number -> *1
+        star_num = int(match.group(1)) if match.group(1) else 1
+        while len(stars) <= star_num:
+            options = ",".join(stars)
+            stars.append("{" + options + "|" + options + "}")
+        return stars[star_num]
 
-        # Find the next match
-        match = re.search(regex, cgn)
-
-    # No stars are left, return the resulting cgn
-    return cgn
+    return regex.sub(expand_star, cgn)
 
 
 def expand_integers(cgn):
@@ -53,24 +46,16 @@ def expand_integers(cgn):
         The CGN string with expanded integers.
     """
     regex = re.compile(r"(-?\d+)")
-    match = regex.search(cgn)
-    while match:
-        # A match has been found
-        int_val = int(match.group(1))
-        # Create the expanded form
-        replaced_num = "{|}"
-        if int_val >= 0:
-            for _ in range(int_val):
-                replaced_num = "{" + replaced_num + "|}"
-        else:
-            for _ in range(-int_val):
-                replaced_num = "{|" + replaced_num + "}"
-        # Replace the integer
-        cgn = cgn[: match.start()] + replaced_num + cgn[match.end() :]
-        # Find the next match
-        match = regex.search(cgn)
-    # No matches left, return cgn without integers
-    return cgn
+    # The expanded integers contain no digits, so all integers are replaced in one pass
+    return regex.sub(_expand_integer, cgn)
+
+
+def _expand_integer(match):
+    # Create the expanded form of a matched integer
+    int_val = int(match.group(1))
+    if int_val >= 0:
+        return "{" * int_val + "{|}" + "|}" * int_val
+    return "{|" * -int_val + "{|}" + "}" * -int_val
 
 
 def expand_cgn(compressed_cgn):
@@ -113,6 +98,278 @@ def expand_cgn(compressed_cgn):
     return expanded
 
 
+def parse_cgn(cgn, game, number=None, nimber=None):
+    """Parse a game in compressed combinatorial game notation.
+
+    The notation is read in a single pass, without expanding it first.
+    Besides '{', ',', '|' and '}', it may contain integers, dyadic rationals
+    such as '-3/4', nimbers '*' and '*n', '^n' and 'vn' with or without '*',
+    such as '^', 'v*' and '^3*', and the words 'zero', 'star', 'up' and 'down'.
+    Nested games are parsed with an explicit stack, so their depth is not
+    limited by the recursion limit.
+
+    Parameters
+    ----------
+    cgn : str
+        The game in compressed combinatorial game notation.
+
+    game : callable
+        ``game(left, right)`` creates a game from the lists of its Left and Right options.
+
+    number : callable, optional
+        ``number(value)`` creates the canonical form of a dyadic
+        :py:class:`~fractions.Fraction`. Built with `game` by default.
+
+    nimber : callable, optional
+        ``nimber(n)`` creates the nimber *n. Built with `game` by default.
+
+    Returns
+    -------
+    game : object
+        The game created by `game`, `number` or `nimber` for the whole notation.
+
+    Raises
+    ------
+    ValueError
+        When `cgn` is not valid combinatorial game notation.
+    """
+    builder = _Builder(game)
+    number = builder.number if number is None else number
+    nimber = builder.nimber if nimber is None else nimber
+
+    # The games being parsed: their Left and Right options and whether the Left options are parsed
+    stack = []
+    result = None
+    # Whether the previous token was a game
+    after_game = False
+    previous = None
+    for match in _TOKENS.finditer(
+        cgn.replace("zero", "0").replace("star", "*").replace("up", "^").replace("down", "v")
+    ):
+        token = match.group()
+        kind = match.lastgroup
+        if kind == "invalid":
+            raise ValueError(
+                f"Invalid cgn string. Unexpected '{token}' at position {match.start():d}: '{cgn}'"
+            )
+
+        if kind == "open":
+            if after_game:
+                raise ValueError(
+                    f"Invalid cgn string. Missing ',' before position {match.start():d}: '{cgn}'"
+                )
+            stack.append([[], [], True])
+        elif kind == "comma":
+            if not after_game or not stack:
+                raise ValueError(
+                    f"Invalid cgn string. Unexpected ',' at position {match.start():d}: '{cgn}'"
+                )
+            after_game = False
+        elif kind == "bar":
+            if not stack or not stack[-1][2] or previous == "comma":
+                raise ValueError(
+                    f"Invalid cgn string. Unexpected '|' at position {match.start():d}: '{cgn}'"
+                )
+            stack[-1][2] = False
+            after_game = False
+        else:
+            if kind == "close":
+                if not stack or stack[-1][2] or previous == "comma":
+                    raise ValueError(
+                        f"Invalid cgn string. Unexpected '}}' at position {match.start():d}: "
+                        f"'{cgn}'"
+                    )
+                left, right, _ = stack.pop()
+                node = game(left, right)
+            elif after_game:
+                raise ValueError(
+                    f"Invalid cgn string. Missing ',' before position {match.start():d}: '{cgn}'"
+                )
+            else:
+                node = _atom(kind, token, number, nimber, game)
+
+            # Add the game as option of its parent
+            if stack:
+                stack[-1][0 if stack[-1][2] else 1].append(node)
+            elif result is None:
+                result = node
+            else:
+                raise ValueError(
+                    f"Invalid cgn string. Unexpected game at position {match.start():d}: '{cgn}'"
+                )
+            after_game = True
+        previous = kind
+
+    if stack or result is None:
+        raise ValueError(f"Invalid cgn string. The game is not complete: '{cgn}'")
+    return result
+
+
+# The tokens of compressed CGN, words are replaced by their symbols first
+_TOKENS = re.compile(
+    r"(?P<open>\{)|(?P<bar>\|)|(?P<comma>,)|(?P<close>\})"
+    r"|(?P<number>-?\d+(?:/\d+)?)|(?P<nimber>\*\d*)"
+    r"|(?P<up>\^\d*\*?)|(?P<down>v\d*\*?)|(?P<invalid>.)",
+    re.DOTALL,
+)
+
+
+def _atom(kind, token, number, nimber, game):
+    # Create the game of a token that is not a brace
+    if kind == "number":
+        value = Fraction(token)
+        if value.denominator & (value.denominator - 1):
+            raise ValueError(f"Invalid cgn string. '{token}' is not a dyadic rational.")
+        return number(value)
+    if kind == "nimber":
+        return nimber(int(token[1:]) if len(token) > 1 else 1)
+    # ^n or vn, with or without *
+    n = int(token[1:].rstrip("*") or 1)
+    if not n:
+        raise ValueError(f"Invalid cgn string. '{token}' has no ups or downs.")
+    zero, star = number(Fraction(0)), nimber(1)
+    up = kind == "up"
+    # ^={0|*}, ^*={0,*|0}, ^n={0|^(n-1)*} and ^n*={0|^(n-1)}
+    ups = game([zero], [star]) if up else game([star], [zero])
+    ups_star = game([zero, star], [zero]) if up else game([zero], [zero, star])
+    for _ in range(n - 1):
+        ups, ups_star = (
+            (game([zero], [ups_star]), game([zero], [ups]))
+            if up
+            else (game([ups_star], [zero]), game([ups], [zero]))
+        )
+    return ups_star if token.endswith("*") else ups
+
+
+class _Builder:
+    # Builds numbers and nimbers from a game factory, sharing their subgames
+
+    def __init__(self, game):
+        self._game = game
+        self._numbers = {}
+        self._nimbers = []
+
+    def number(self, value):
+        return evaluate(value, _identity, _number_options, self._number_node, self._numbers)
+
+    def _number_node(self, value, number):
+        options = [number(option) for option in _number_options(value)]
+        if value.denominator > 1:
+            return self._game(options[:1], options[1:])
+        if value > 0:
+            return self._game(options, [])
+        return self._game([], options)
+
+    def nimber(self, n):
+        while len(self._nimbers) <= n:
+            options = list(self._nimbers)
+            self._nimbers.append(self._game(options, list(options)))
+        return self._nimbers[n]
+
+
+def _identity(value):
+    return value
+
+
+def _number_options(value):
+    # The options of n are n-1 for Left or n+1 for Right,
+    # those of m/2^k are (m-1)/2^k for Left and (m+1)/2^k for Right
+    if value.denominator == 1:
+        if value > 0:
+            return [value - 1]
+        if value < 0:
+            return [value + 1]
+        return []
+    step = Fraction(1, value.denominator)
+    return [value - step, value + step]
+
+
+def format_cgn(left, right):
+    """Format a game in compressed combinatorial game notation.
+
+    The game is formatted from the compressed CGN of its options. When the game
+    is exactly the canonical form of an integer, a dyadic rational, a nimber or
+    ^n or vn with or without *, that value is written, so every subgame is
+    compressed in the same pass that formats it.
+
+    Parameters
+    ----------
+    left : list of str
+        The sorted compressed CGN of the Left options.
+
+    right : list of str
+        The sorted compressed CGN of the Right options.
+
+    Returns
+    -------
+    cgn : str
+        The game in compressed CGN.
+    """
+    if len(left) <= 1 and len(right) <= 1:
+        value = _format_small(left[0] if left else None, right[0] if right else None)
+        if value is not None:
+            return value
+    elif left == right and left == _nimber_options(len(left)):
+        return f"*{len(left):d}"
+    elif left == ["*", "0"] and right == ["0"]:
+        return "^*"
+    elif left == ["0"] and right == ["*", "0"]:
+        return "v*"
+    return "{" + ",".join(left) + "|" + ",".join(right) + "}"
+
+
+def _format_small(left, right):
+    # Format a game with at most one Left and one Right option, if it has a value
+    if left is None and right is None:
+        return "0"
+    if left == "0" and right == "0":
+        return "*"
+    a = _number_value(left)
+    b = _number_value(right)
+    if right is None and a is not None and a.denominator == 1 and a >= 0:
+        return str(a + 1)
+    if left is None and b is not None and b.denominator == 1 and b <= 0:
+        return str(b - 1)
+    if a is not None and b is not None:
+        # m/2^k={(m-1)/2^k|(m+1)/2^k}
+        value = (a + b) / 2
+        if value.denominator > 1 and b - a == Fraction(2, value.denominator):
+            return str(value)
+        return None
+    # ^={0|*}, ^n={0|^(n-1)*} and ^n*={0|^(n-1)}, the same for v
+    if left == "0" and right is not None:
+        return _format_ups(right, "^")
+    if right == "0" and left is not None:
+        return _format_ups(left, "v")
+    return None
+
+
+def _format_ups(option, symbol):
+    if option == "*":
+        return symbol
+    match = _UPS.fullmatch(option)
+    if match is None or match.group(1) != symbol:
+        return None
+    n = int(match.group(2) or 1) + 1
+    return f"{symbol}{n:d}" if match.group(3) else f"{symbol}{n:d}*"
+
+
+def _number_value(cgn):
+    # Get the value of a compressed CGN that is a number, otherwise None
+    if cgn is None or _NUMBER.fullmatch(cgn) is None:
+        return None
+    return Fraction(cgn)
+
+
+def _nimber_options(n):
+    # The sorted compressed CGN of the options of *n
+    return sorted(["0", "*"][:n] + [f"*{k:d}" for k in range(2, n)])
+
+
+_NUMBER = re.compile(r"-?\d+(?:/\d+)?")
+_UPS = re.compile(r"([\^v])(\d*)(\*?)")
+
+
 def compress_cgn(cgn):
     """Compress an extended combinatorial game notation string.
     Replaces some known games by their abbreviations.
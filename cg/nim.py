@@ -1,8 +1,14 @@
 from cg.game import Game
+from cg.universe import default_universe
 
 
 class Nim(Game):
     """
+    The options of a position are generated from its board when they are first
+    accessed and then cached, so only the positions that are visited are created.
+    Left and Right share the same options. The value of a position is the
+    nimber of the XOR of its heap sizes, so positions are not searched.
+
     Attributes
     ----------
     board
@@ -10,10 +16,49 @@ class Nim(Game):
     columns
     """
 
+    _lazy_options = True
+    # Whether options were assigned, then the position is not described by its board
+    _assigned = False
+
     def __init__(self, board=""):
         self.board = board
-        self.left_options = [Nim(b) for b in self.moves()]
-        self.right_options = [Nim(b) for b in self.moves()]
+        # The options are generated when first accessed
+        self._left_options = None
+        self._right_options = None
+
+    @property
+    def left_options(self):
+        if self._left_options is None:
+            self._generate_options()
+        return self._left_options
+
+    @left_options.setter
+    def left_options(self, options):
+        Game.left_options.fset(self, options)
+        self._assigned = True
+
+    @property
+    def right_options(self):
+        if self._right_options is None:
+            self._generate_options()
+        return self._right_options
+
+    @right_options.setter
+    def right_options(self, options):
+        Game.right_options.fset(self, options)
+        self._assigned = True
+
+    def clear(self):
+        Game.clear(self)
+        self._assigned = True
+
+    def _generate_options(self):
+        # Both players have the same moves, so they share the options
+        options = tuple(Nim(b) for b in self.moves())
+        if self._left_options is None:
+            self._left_options = options
+        if self._right_options is None:
+            self._right_options = options
 
     @property
     def board(self):
@@ -33,18 +78,25 @@ class Nim(Game):
         """int: Number of rows of the board."""
         return len(self._board)
 
+    # Positions are hashed by their canonical form, like interned games
+    def __hash__(self):
+        return hash(self.canonical_form())
+
     def clone(self):
         """Clone a Nim game.
 
         Returns
         -------
         clone : Nim
-            A deep copy of the Nim game.
+            A copy of the Nim game, the options are shared.
         """
         clone = Nim()
         clone._board = self._board.copy()
-        clone.left_options = [option.clone() for option in self.left_options]
-        clone.right_options = [option.clone() for option in self.right_options]
+        # The options are immutable, so they do not need to be copied
+        # Options that are not generated yet are generated by the clone itself
+        clone._left_options = self._left_options
+        clone._right_options = self._right_options
+        clone._assigned = self._assigned
         return clone
 
     def inverse(self):
@@ -61,6 +113,8 @@ class Nim(Game):
 
     def add(self, other):
         """Add a Nim game.
+        The heaps of both games are combined, so the options of the sum are
+        generated from its board when needed.
 
         Returns
         -------
@@ -71,16 +125,47 @@ class Nim(Game):
 
         # Add rows of other to self
         summed._board = self._board + other._board
-
-        # Add all options
-        left_self = [slo.add(other) for slo in self.left_options]
-        left_other = [self.add(olo) for olo in other.left_options]
-        summed.left_options = left_self + left_other
-        right_self = [sro.add(other) for sro in self.right_options]
-        right_other = [self.add(oro) for oro in other.right_options]
-        summed.right_options = right_self + right_other
         return summed
 
+    # A position is zero exactly when its Grundy value is zero
+    def geq_zero(self):
+        if self._assigned:
+            return Game.geq_zero(self)
+        return self.grundy_value() == 0
+
+    def leq_zero(self):
+        if self._assigned:
+            return Game.leq_zero(self)
+        return self.grundy_value() == 0
+
+    # The position is interned as the nimber of its Grundy value
+    # Positions with assigned options are interned by their options
+    def _interned(self):
+        if self._assigned:
+            return default_universe().game(self.left_options, self.right_options)
+        return default_universe().nimber(self.grundy_value())
+
+    def is_impartial(self):
+        if self._assigned:
+            return Game.is_impartial(self)
+        return True
+
+    def grundy_value(self):
+        """Compute the Grundy value of a Nim game.
+        The Grundy value of Nim is the XOR of the sizes of the heaps.
+
+        Returns
+        -------
+        value : int
+            The Grundy value.
+        """
+        if self._assigned:
+            return Game.grundy_value(self)
+        value = 0
+        for heap in self._board:
+            value ^= len(heap)
+        return value
+
     def board_str(self, colsep="", rowsep="\n"):
         """Return the board as :py:class:`str`.
 
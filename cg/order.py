@@ -0,0 +1,161 @@
+import numpy as np
+
+from cg.universe import default_universe
+
+
+class GameOrder:
+    """The partial order of a fixed list of games in canonical form.
+
+    All pairs of games are compared once, when the order is created. The result
+    is kept as a matrix, and as bitsets for fast lookups. Games {L|R} with options
+    from the list are then reduced to canonical form at their root only:
+    dominated options are removed by looking up the order, and only the test
+    G^LR<=G (G^RL>=G) for reversible options compares games.
+
+    This is the typical case when the games born by day n are generated from
+    the canonical games born by day n-1.
+
+    Parameters
+    ----------
+    games : iterable of Game
+        The games, they are reduced to canonical form.
+
+    universe : GameUniverse, optional
+        The universe of the games. Defaults to the default universe.
+
+    matrix : array_like, optional
+        A precomputed order, as returned by :py:attr:`matrix` for the same games.
+        When not given, all pairs of games are compared.
+
+    Examples
+    --------
+    >>> order = GameOrder([Game("0"), Game("*"), Game("1")])
+    >>> str(order.canonical_form([0, 1], [0]))
+    '^*'
+    """
+
+    def __init__(self, games, universe=None, matrix=None):
+        self._universe = default_universe() if universe is None else universe
+        self._games = tuple(self._universe.canonical_form(g) for g in games)
+        n = len(self._games)
+        if matrix is None:
+            geq = self._universe.geq
+            matrix = np.array(
+                [[geq(h, g) for h in self._games] for g in self._games], dtype=bool
+            ).reshape(n, n)
+        else:
+            matrix = np.array(matrix, dtype=bool)
+            if matrix.shape != (n, n):
+                raise ValueError("The matrix must have a row and a column for every game.")
+        matrix.flags.writeable = False
+        self._matrix = matrix
+
+        # Bitsets of the games above and below each game, without the game itself
+        self._above = [_bitset(row) & ~(1 << i) for i, row in enumerate(matrix)]
+        self._below = [_bitset(column) & ~(1 << i) for i, column in enumerate(matrix.T)]
+
+    def __len__(self):
+        return len(self._games)
+
+    @property
+    def games(self):
+        """tuple of InternedGame: The canonical forms of the games."""
+        return self._games
+
+    @property
+    def universe(self):
+        """GameUniverse: The universe of the games."""
+        return self._universe
+
+    @property
+    def matrix(self):
+        """numpy.ndarray: The read-only order.
+
+        ``matrix[i, j]`` is :py:const:`True` when G_i<=G_j.
+        """
+        return self._matrix
+
+    def leq(self, i, j):
+        """Check whether a game is less than or equal to another game.
+
+        Parameters
+        ----------
+        i, j : int
+            The ids of the games G_i and G_j.
+
+        Returns
+        -------
+        leq : bool
+            :py:const:`True` when G_i<=G_j.
+        """
+        return i == j or bool(self._above[i] >> j & 1)
+
+    def incomparable(self, i, j):
+        """Check whether two games are incomparable.
+
+        Parameters
+        ----------
+        i, j : int
+            The ids of the games G_i and G_j.
+
+        Returns
+        -------
+        incomparable : bool
+            :py:const:`True` when G_i~G_j.
+        """
+        return i != j and not (self._above[i] | self._below[i]) >> j & 1
+
+    def canonical_form(self, left, right):
+        """Compute the canonical form of a game with options from the list.
+
+        Parameters
+        ----------
+        left : iterable of int
+            The ids of the Left options.
+
+        right : iterable of int
+            The ids of the Right options.
+
+        Returns
+        -------
+        canonical : InternedGame
+            The canonical form of {G_left|G_right}.
+        """
+        left = self._maximal(set(left), self._above, self._below)
+        right = self._maximal(set(right), self._below, self._above)
+        universe = self._universe
+        game = universe.game([self._games[i] for i in left], [self._games[i] for i in right])
+        if game._canonical:
+            return game
+
+        # The options are canonical and not dominated, so G is canonical
+        # unless it has a reversible option
+        if any(
+            universe.geq(game, glr) for gl in game.left_options for glr in gl.right_options
+        ) or any(universe.geq(grl, game) for gr in game.right_options for grl in gr.left_options):
+            # Only the root is reduced, the options are canonical
+            return universe.canonical_form(game)
+        game._canonical = True
+        return game
+
+    def _maximal(self, ids, above, below):
+        # Remove the ids with a greater id, and equal ids but the first
+        mask = 0
+        for i in ids:
+            if not 0 <= i < len(self._games):
+                raise IndexError(f"Game id {i} is not in the order.")
+            mask |= 1 << i
+        kept = []
+        for i in ids:
+            greater = above[i] & mask
+            if not greater & ~below[i] and not greater & ((1 << i) - 1):
+                kept.append(i)
+        return kept
+
+
+def _bitset(row):
+    # Get the indices of the True values of a row as bits of an int. The row
+    # is packed reversed, since numpy<1.17 only packs big-endian bits, and the
+    # padding of the last byte is shifted out
+    packed = np.packbits(row[::-1]).tobytes()
+    return int.from_bytes(packed, "big") >> (-len(row) % 8)
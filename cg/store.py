@@ -0,0 +1,186 @@
+import os
+from itertools import chain
+
+import numpy as np
+
+from cg.game import Game
+from cg.table import GameTable
+from cg.traversal import evaluate
+
+
+class GameStore:
+    """A read-only list of games, memory-mapped from a binary file.
+
+    The file is written by :py:func:`write_games`. It holds the games as a
+    :py:class:`~cg.table.GameTable` in which every distinct subgame is stored
+    once, and an index with the id of each game in the table. Opening a store
+    only maps the file, the games are read when they are accessed. Processes
+    that open the same file share its pages, and a pickled store is opened
+    again from its path.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        The file of the store.
+
+    offset : int, optional
+        The position of the store in the file, when it is part of a larger file.
+
+    validate : bool, optional
+        Whether to check that all options in the file refer to earlier games,
+        which reads the whole file. Only the header and the offsets are checked
+        by default.
+
+    Examples
+    --------
+    >>> write_games("games.cgs", [Game("*"), Game("{^|v}")])
+    >>> store = GameStore("games.cgs")
+    >>> store.cgn(1)
+    '{^|v}'
+    """
+
+    def __init__(self, path, offset=0, validate=False):
+        self._path = os.fspath(path)
+        self._offset = offset
+        data = np.memmap(self._path, dtype=np.uint8, mode="r", offset=offset)
+        if len(data) < _HEADER_SIZE or bytes(data[: len(_MAGIC)]) != _MAGIC:
+            raise ValueError(f"{self._path} is not a game store.")
+        itemsize, size, n_left, n_right, n_games = (
+            data[len(_MAGIC) : _HEADER_SIZE].view(_HEADER_DTYPE).tolist()
+        )
+        if itemsize not in _DTYPES:
+            raise ValueError(f"{self._path} has an unknown integer size {itemsize}.")
+        lengths = (size + 1, n_left, size + 1, n_right, n_games)
+        if len(data) != _HEADER_SIZE + itemsize * sum(lengths):
+            raise ValueError(f"{self._path} does not have the size given by its header.")
+
+        # Views of the mapped file, nothing is copied
+        arrays = []
+        start = _HEADER_SIZE
+        for length in lengths:
+            end = start + itemsize * length
+            arrays.append(data[start:end].view(_DTYPES[itemsize]))
+            start = end
+        self._table = GameTable.from_arrays(*arrays[:4], copy=False, validate=validate)
+        self._index = arrays[4]
+        if len(self._index) and (self._index.min() < 0 or self._index.max() >= size):
+            raise ValueError(f"{self._path} refers to games that are not in the table.")
+
+    def __len__(self):
+        return len(self._index)
+
+    def __getitem__(self, i):
+        return self._table.game(self.table_id(i))
+
+    def __reduce__(self):
+        # Map the file again instead of pickling the arrays
+        return GameStore, (self._path, self._offset)
+
+    @property
+    def path(self):
+        """str: The file of the store."""
+        return self._path
+
+    @property
+    def table(self):
+        """GameTable: The table of all subgames of the games, backed by the file."""
+        return self._table
+
+    def table_id(self, i):
+        """Get the id of a game in the table of the store.
+
+        Parameters
+        ----------
+        i : int
+            The number of the game, negative numbers count from the end.
+
+        Returns
+        -------
+        idx : int
+            The id of the game in :py:attr:`table`.
+        """
+        if not -len(self) <= i < len(self):
+            raise IndexError(f"Game number {i} is not in the store.")
+        return int(self._index[i])
+
+    def cgn(self, i):
+        """Get a game of the store in combinatorial game notation.
+
+        Parameters
+        ----------
+        i : int
+            The number of the game, negative numbers count from the end.
+
+        Returns
+        -------
+        cgn : str
+            The game in combinatorial game notation.
+        """
+        return str(self[i])
+
+
+def write_games(path, games):
+    """Write games to a file that can be opened as a :py:class:`GameStore`.
+
+    Subgames with the same options are stored once, also across games, so the
+    games form a DAG of integer ids. The ids are stored as 32-bit integers when
+    possible.
+
+    Parameters
+    ----------
+    path : str, os.PathLike or file object
+        The file to write. A binary file object is written from its current position.
+
+    games : iterable of Game or str
+        The games to write, in order. Strings are read as combinatorial game notation.
+
+    Returns
+    -------
+    None
+    """
+    table = GameTable()
+    # The id of every distinct pair of option ids
+    nodes = {}
+
+    def add_node(game, value):
+        key = (tuple(map(value, game.left_options)), tuple(map(value, game.right_options)))
+        idx = nodes.get(key)
+        if idx is None:
+            idx = nodes[key] = table.append(*key)
+        return idx
+
+    index = []
+    for game in games:
+        if isinstance(game, str):
+            game = Game(game)
+        # The ids of subgames are only valid while the game is alive
+        index.append(evaluate(game, id, _options, add_node))
+
+    arrays = table.arrays()
+    itemsize = 4 if max(len(table), len(arrays[1]), len(arrays[3])) < 2 ** 31 else 8
+    header = np.array(
+        [itemsize, len(table), len(arrays[1]), len(arrays[3]), len(index)], dtype=_HEADER_DTYPE
+    )
+    if hasattr(path, "write"):
+        _write_arrays(path, header, (*arrays, index), _DTYPES[itemsize])
+    else:
+        with open(path, "wb") as file:
+            _write_arrays(file, header, (*arrays, index), _DTYPES[itemsize])
+
+
+def _write_arrays(file, header, arrays, dtype):
+    file.write(_MAGIC)
+    file.write(header.tobytes())
+    for array in arrays:
+        file.write(np.asarray(array, dtype=dtype).tobytes())
+
+
+def _options(game):
+    return chain(game.left_options, game.right_options)
+
+
+_MAGIC = b"CGSTORE1"
+_HEADER_DTYPE = np.dtype("<u8")
+_HEADER_SIZE = len(_MAGIC) + 5 * _HEADER_DTYPE.itemsize
+# The little-endian integer types by their size in bytes
+_DTYPES = {4: np.dtype("<i4"), 8: np.dtype("<i8")}
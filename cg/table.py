@@ -0,0 +1,302 @@
+from itertools import chain
+
+import numpy as np
+
+from cg.game import Game
+from cg.traversal import evaluate
+
+
+class GameTable:
+    """A compact, append-only table of games stored in NumPy arrays.
+
+    Every game in the table is an integer id. The options of all games are stored
+    in compressed sparse row (CSR) form: the Left options of game `i` are the ids
+    ``left_index[left_offsets[i]:left_offsets[i + 1]]``, and likewise for Right.
+    Options always refer to games that were added before, so the ids are in
+    topological order and bulk algorithms can process the games by increasing id.
+
+    The table holds no Python objects per game, so it can be pickled, saved or
+    shared between processes as four integer arrays.
+
+    Parameters
+    ----------
+    capacity : int, optional
+        The number of games and options to reserve space for. The table grows when needed.
+
+    Examples
+    --------
+    >>> t = GameTable()
+    >>> zero = t.append()
+    >>> star = t.append([zero], [zero])
+    >>> str(t.game(star))
+    '*'
+    """
+
+    dtype = np.int64
+
+    def __init__(self, capacity=1024):
+        if capacity < 1:
+            raise ValueError("The capacity must be positive.")
+        self._size = 0
+        self._left_offsets = np.zeros(capacity + 1, dtype=self.dtype)
+        self._right_offsets = np.zeros(capacity + 1, dtype=self.dtype)
+        self._left_index = np.empty(capacity, dtype=self.dtype)
+        self._right_index = np.empty(capacity, dtype=self.dtype)
+
+    def __len__(self):
+        return self._size
+
+    def __getstate__(self):
+        # Pickle only the used part of the arrays
+        return self.arrays()
+
+    def __setstate__(self, state):
+        self.__init__(1)
+        self._load(*state)
+
+    def arrays(self):
+        """Get the arrays of the table.
+
+        Returns
+        -------
+        left_offsets, left_index, right_offsets, right_index : numpy.ndarray
+            The CSR arrays of the Left and Right options. The offsets have one
+            entry more than the number of games. The arrays are read-only views.
+        """
+        arrays = (
+            self._left_offsets[: self._size + 1],
+            self._left_index[: self._left_offsets[self._size]],
+            self._right_offsets[: self._size + 1],
+            self._right_index[: self._right_offsets[self._size]],
+        )
+        for array in arrays:
+            array.flags.writeable = False
+        return arrays
+
+    @classmethod
+    def from_arrays(
+        cls, left_offsets, left_index, right_offsets, right_index, copy=True, validate=True
+    ):
+        """Create a table from CSR arrays, as returned by :py:meth:`arrays`.
+
+        Parameters
+        ----------
+        left_offsets, left_index, right_offsets, right_index : array_like
+            The CSR arrays of the Left and Right options.
+
+        copy : bool, optional
+            Whether the arrays are copied. Otherwise integer arrays are used as
+            they are, such as read-only memory-mapped arrays. They are copied
+            only when games are appended to the table.
+
+        validate : bool, optional
+            Whether to check that all options refer to earlier games, which reads
+            all indices. The sizes and the order of the offsets are always checked.
+
+        Returns
+        -------
+        table : GameTable
+            A table with the arrays.
+        """
+        table = cls(1)
+        table._load(left_offsets, left_index, right_offsets, right_index, copy, validate)
+        return table
+
+    def _load(self, left_offsets, left_index, right_offsets, right_index, copy=True, validate=True):
+        arrays = (left_offsets, left_index, right_offsets, right_index)
+        if copy:
+            arrays = [np.array(array, dtype=self.dtype) for array in arrays]
+        else:
+            arrays = [np.asarray(array) for array in arrays]
+            if any(array.dtype.kind not in "iu" for array in arrays):
+                raise ValueError("The arrays must have an integer dtype.")
+        left_offsets, left_index, right_offsets, right_index = arrays
+        size = len(left_offsets) - 1
+        if size < 0 or len(right_offsets) != size + 1:
+            raise ValueError("The offsets must have one entry more than the number of games.")
+        if left_offsets[-1] != len(left_index) or right_offsets[-1] != len(right_index):
+            raise ValueError("The offsets do not match the length of the indices.")
+        for offsets, index in ((left_offsets, left_index), (right_offsets, right_index)):
+            if offsets[0] != 0 or np.any(offsets[1:] < offsets[:-1]):
+                raise ValueError("The offsets must start at 0 and must not decrease.")
+            # Options must refer to earlier games
+            if validate and len(index):
+                games = np.repeat(np.arange(size), np.diff(offsets))
+                if np.any(index < 0) or np.any(index >= games):
+                    raise ValueError("Options must refer to games that were added before.")
+        self._size = size
+        self._left_offsets, self._left_index = left_offsets, left_index
+        self._right_offsets, self._right_index = right_offsets, right_index
+
+    def append(self, left_options=(), right_options=()):
+        """Add a game by the ids of its options.
+
+        Parameters
+        ----------
+        left_options : iterable of int, optional
+            The ids of the Left options. They must already be in the table.
+
+        right_options : iterable of int, optional
+            The ids of the Right options. They must already be in the table.
+
+        Returns
+        -------
+        idx : int
+            The id of the new game.
+        """
+        left = np.fromiter(left_options, dtype=self.dtype)
+        right = np.fromiter(right_options, dtype=self.dtype)
+        for options in (left, right):
+            if len(options) and (options.min() < 0 or options.max() >= self._size):
+                raise ValueError("Options must refer to games that were added before.")
+
+        idx = self._size
+        if idx + 1 >= len(self._left_offsets) or not self._left_offsets.flags.writeable:
+            self._left_offsets = _grow(self._left_offsets, idx + 2)
+            self._right_offsets = _grow(self._right_offsets, idx + 2)
+        self._left_index = self._extend(self._left_index, self._left_offsets, idx, left)
+        self._right_index = self._extend(self._right_index, self._right_offsets, idx, right)
+        self._size += 1
+        return idx
+
+    @staticmethod
+    def _extend(index, offsets, idx, options):
+        # Store the options of game `idx` and set its end offset
+        start = offsets[idx]
+        end = start + len(options)
+        if end > len(index) or not index.flags.writeable:
+            index = _grow(index, end)
+        index[start:end] = options
+        offsets[idx + 1] = end
+        return index
+
+    def left_options(self, idx):
+        """Get the ids of the Left options of a game.
+
+        Parameters
+        ----------
+        idx : int
+            The id of the game.
+
+        Returns
+        -------
+        options : numpy.ndarray
+            The ids of the Left options.
+        """
+        self._check(idx)
+        return self._left_index[self._left_offsets[idx] : self._left_offsets[idx + 1]]
+
+    def right_options(self, idx):
+        """Get the ids of the Right options of a game.
+
+        Parameters
+        ----------
+        idx : int
+            The id of the game.
+
+        Returns
+        -------
+        options : numpy.ndarray
+            The ids of the Right options.
+        """
+        self._check(idx)
+        return self._right_index[self._right_offsets[idx] : self._right_offsets[idx + 1]]
+
+    def _check(self, idx):
+        if not 0 <= idx < self._size:
+            raise IndexError(f"Game id {idx} is not in the table.")
+
+    def add_game(self, game):
+        """Add a game and all its subgames.
+
+        Subgames that are the same object, such as the shared nodes of games
+        in a :py:class:`~cg.universe.GameUniverse`, are added only once.
+
+        Parameters
+        ----------
+        game : Game
+            The game to add.
+
+        Returns
+        -------
+        idx : int
+            The id of the game in the table.
+        """
+        return evaluate(game, id, _options, self._add_node)
+
+    def _add_node(self, game, value):
+        return self.append(map(value, game.left_options), map(value, game.right_options))
+
+    def add_cgn(self, cgn):
+        """Add a game from combinatorial game notation.
+
+        Parameters
+        ----------
+        cgn : str
+            The game in combinatorial game notation.
+
+        Returns
+        -------
+        idx : int
+            The id of the game in the table.
+        """
+        return self.add_game(Game(cgn))
+
+    def game(self, idx):
+        """Create a :py:class:`~cg.game.Game` from the table.
+
+        Subgames with the same id are shared by the created game.
+
+        Parameters
+        ----------
+        idx : int
+            The id of the game.
+
+        Returns
+        -------
+        game : Game
+            The game with id `idx`.
+        """
+        self._check(idx)
+        return evaluate(int(idx), int, self._option_ids, self._game_node)
+
+    def _option_ids(self, idx):
+        ids = [*self.left_options(idx).tolist(), *self.right_options(idx).tolist()]
+        # Checked as each game is read, so a table that was not validated has no cycles
+        if ids and (min(ids) < 0 or max(ids) >= idx):
+            raise ValueError(
+                f"The options of game {idx} must refer to games that were added before."
+            )
+        return ids
+
+    def _game_node(self, idx, value):
+        game = Game()
+        game.left_options = [value(i) for i in self.left_options(idx).tolist()]
+        game.right_options = [value(i) for i in self.right_options(idx).tolist()]
+        return game
+
+    def cgn(self, idx):
+        """Get a game of the table in combinatorial game notation.
+
+        Parameters
+        ----------
+        idx : int
+            The id of the game.
+
+        Returns
+        -------
+        cgn : str
+            The game in combinatorial game notation.
+        """
+        return str(self.game(idx))
+
+
+def _options(game):
+    return chain(game.left_options, game.right_options)
+
+
+def _grow(array, size):
+    # Reallocate an array to at least `size` entries, doubling the capacity
+    grown = np.zeros(max(size, 2 * len(array)), dtype=array.dtype)
+    grown[: len(array)] = array
+    return grown
@@ -0,0 +1,150 @@
+def evaluate(root, key, children, compute, table=None, known=None):
+    """Evaluate a function on a game graph bottom-up, without recursion.
+
+    The nodes are visited in post-order with an explicit stack, so the depth of
+    the graph is not limited by the recursion limit of Python. The value of a
+    node is computed once the values of all its children are known, and every
+    node is computed at most once.
+
+    Parameters
+    ----------
+    root : object
+        The node to evaluate.
+
+    key : callable
+        Maps a node to the hashable key of its value.
+
+    children : callable
+        Maps a node to the nodes that its value depends on.
+
+    compute : callable
+        ``compute(node, value)`` computes the value of a node,
+        ``value(child)`` gets the value of one of its children.
+
+    table : mapping, optional
+        Memoised values by key. It is read before a node is visited and
+        every computed value is stored in it.
+
+    known : callable, optional
+        Gets the value of a node when it is known without visiting its
+        children, otherwise returns :py:data:`UNKNOWN`.
+
+    Returns
+    -------
+    value : object
+        The value of `root`.
+    """
+    k = key(root)
+    value = UNKNOWN if table is None else table.get(k, UNKNOWN)
+    if value is UNKNOWN and known is not None:
+        value = known(root)
+    if value is not UNKNOWN:
+        return value
+
+    # The values found during this traversal, a bounded table may evict them
+    results = {}
+
+    def value_of(node):
+        return results[key(node)]
+
+    # Visit the root again once its children are done
+    stack = [(root, k, True)]
+    stack.extend((child, key(child), False) for child in children(root))
+    while stack:
+        node, k, expanded = stack.pop()
+        if expanded:
+            value = results[k] = compute(node, value_of)
+            if table is not None:
+                table[k] = value
+        elif k not in results:
+            value = UNKNOWN if table is None else table.get(k, UNKNOWN)
+            if value is UNKNOWN and known is not None:
+                value = known(node)
+            if value is UNKNOWN:
+                stack.append((node, k, True))
+                stack.extend((child, key(child), False) for child in children(node))
+            else:
+                results[k] = value
+    return results[key(root)]
+
+
+def refute(root, key, children, table=None, known=None):
+    """Evaluate a predicate on a game graph, without recursion.
+
+    The predicate P holds for a node x when it fails for all children of x,
+    like G>=0 holds when no G^R<=0 exists. The children are searched depth-first
+    with an explicit stack, and the search of a node stops at its first child
+    for which P holds.
+
+    Parameters
+    ----------
+    root : object
+        The node to evaluate.
+
+    key : callable
+        Maps a node to the hashable key of its value.
+
+    children : callable
+        Maps a node to an iterable of its children.
+
+    table : mapping, optional
+        Memoised values by key. It is read before a node is visited and
+        every value found is stored in it.
+
+    known : callable, optional
+        Gets the value of a node when it is known without searching its
+        children, otherwise returns :py:data:`UNKNOWN`.
+
+    Returns
+    -------
+    holds : bool
+        Whether P holds for `root`.
+    """
+    results = {}
+
+    def lookup(node):
+        k = key(node)
+        value = results.get(k, UNKNOWN)
+        if value is UNKNOWN and table is not None:
+            value = table.get(k, UNKNOWN)
+        if value is UNKNOWN and known is not None:
+            value = known(node)
+        return value
+
+    holds = lookup(root)
+    if holds is not UNKNOWN:
+        return holds
+
+    stack = [(root, iter(children(root)))]
+    while stack:
+        node, todo = stack[-1]
+        holds = True
+        for child in todo:
+            value = lookup(child)
+            if value is UNKNOWN:
+                # Search the child first, then continue with this node
+                stack.append((child, iter(children(child))))
+                holds = UNKNOWN
+                break
+            if value:
+                holds = False
+                break
+        if holds is UNKNOWN:
+            continue
+
+        # The node is decided, which may decide its parents as well
+        while True:
+            stack.pop()
+            k = key(node)
+            results[k] = holds
+            if table is not None:
+                table[k] = holds
+            if not holds or not stack:
+                break
+            # P holds for the node, so it fails for its parent
+            node, holds = stack[-1][0], False
+    return holds
+
+
+# Sentinel for values that are not known yet, None can be a value
+UNKNOWN = object()
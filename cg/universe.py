@@ -0,0 +1,1027 @@
+import weakref
+from fractions import Fraction
+from itertools import chain
+from operator import attrgetter
+
+import cg.game_notations as gn
+from cg.cache import Cache
+from cg.game import DisjunctiveSum, Game, NegatedGame
+from cg.traversal import UNKNOWN, evaluate, refute
+
+
+class InternedGame(Game):
+    """A game node that is shared by all structurally identical games of a universe.
+
+    Interned games are immutable: their options are tuples of other interned games
+    of the same universe. Each node has an integer id that is unique in its universe
+    and never changes.
+
+    Interned games are hashable. Games that are equal have the same hash, which is
+    the structural hash of their canonical form. Two canonical forms are equal
+    exactly when they have the same structure, so they are compared without
+    comparing their values.
+
+    The CGN of each node is formatted once and kept, so converting a game to
+    :py:class:`str` only formats the subgames that were not formatted before.
+
+    Attributes
+    ----------
+    universe
+    uid
+    left_options
+    right_options
+    """
+
+    def __init__(self, universe, uid, left_options, right_options):
+        self._universe = universe
+        self._uid = uid
+        self._left_options = left_options
+        self._right_options = right_options
+        # Whether the game is known to be in canonical form
+        self._canonical = False
+        # The structural hash, computed when first needed
+        self._hash = None
+        # The compressed CGN, formatted when first needed
+        self._cgn = None
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, Game):
+            return NotImplemented
+        if self._canonical and getattr(other, "_canonical", False):
+            # Canonical forms are unique, so equal canonical games have the same structure
+            return self._universe.intern(other) is self
+        return self.equal(other)
+
+    def __hash__(self):
+        canon = self if self._canonical else self._universe.canonical_form(self)
+        return self._universe.structural_hash(canon)
+
+    @property
+    def universe(self):
+        """GameUniverse: The universe this game belongs to."""
+        return self._universe
+
+    @property
+    def uid(self):
+        """int: The id of the game in its universe."""
+        return self._uid
+
+    @property
+    def left_options(self):
+        """tuple: The Left options of the game."""
+        return self._left_options
+
+    @property
+    def right_options(self):
+        """tuple: The Right options of the game."""
+        return self._right_options
+
+    def clear(self):
+        raise TypeError("Interned games are immutable.")
+
+    def set_cgn(self, cgn):
+        raise TypeError("Interned games are immutable.")
+
+    # Interned games are immutable, so each node is formatted only once
+    def _get_node_cgn(self):
+        return evaluate(self, _uid, _options, _interned_cgn, known=_known_cgn)
+
+    # Interned games are immutable, so they can be shared instead of copied
+    def clone(self):
+        return self
+
+    def inverse(self):
+        return self._universe.inverse(self)
+
+    def add(self, other):
+        return self._universe.add(self, other)
+
+    def _interned(self):
+        return self
+
+    def __reduce__(self):
+        # Pickled as the options of all its subgames, not with its universe.
+        # The game is interned in the default universe when it is loaded
+        return _unpickle_game, (_game_nodes(self),)
+
+
+class GameUniverse:
+    """A factory that interns games by their structure.
+
+    Every game created through a universe is an :py:class:`InternedGame`.
+    Two games with the same Left and Right options are the same object,
+    so games built from a universe form a directed acyclic graph instead of a tree.
+    Sums, inverses and canonical forms are memoised on the ids of the games.
+    The results of :py:meth:`geq_zero` and :py:meth:`leq_zero` are kept in a
+    bounded transposition table, :py:attr:`outcomes`.
+    The results of :py:meth:`geq` are kept in :py:attr:`comparisons`.
+    The canonical forms are kept in :py:attr:`canonicals`, so every subgame is
+    reduced only once. All tables evict their least recently used entries when full.
+    Canonical forms of numbers are recognised by their structure, so numbers
+    are added, negated and compared by their values.
+    Impartial games are reduced to nimbers by their Grundy values,
+    nimbers are added by XOR.
+    The games are traversed with explicit stacks, see :py:mod:`cg.traversal`,
+    so the depth of a game is not limited by the recursion limit.
+    The universe only keeps the games that are still used, or that are kept by
+    one of its tables, so its memory is bounded by the sizes of the tables.
+
+    Parameters
+    ----------
+    table_size : int, optional
+        The maximum number of entries in each of the tables.
+
+    Examples
+    --------
+    >>> u = GameUniverse()
+    >>> u.from_cgn("*") is u.game([u.zero], [u.zero])
+    True
+    """
+
+    def __init__(self, table_size=2 ** 20):
+        # Map of (Left ids, Right ids) to the interned game, games that are no longer
+        # used are dropped. Ids are never reused, so the tables keyed by ids stay valid
+        self._nodes = weakref.WeakValueDictionary()
+        self._next_uid = 0
+        # Memoised results, keyed by ids
+        self._inverses = Cache(table_size)
+        self._sums = Cache(table_size)
+        # Map of ids to the canonical forms
+        self.canonicals = Cache(table_size)
+        # Map of ids to number values (None when not a number) and of values to games
+        self._numbers = Cache(table_size)
+        self._number_games = Cache(table_size)
+        # Map of ids to Grundy values (None when not impartial) and the nimbers *n
+        self._grundy = Cache(table_size)
+        self._nimbers = []
+        # Transposition table of the comparisons with zero
+        # Both comparisons share one table: even keys are >= 0, odd keys are <= 0
+        self.outcomes = Cache(table_size)
+        # Table of the pairwise comparisons G>=H, keyed by (G, H) ids
+        self.comparisons = Cache(table_size)
+        self.zero = self.game()
+        self.zero._canonical = True
+        self._number_games[Fraction(0)] = self.zero
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __contains__(self, game):
+        return isinstance(game, InternedGame) and game.universe is self
+
+    def game(self, left_options=(), right_options=()):
+        """Get the game with the given options.
+
+        Parameters
+        ----------
+        left_options : iterable of Game, optional
+            The Left options of the game. Games not in this universe are interned first.
+
+        right_options : iterable of Game, optional
+            The Right options of the game. Games not in this universe are interned first.
+
+        Returns
+        -------
+        game : InternedGame
+            The unique game in this universe with these options.
+        """
+        return self._node(
+            [self.intern(opt) for opt in left_options], [self.intern(opt) for opt in right_options]
+        )
+
+    def _node(self, left, right):
+        # Get the node with the interned Left and Right options
+        key = (tuple(sorted([gl._uid for gl in left])), tuple(sorted([gr._uid for gr in right])))
+        node = self._nodes.get(key)
+        if node is None:
+            # This structure has not been seen before, create it
+            node = InternedGame(
+                self, self._next_uid, tuple(sorted(left, key=_uid)), tuple(sorted(right, key=_uid))
+            )
+            self._next_uid += 1
+            self._nodes[key] = node
+        return node
+
+    def intern(self, game):
+        """Get the game in this universe that has the same structure as `game`.
+
+        A :py:class:`~cg.game.DisjunctiveSum` is not expanded, it is interned as
+        the canonical form of its value, see :py:meth:`sum`.
+
+        Parameters
+        ----------
+        game : Game
+            The game to intern.
+
+        Returns
+        -------
+        interned : InternedGame
+            The interned game.
+        """
+        if game in self:
+            return game
+        # Memoise on object identity, the same subgame may occur multiple times
+        return evaluate(game, id, _options, self._intern_node, known=self._known_interned)
+
+    def _intern_node(self, game, value):
+        node = self._node(
+            [value(gl) for gl in game.left_options], [value(gr) for gr in game.right_options]
+        )
+        if game._canonical:
+            # Games marked as canonical are not reduced again
+            node._canonical = True
+        return node
+
+    def _known_interned(self, game):
+        if game in self:
+            return game
+        if isinstance(game, NegatedGame):
+            # Negate the interned game instead of the options of the view
+            return self.inverse(game.game)
+        if isinstance(game, DisjunctiveSum):
+            # Sums are only interned by their value, they are never expanded
+            return self.sum(game.components)
+        if not isinstance(game, InternedGame) and type(game)._interned is not Game._interned:
+            # Games such as Clobber positions are interned by their own tables
+            return self.intern(game._interned())
+        return UNKNOWN
+
+    def structural_hash(self, game):
+        """Compute a hash of the structure of a game.
+
+        The hash does not depend on the universe or on the order of the options,
+        so structurally identical games in different universes have the same hash.
+
+        Parameters
+        ----------
+        game : Game
+            The game to hash.
+
+        Returns
+        -------
+        hash : int
+            The hash of the structure of the game.
+        """
+        return evaluate(self.intern(game), _uid, _options, _structural_hash, known=_known_hash)
+
+    def from_cgn(self, cgn, assume_canonical=False):
+        """Create a game in this universe from combinatorial game notation.
+
+        Parameters
+        ----------
+        cgn : str
+            The game in combinatorial game notation.
+
+        assume_canonical : bool, optional
+            When :py:const:`True`, the game is trusted to be in canonical form,
+            so it and its subgames are never reduced. Defaults to :py:const:`False`.
+
+        Returns
+        -------
+        game : InternedGame
+            The interned game.
+        """
+        # Numbers and nimbers are created by value, the other games node by node
+        game = gn.parse_cgn(cgn, self._node, self.number_game, self.nimber)
+        if assume_canonical:
+            game._mark_canonical()
+        return game
+
+    def inverse(self, game):
+        """Compute the inverse of a game.
+
+        Parameters
+        ----------
+        game : Game
+            The game to invert.
+
+        Returns
+        -------
+        inverse : InternedGame
+            The inverse of the game.
+        """
+        return evaluate(
+            self.intern(game),
+            _uid,
+            _options,
+            self._inverse_node,
+            self._inverses,
+            self._known_inverse,
+        )
+
+    def _known_inverse(self, game):
+        value = self.number(game)
+        if value is not None:
+            return self.number_game(-value)
+        value = self.grundy(game)
+        if value is not None and game is self.nimber(value):
+            # Nimbers are their own inverse, other impartial games may not have
+            # the same Left and Right options, e.g. {0,0|0}
+            return game
+        return UNKNOWN
+
+    def _inverse_node(self, game, value):
+        inv = self._node(
+            [value(gr) for gr in game.right_options], [value(gl) for gl in game.left_options]
+        )
+        # The inverse of a canonical form is canonical
+        inv._canonical = inv._canonical or game._canonical
+        self._inverses[inv.uid] = game
+        return inv
+
+    def add(self, game, other):
+        """Compute the sum of two games.
+
+        Parameters
+        ----------
+        game : Game
+            The first game.
+
+        other : Game
+            The second game.
+
+        Returns
+        -------
+        summed : InternedGame
+            The sum of both games.
+        """
+        return evaluate(
+            (self.intern(game), self.intern(other)),
+            _sum_key,
+            _sum_options,
+            self._sum_node,
+            self._sums,
+            self._known_sum,
+        )
+
+    def sum(self, games):
+        """Compute the canonical form of a sum of games.
+
+        The games are reduced to their canonical forms first. Numbers are added by
+        their values and nimbers by XOR. Games that cancel against the inverse of
+        another game are removed, and repeated games are added by doubling.
+        The rest is added one game at a time, and the sum is reduced after each
+        step, so the full sum is never constructed.
+
+        Parameters
+        ----------
+        games : iterable of Game
+            The games to add.
+
+        Returns
+        -------
+        canonical : InternedGame
+            The canonical form of the sum.
+        """
+        number = Fraction(0)
+        nim_value = 0
+        # The other canonical forms and their multiplicities, by uid
+        counts = {}
+        for game in games:
+            canon = self.canonical_form(game)
+            value = self.number(canon)
+            if value is not None:
+                number += value
+                continue
+            value = self.grundy(canon)
+            if value is not None:
+                nim_value ^= value
+                continue
+            inverse = self.canonical_form(self.inverse(canon))
+            if inverse.uid in counts:
+                # G+(-G)=0
+                counts[inverse.uid][1] -= 1
+                if not counts[inverse.uid][1]:
+                    del counts[inverse.uid]
+            else:
+                counts.setdefault(canon.uid, [canon, 0])[1] += 1
+
+        total = self.nimber(nim_value)
+        for canon, n in counts.values():
+            total = self.canonical_form(self.add(total, self._multiple(canon, n)))
+        return self.translate(total, number)
+
+    def translate(self, game, number):
+        """Add a number to a game in canonical form.
+
+        By the number translation theorem, G+x={G^L+x|G^R+x} when G is not a number,
+        and the result is in canonical form again. So the sum is not reduced.
+
+        Parameters
+        ----------
+        game : Game
+            The game G in canonical form.
+
+        number : Fraction
+            The number x.
+
+        Returns
+        -------
+        translated : InternedGame
+            The canonical form of G+x.
+        """
+        if not number:
+            return self.intern(game)
+        return evaluate(
+            self.intern(game),
+            _uid,
+            _options,
+            self._translate_node,
+            known=lambda g: self._known_translate(g, number),
+        )
+
+    def _known_translate(self, game, number):
+        value = self.number(game)
+        if value is not None:
+            return self.number_game(value + number)
+        return UNKNOWN
+
+    def _translate_node(self, game, value):
+        translated = self._node(
+            [value(gl) for gl in game.left_options], [value(gr) for gr in game.right_options]
+        )
+        translated._canonical = True
+        return translated
+
+    def _multiple(self, game, n):
+        # Add n copies of a canonical game by doubling, reducing after each addition
+        multiple = self.zero
+        while n:
+            if n & 1:
+                multiple = self.canonical_form(self.add(multiple, game))
+            n >>= 1
+            if n:
+                game = self.canonical_form(self.add(game, game))
+        return multiple
+
+    def _known_sum(self, pair):
+        game, other = pair
+        if game is self.zero:
+            return other
+        if other is self.zero:
+            return game
+        value, other_value = self.number(game), self.number(other)
+        if value is not None and other_value is not None:
+            return self.number_game(value + other_value)
+        nim_value, other_nim_value = self.grundy(game), self.grundy(other)
+        if nim_value is not None and other_nim_value is not None:
+            return self.nimber(nim_value ^ other_nim_value)
+        return UNKNOWN
+
+    def _sum_node(self, pair, value):
+        game, other = pair
+        return self._node(
+            [value((gl, other)) for gl in game.left_options]
+            + [value((game, hl)) for hl in other.left_options],
+            [value((gr, other)) for gr in game.right_options]
+            + [value((game, hr)) for hr in other.right_options],
+        )
+
+    def geq_zero(self, game):
+        """Check whether a game is greater than or equal to zero.
+
+        Parameters
+        ----------
+        game : Game
+            The game to check.
+
+        Returns
+        -------
+        geq : bool
+            :py:const:`True` when G>=0, i.e. when Right starts and loses.
+        """
+        return refute((self.intern(game), 0), _outcome_key, _outcome_options, self.outcomes)
+
+    def leq_zero(self, game):
+        """Check whether a game is less than or equal to zero.
+
+        Parameters
+        ----------
+        game : Game
+            The game to check.
+
+        Returns
+        -------
+        leq : bool
+            :py:const:`True` when G<=0, i.e. when Left starts and loses.
+        """
+        return refute((self.intern(game), 1), _outcome_key, _outcome_options, self.outcomes)
+
+    def geq(self, game, other):
+        """Check whether a game is greater than or equal to another game.
+
+        The comparison follows the recursive definition directly:
+        G>=H when there is no G^R<=H and no H^L>=G.
+        The difference G-H is never constructed.
+
+        Parameters
+        ----------
+        game : Game
+            The game G.
+
+        other : Game
+            The game H.
+
+        Returns
+        -------
+        geq : bool
+            :py:const:`True` when G>=H.
+        """
+        pair = (self.intern(game), self.intern(other))
+        geq = self._known_comparison(pair)
+        if geq is UNKNOWN:
+            geq = refute(
+                pair, _pair_key, _comparison_options, self.comparisons, self._known_comparison
+            )
+        return geq
+
+    def _known_comparison(self, pair):
+        game, other = pair
+        if game is other:
+            return True
+        if other is self.zero:
+            return self.geq_zero(game)
+        if game is self.zero:
+            return self.leq_zero(other)
+        value = self.number(game)
+        if value is not None:
+            other_value = self.number(other)
+            if other_value is not None:
+                return value >= other_value
+        nim_value = self.grundy(game)
+        if nim_value is not None:
+            other_nim_value = self.grundy(other)
+            if other_nim_value is not None:
+                # *a>=*b only when *a-*b=*(a^b)=0
+                return nim_value == other_nim_value
+        return UNKNOWN
+
+    def number(self, game):
+        """Get the value of a number in canonical form.
+
+        Only the structure of the game is checked, so games that are equal to a
+        number but not in canonical form are not recognised.
+
+        Parameters
+        ----------
+        game : Game
+            The game to check.
+
+        Returns
+        -------
+        value : fractions.Fraction or None
+            The value of the number, or :py:const:`None` when the game is not
+            the canonical form of a number.
+        """
+        return evaluate(
+            self.intern(game), _uid, _number_options, self._recognise_number, self._numbers
+        )
+
+    def _recognise_number(self, game, number):
+        left, right = game.left_options, game.right_options
+        if len(left) > 1 or len(right) > 1:
+            return None
+        if not left and not right:
+            # 0 = {|}
+            return Fraction(0)
+        if not right:
+            # n+1 = {n|} for integers n >= 0
+            value = number(left[0])
+            if value is not None and value.denominator == 1 and value >= 0:
+                return value + 1
+            return None
+        if not left:
+            # -n-1 = {|-n} for integers n >= 0
+            value = number(right[0])
+            if value is not None and value.denominator == 1 and value <= 0:
+                return value - 1
+            return None
+
+        # p/2^q = {(p-1)/2^q|(p+1)/2^q} for odd p and q >= 1
+        left_value = number(left[0])
+        if left_value is None:
+            return None
+        right_value = number(right[0])
+        if right_value is None:
+            return None
+        value = (left_value + right_value) / 2
+        if value.denominator > 1 and right_value - left_value == Fraction(2, value.denominator):
+            return value
+        return None
+
+    def number_game(self, value):
+        """Get the canonical form of a number.
+
+        Parameters
+        ----------
+        value : int or fractions.Fraction
+            The value of the number. It must be a dyadic rational.
+
+        Returns
+        -------
+        game : InternedGame
+            The number in canonical form.
+
+        Raises
+        ------
+        ValueError
+            When the value is not a dyadic rational.
+        """
+        value = Fraction(value)
+        game = self._number_games.get(value)
+        if game is None:
+            d = value.denominator
+            if d & (d - 1):
+                raise ValueError("Numbers must be dyadic rationals.")
+            if d > 1:
+                # p/2^q = {(p-1)/2^q|(p+1)/2^q}, the denominators of the options are smaller
+                step = Fraction(1, d)
+                game = self._node(
+                    [self.number_game(value - step)], [self.number_game(value + step)]
+                )
+                game._canonical = True
+                self._number_games[value] = game
+                self._numbers[game.uid] = value
+            else:
+                # Build the missing integers towards zero from the largest known one
+                sign = 1 if value > 0 else -1
+                missing = []
+                while value and value not in self._number_games:
+                    missing.append(value)
+                    value -= sign
+                game = self._number_games.get(value, self.zero)
+                for value in reversed(missing):
+                    game = self._node([game], []) if sign > 0 else self._node([], [game])
+                    game._canonical = True
+                    self._number_games[value] = game
+                    self._numbers[game.uid] = value
+        return game
+
+    def grundy(self, game):
+        """Get the Grundy value of an impartial game.
+
+        A game is impartial when Left and Right have the same options
+        and all options are impartial. An impartial game is equal to the
+        nimber *n, where n is the minimal excluded Grundy value of its options.
+
+        Parameters
+        ----------
+        game : Game
+            The game to check.
+
+        Returns
+        -------
+        value : int or None
+            The Grundy value, or :py:const:`None` when the game is not impartial.
+        """
+        return evaluate(self.intern(game), _uid, _grundy_options, _mex, self._grundy)
+
+    def nimber(self, n):
+        """Get the nimber *n in canonical form.
+
+        Parameters
+        ----------
+        n : int
+            The size of the nimber.
+
+        Returns
+        -------
+        game : InternedGame
+            The game {0,*,...,*(n-1)|0,*,...,*(n-1)}.
+        """
+        # Nimbers share all their options, so *n has only n+1 nodes
+        while len(self._nimbers) <= n:
+            options = self._nimbers.copy()
+            game = self._node(options, options)
+            game._canonical = True
+            self._grundy[game.uid] = len(self._nimbers)
+            self._nimbers.append(game)
+        return self._nimbers[n]
+
+    def canonical_form(self, game):
+        """Compute the canonical form of a game.
+
+        Parameters
+        ----------
+        game : Game
+            The game to reduce.
+
+        Returns
+        -------
+        canonical : InternedGame
+            The canonical form of the game.
+        """
+        return evaluate(
+            self.intern(game),
+            _uid,
+            _options,
+            self._canonical_node,
+            self.canonicals,
+            self._known_canonical,
+        )
+
+    def _known_canonical(self, game):
+        if game._canonical:
+            return game
+        if self.number(game) is not None:
+            # Numbers are recognised by their canonical form
+            game._canonical = True
+            return game
+        nim_value = self.grundy(game)
+        if nim_value is not None:
+            # Impartial games are equal to a nimber
+            canon = self.nimber(nim_value)
+            self.canonicals[canon.uid] = canon
+            return canon
+        return UNKNOWN
+
+    def _canonical_node(self, game, value):
+        # The canonical forms of all Left and Right options are known
+        canon = self._node(
+            [value(gl) for gl in game.left_options], [value(gr) for gr in game.right_options]
+        )
+        # Replace reversible options
+        change = True
+        while change:
+            canon, change = canon.replace_reversible(return_change=True)
+            canon = self.intern(canon)
+        # Remove dominated options
+        change = True
+        while change:
+            canon, change = canon.remove_dominated(return_change=True)
+            canon = self.intern(canon)
+        canon._canonical = True
+        self.canonicals[canon.uid] = canon
+        return canon
+
+    def with_option(self, game, option, player):
+        """Add an option to a game in canonical form.
+
+        Only the relations that change are checked again. The new Left option
+        is compared with the other Left options for domination. Since the game
+        only gets better for Left, only Left options can become reversible, and
+        no Right option has to be checked. Adding a Right option is symmetric.
+
+        Parameters
+        ----------
+        game : Game
+            The game G. It is reduced to canonical form first.
+
+        option : Game
+            The new option.
+
+        player : {"L", "R"}
+            The player that gets the new option.
+
+        Returns
+        -------
+        canonical : InternedGame
+            The canonical form of G with the new option.
+        """
+        if player == "R":
+            # The inverse of a canonical form is canonical
+            canonical = self.inverse(
+                self.with_option(self.inverse(game), self.inverse(option), "L")
+            )
+            canonical._canonical = True
+            return canonical
+        if player != "L":
+            raise ValueError("The player must be 'L' or 'R'.")
+        game = self.canonical_form(game)
+        option = self.canonical_form(option)
+        if any(self.geq(gl, option) for gl in game.left_options):
+            # The new option is dominated, G does not change
+            return game
+        left = [gl for gl in game.left_options if not self.geq(option, gl)]
+        left.append(option)
+        changed = self._node(left, game.right_options)
+        if any(self.geq(changed, glr) for gl in left for glr in gl.right_options):
+            # Only the root is reduced, the options are canonical
+            return self.canonical_form(changed)
+        changed._canonical = True
+        return changed
+
+    def without_option(self, game, option, player):
+        """Remove an option from a game in canonical form.
+
+        Only the relations that change are checked again. Removing a Left option
+        dominates nothing, and since the game only gets worse for Left, only
+        Right options can become reversible. Removing a Right option is symmetric.
+
+        Parameters
+        ----------
+        game : Game
+            The game G. It is reduced to canonical form first.
+
+        option : Game
+            The option to remove, it must be an option of the canonical form of G.
+
+        player : {"L", "R"}
+            The player that loses the option.
+
+        Returns
+        -------
+        canonical : InternedGame
+            The canonical form of G without the option.
+
+        Raises
+        ------
+        ValueError
+            When the option is not an option of the canonical form of G.
+        """
+        if player == "R":
+            # The inverse of a canonical form is canonical
+            canonical = self.inverse(
+                self.without_option(self.inverse(game), self.inverse(option), "L")
+            )
+            canonical._canonical = True
+            return canonical
+        if player != "L":
+            raise ValueError("The player must be 'L' or 'R'.")
+        game = self.canonical_form(game)
+        option = self.canonical_form(option)
+        if option not in game.left_options:
+            raise ValueError("The option is not an option of the canonical form of the game.")
+        changed = self._node(
+            [gl for gl in game.left_options if gl is not option], game.right_options
+        )
+        if any(self.geq(grl, changed) for gr in changed.right_options for grl in gr.left_options):
+            # Only the root is reduced, the options are canonical
+            return self.canonical_form(changed)
+        changed._canonical = True
+        return changed
+
+    def stats(self):
+        """Get the statistics of all tables of the universe.
+
+        Returns
+        -------
+        stats : dict
+            The number of interned `games` and the statistics of the
+            `outcomes`, `comparisons` and `canonicals` tables.
+        """
+        return {
+            "games": len(self._nodes),
+            "outcomes": self.outcomes.stats(),
+            "comparisons": self.comparisons.stats(),
+            "canonicals": self.canonicals.stats(),
+        }
+
+    def clear(self):
+        """Clear all memoised results.
+        The interned games remain valid.
+        """
+        self._inverses.clear()
+        self._sums.clear()
+        self._numbers.clear()
+        self._grundy.clear()
+        self.outcomes.clear()
+        self.comparisons.clear()
+        self.canonicals.clear()
+
+
+def default_universe():
+    """Get the universe that is used for games that are not interned.
+
+    Returns
+    -------
+    universe : GameUniverse
+        The default universe of this process.
+    """
+    global _default
+    if _default is None:
+        _default = GameUniverse()
+    return _default
+
+
+_uid = attrgetter("_uid")
+
+
+def _game_nodes(game):
+    # The options of all subgames as indices into the list, the options come first
+    nodes = []
+
+    def add_node(node, value):
+        left = tuple(value(gl) for gl in node.left_options)
+        right = tuple(value(gr) for gr in node.right_options)
+        nodes.append((left, right, node._canonical))
+        return len(nodes) - 1
+
+    evaluate(game, _uid, _options, add_node)
+    return nodes
+
+
+def _unpickle_game(nodes):
+    universe = default_universe()
+    games = []
+    for left, right, canonical in nodes:
+        game = universe._node([games[i] for i in left], [games[i] for i in right])
+        if canonical:
+            game._canonical = True
+        games.append(game)
+    return games[-1]
+
+
+def _interned_cgn(game, value):
+    left = sorted([value(gl) for gl in game.left_options])
+    right = sorted([value(gr) for gr in game.right_options])
+    game._cgn = gn.format_cgn(left, right)
+    return game._cgn
+
+
+def _known_cgn(game):
+    return UNKNOWN if game._cgn is None else game._cgn
+
+
+def _options(game):
+    return [*game.left_options, *game.right_options]
+
+
+def _sum_key(pair):
+    # Addition is commutative, store the sum only once
+    a, b = pair[0]._uid, pair[1]._uid
+    return (a, b) if a <= b else (b, a)
+
+
+def _pair_key(pair):
+    return pair[0]._uid, pair[1]._uid
+
+
+def _sum_options(pair):
+    # The pairs of subgames that are summed for G+H: G^L+H, G+H^L, G^R+H and G+H^R
+    game, other = pair
+    return [
+        *[(gl, other) for gl in game.left_options],
+        *[(game, hl) for hl in other.left_options],
+        *[(gr, other) for gr in game.right_options],
+        *[(game, hr) for hr in other.right_options],
+    ]
+
+
+def _outcome_key(item):
+    # Both comparisons with zero share one table: even keys are >= 0, odd keys are <= 0
+    game, leq = item
+    return game._uid << 1 | leq
+
+
+def _outcome_options(item):
+    # G>=0 when no G^R<=0, G<=0 when no G^L>=0
+    game, leq = item
+    if leq:
+        return ((gl, 0) for gl in game.left_options)
+    return ((gr, 1) for gr in game.right_options)
+
+
+def _comparison_options(pair):
+    # G>=H when no G^R<=H and no H^L>=G
+    game, other = pair
+    return chain(
+        ((other, gr) for gr in game.right_options), ((hl, game) for hl in other.left_options)
+    )
+
+
+def _number_options(game):
+    # Only games with at most one Left and one Right option can be numbers
+    if len(game.left_options) > 1 or len(game.right_options) > 1:
+        return ()
+    return _options(game)
+
+
+def _grundy_options(game):
+    # Only games with the same Left and Right options can be impartial
+    if {gl.uid for gl in game.left_options} != {gr.uid for gr in game.right_options}:
+        return ()
+    return game.left_options
+
+
+def _mex(game, grundy):
+    # The Grundy value is the minimal excluded value of the options
+    if {gl.uid for gl in game.left_options} != {gr.uid for gr in game.right_options}:
+        return None
+    values = {grundy(gl) for gl in game.left_options}
+    if None in values:
+        return None
+    value = 0
+    while value in values:
+        value += 1
+    return value
+
+
+def _known_hash(game):
+    return UNKNOWN if game._hash is None else game._hash
+
+
+def _structural_hash(game, value):
+    # Hash the sorted hashes of the options, so the order of the options does not matter
+    game._hash = hash(
+        (
+            tuple(sorted([value(gl) for gl in game.left_options])),
+            tuple(sorted([value(gr) for gr in game.right_options])),
+        )
+    )
+    return game._hash
+
+
+_default = None
@@ -43,16 +43,16 @@ def getAllSubsets(canonicals: list):
 
 
 def compute_combinations(sets):
-    yield Game("0")
+    yield Game("0").canonical_form()
     # Create the cartesian product to create all combinations
     # of Left and Right option sets.
     for left_set, right_set in product(sets, repeat=2):
         g = Game()
         # Add all options from the sets to the game
         if left_set:
-            g.left_options.extend(left_set)
+            g.left_options = left_set
         if right_set:
-            g.right_options.extend(right_set)
+            g.right_options = right_set
 
         # Yield the canonical form
         yield g.canonical_form()
@@ -83,10 +83,13 @@ def G0(depth: int = 1):
         # Print the canonical forms and add them to a list for the next iteration
         # TODO: Parallelize?
         print("Filtering unique canonical forms.")
+        # Canonical forms are hashed by their structure, so the set lookup is O(1)
         subsets = []
+        uniques = set()
         for g in canons:
-            if g not in subsets:
+            if g not in uniques:
                 # Only keep unique canonical forms
+                uniques.add(g)
                 subsets.append(g)
                 print("Canonical form {:d}:".format(len(subsets)), g)
         # print('There are {:d} unique canonical forms:'.format(len(canons)), *canons)
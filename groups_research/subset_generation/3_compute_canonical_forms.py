@@ -1,7 +1,6 @@
-import multiprocessing as mp
 from datetime import datetime
 from tqdm import tqdm
-from cg.game import Game
+from cg import canonical_forms
 
 GROUP = 4
 INPUT_FILE = f"groups_research/results/all_possible_g0{GROUP:d}.txt"
@@ -28,18 +27,6 @@ def load_games(path):
         return [line.strip() for line in tqdm(f, unit="games")]
 
 
-def to_canonical_cgn(game):
-    """Convert a game to its canoncial form in CGN.
-
-    Parameters
-    ----------
-    game : str
-        The game to convert in combinatorial game notation.
-    """
-    canonical = str(Game(game).canonical_form())
-    return f"{datetime.now():%Y-%m-%d %H:%M:%S};{mp.current_process().name};{game};{canonical}\n"
-
-
 def reduce_game_list(games):
     """Reduce an iterator of games to their canonical forms.
     The games are reduces in parallel using multiprocessing.
@@ -54,9 +41,11 @@ def reduce_game_list(games):
     The order of games of the input iterator is NOT preserved.
     """
     TOTAL_GAMES = len(games)
-    pool = mp.Pool(NUM_CORES)
-    pool_returns = pool.imap_unordered(to_canonical_cgn, games, chunksize=1024)
-    return list(tqdm(pool_returns, total=TOTAL_GAMES, unit="games"))
+    results = canonical_forms(games, workers=NUM_CORES, chunksize=1024)
+    return [
+        f"{datetime.now():%Y-%m-%d %H:%M:%S};{game};{canonical}\n"
+        for game, canonical in tqdm(results, total=TOTAL_GAMES, unit="games")
+    ]
 
 
 if __name__ == "__main__":
@@ -73,7 +62,7 @@ if __name__ == "__main__":
     # Write them to file
     print(f"{datetime.now():%Y-%m-%d %H:%M:%S}: Writing results to output file '{OUTPUT_FILE}'.")
     with open(OUTPUT_FILE, "w", newline="\n") as f:
-        f.write("idx,timestamp;proc_id;game;canonical\n")
+        f.write("timestamp;game;canonical\n")
         for line in tqdm(canonicals, unit="games"):
             f.write(line)
     print(f"{datetime.now():%Y-%m-%d %H:%M:%S}: Finished writing results to output file.")
@@ -1,8 +1,9 @@
 from datetime import datetime
 from itertools import combinations, product
-import multiprocessing as mp
+from multiprocessing import Pool
 
 from cg.game import Game
+from cg.order import GameOrder
 
 NUM_CORES = 3
 
@@ -26,7 +27,7 @@ def read_games_file(path: str) -> list:
         return [line.strip() for line in f]
 
 
-def get_incomparable_pairs(games: list) -> dict:
+def get_incomparable_pairs(games: list, order: GameOrder) -> dict:
     """Compute incomparable pairs in a list of games.
 
     Parameters
@@ -34,6 +35,9 @@ def get_incomparable_pairs(games: list) -> dict:
     games : list
         List of games. Each game is represented as str in CGN.
 
+    order : GameOrder
+        The partial order of the games.
+
     Returns
     -------
     incomparable_pairs : dict
@@ -47,8 +51,8 @@ def get_incomparable_pairs(games: list) -> dict:
         incomparable_pairs[g] = set()
 
     # Check combinations
-    for g, h in combinations(games, r=2):
-        if Game(g).incomparable(Game(h)):
+    for (i, g), (j, h) in combinations(enumerate(games), r=2):
+        if order.incomparable(i, j):
             incomparable_pairs[g].add(h)
             incomparable_pairs[h].add(g)
 
@@ -92,9 +96,9 @@ def generate_games_from_subsets(subsets: list):
         g = Game()
         # Add all options from the sets to the game
         if left:
-            g.left_options.extend(Game(opt) for opt in left)
+            g.left_options = (Game(opt, assume_canonical=True) for opt in left)
         if right:
-            g.right_options.extend(Game(opt) for opt in right)
+            g.right_options = (Game(opt, assume_canonical=True) for opt in right)
 
         # Yield the canonical form as str
         yield str(g.canonical_form())
@@ -117,34 +121,34 @@ def filter_canonicals(canonicals):
     return uniques
 
 
-def canonical_from_pair(pair: tuple):
-    # Split pair in left and right options
-    left, right = pair
-    g = Game()
-    # Add all options from the sets to the game
-    if left:
-        g.left_options.extend(Game(opt) for opt in left)
-    if right:
-        g.right_options.extend(Game(opt) for opt in right)
+def init_worker(games: list, matrix, subsets: list):
+    # Create the order from the shared matrix, the games are not compared again
+    global worker_order, worker_subsets
+    worker_order = GameOrder((Game(g, assume_canonical=True) for g in games), matrix=matrix)
+    worker_subsets = subsets
+
 
-    # Return the canonical form as str
-    return str(g.canonical_form())
+def canonicals_with_left(left: int):
+    # Reduce the games with one Left subset and every Right subset
+    left_ids = worker_subsets[left]
+    return [str(worker_order.canonical_form(left_ids, right)) for right in worker_subsets]
 
 
-def parallel_generate_games(subset_generator):
+def order_generate_games(subset_generator, games: list, order: GameOrder):
     # First, yield the zero game
     yield "0"
 
-    pair_generator = product(subset_generator, repeat=2)
-    print(f"Generating games using {NUM_CORES:d} cores.")
-    pool = mp.Pool(NUM_CORES)
-    canonicals_iterator = pool.imap(canonical_from_pair, pair_generator, chunksize=64)
+    # The options are canonical and their order is known, so only the root is reduced
+    index = {g: i for i, g in enumerate(games)}
+    subsets = [[index[g] for g in subset] for subset in subset_generator]
 
-    # Count and yield the generated games
+    # Count and yield the generated games, each worker reduces the games with one Left subset
     count_games = 0
-    for canon in canonicals_iterator:
-        count_games += 1
-        yield canon
+    print(f"Generating games using {NUM_CORES:d} cores.")
+    with Pool(NUM_CORES, init_worker, (games, order.matrix, subsets)) as pool:
+        for row in pool.imap(canonicals_with_left, range(len(subsets))):
+            count_games += len(row)
+            yield from row
 
     ts = datetime.now().strftime(r"%Y-%m-%d %H:%M:%S")
     print(f"{ts}: Non-unique canoncial games: {count_games:d}.")
@@ -152,7 +156,8 @@ def parallel_generate_games(subset_generator):
 
 if __name__ == "__main__":
     games_in_g0x = read_games_file("groups_research/results/g02.txt")
-    inc_pairs = get_incomparable_pairs(games_in_g0x)
+    order = GameOrder(Game(g, assume_canonical=True) for g in games_in_g0x)
+    inc_pairs = get_incomparable_pairs(games_in_g0x, order)
     incomparable_subset_gen = generate_incomparable_subsets(games_in_g0x, inc_pairs)
-    canonicals_gen = parallel_generate_games(incomparable_subset_gen)
+    canonicals_gen = order_generate_games(incomparable_subset_gen, games_in_g0x, order)
     filter_canonicals(canonicals_gen)
@@ -1,8 +1,9 @@
-from multiprocessing import Pool, Queue, Process, current_process
 from tqdm import tqdm
 from datetime import datetime
 from itertools import combinations, product
+from multiprocessing import Pool, current_process
 from cg.game import Game
+from cg.order import GameOrder
 
 GROUP = 4
 INPUT_FILE = f"groups_research/results/g0{GROUP-1:d}.txt"
@@ -29,7 +30,24 @@ def read_file(path):
         return [line.strip() for line in tqdm(f, unit="lines")]
 
 
-def incomparable_pairs(games):
+def game_order(games):
+    """Compare all pairs of games in a list.
+
+    Parameters
+    ----------
+    games : list
+        List of canonical games. Each game is represented as str in CGN.
+
+    Returns
+    -------
+    order : GameOrder
+        The partial order of the games.
+    """
+    print(f"{datetime.now():%Y-%m-%d %H:%M:%S}: Comparing all pairs of games.")
+    return GameOrder(Game(g, assume_canonical=True) for g in games)
+
+
+def incomparable_pairs(games, order):
     """Compute incomparable pairs in a list of games.
 
     Parameters
@@ -37,6 +55,9 @@ def incomparable_pairs(games):
     games : list
         List of games. Each game is represented as str in CGN.
 
+    order : GameOrder
+        The partial order of the games.
+
     Returns
     -------
     incomparable_pairs : dict
@@ -53,8 +74,8 @@ def incomparable_pairs(games):
     # Check combinations
     num_inc = 0
     num_comb = int(len(games) * (len(games) - 1) / 2)
-    for g, h in tqdm(combinations(games, r=2), total=num_comb, unit="pairs"):
-        if Game(g).incomparable(Game(h)):
+    for (i, g), (j, h) in tqdm(combinations(enumerate(games), r=2), total=num_comb, unit="pairs"):
+        if order.incomparable(i, j):
             incomparable_pairs[g].add(h)
             incomparable_pairs[h].add(g)
             num_inc += 1
@@ -92,56 +113,78 @@ def incomparable_subsets(incomp_pairs):
                 yield sub_with_g
 
 
-def canonical_from_pair(pair):
-    """Convert a game to its canoncial form in CGN.
+def game_from_pair(pair):
+    """Create a game from its Left and Right options.
 
     Parameters
     ----------
     pair : tuple
-        The left and right options.
+        The left and right options, each in CGN.
 
     Returns
     ------
-    info : str
-        Information about the generated game and its canonical form.
+    game : str
+        The game {left|right} in CGN.
     """
-    g = Game()
-    g.left_options = [Game(opt) for opt in pair[0]]
-    g.right_options = [Game(opt) for opt in pair[1]]
-    canonical = g.canonical_form()
-    return f"{datetime.now():%Y-%m-%d %H:%M:%S};{current_process().name};{str(g)};{str(canonical)}\n"
-
-
-def writer(q_in, data_it, data_len):
-    for d in tqdm(data_it, total=data_len, unit="pairs"):
-        # for d in data_it:
-        q_in.put(d)
-    for i in range(NUM_PROC):
-        q_in.put(None)
-    print(f"{datetime.now():%Y-%m-%d %H:%M:%S}: Finished generating pairs for input queue.")
-
-
-def worker(q_in, q_out):
-    while True:
-        pair = q_in.get(True)
-        if pair:
-            # Process pair
-            q_out.put(canonical_from_pair(pair))
-        else:
-            # No jobs left, put sentinel value
-            q_out.put(None)
-            break
-
-
-def canonicals_from_subsets(subsets):
+    return "{" + ",".join(pair[0]) + "|" + ",".join(pair[1]) + "}"
+
+
+def init_worker(games, matrix, subsets):
+    """Create the order of the games in a worker process.
+    The matrix of the order is shared, so no games are compared again.
+
+    Parameters
+    ----------
+    games : list
+        List of canonical games. Each game is represented as str in CGN.
+
+    matrix : numpy.ndarray
+        The order of the games, see :py:attr:`cg.order.GameOrder.matrix`.
+
+    subsets : list
+        The subsets that are combined, as lists of ids of games.
+    """
+    global worker_order, worker_subsets
+    worker_order = GameOrder((Game(g, assume_canonical=True) for g in games), matrix=matrix)
+    worker_subsets = subsets
+
+
+def canonicals_with_left(left):
+    """Reduce the games with one Left subset and every Right subset in a worker.
+
+    Parameters
+    ----------
+    left : int
+        The index of the Left subset.
+
+    Returns
+    -------
+    canonicals : list
+        The name of the process and the canonical form, in CGN, for every Right subset.
+    """
+    name = current_process().name
+    left_ids = worker_subsets[left]
+    return [(name, str(worker_order.canonical_form(left_ids, right_ids))) for right_ids in worker_subsets]
+
+
+def canonicals_from_subsets(subsets, games, order):
     """Create games from all possible combinations of subsets from an iterator.
-    The games are reduced to canonical form in parallel using multiprocessing.
+    The options are canonical and their order is known, so the games are reduced
+    to canonical form at their root only, by looking up the order.
+    The games are reduced in parallel using multiprocessing, the order is shared
+    with the workers.
 
     Parameters
     ----------
     subsets : iterator
         The subsets that are to be combined.
 
+    games : list
+        List of the games in the subsets, in the order of `order`.
+
+    order : GameOrder
+        The partial order of the games.
+
     Returns
     -------
     canonicals : iterator
@@ -149,40 +192,18 @@ def canonicals_from_subsets(subsets):
 
     Warnings
     --------
-    * The order of games of the input iterator is NOT preserved.
-    * It is likely that many duplicate games are created.
+    It is likely that many duplicate games are created.
     """
     print(f"{datetime.now():%Y-%m-%d %H:%M:%S}: Generating games from subsets to non-unique canonical games.")
-    pair_generator = product(subsets, repeat=2)
-
-    # Create queues
-    q_in = Queue()
-    q_out = Queue()
-
-    # Start processes
-    pool = Pool(NUM_PROC, worker, (q_in, q_out))
-
-    # Fill queue
-    print(f"{datetime.now():%Y-%m-%d %H:%M:%S}: Generating all pairs for input queue.")
-    proc_w = Process(target=writer, args=(q_in, pair_generator, len(subsets)**2))
-    proc_w.start()
-
-    # Return values from output queue
-    print(f"{datetime.now():%Y-%m-%d %H:%M:%S}: Waiting for results to finish.")
-    num_finished = 0
-    with tqdm(total=len(subsets)**2, unit="canonics", position=1) as pbar:
-        while num_finished < NUM_PROC:
-            res = q_out.get()
-            if res:
-                pbar.update(1)
-                yield res
-            else:
-                num_finished += 1
-
-    # Wait for jobs to finish
-    proc_w.join()
-    pool.close()
-    pool.join()
+    index = {g: i for i, g in enumerate(games)}
+    subset_ids = [[index[g] for g in subset] for subset in subsets]
+
+    # Each task reduces the games with one Left subset, the results keep the order of the subsets
+    with Pool(NUM_PROC, init_worker, (games, order.matrix, subset_ids)) as pool:
+        rows = pool.imap(canonicals_with_left, range(len(subsets)))
+        for left, row in zip(subsets, rows):
+            for right, (name, canonical) in zip(subsets, row):
+                yield f"{datetime.now():%Y-%m-%d %H:%M:%S};{name};{game_from_pair((left, right))};{canonical}\n"
 
 
 def write_iterator(path, lines, num_lines=None):
@@ -216,14 +237,15 @@ if __name__ == "__main__":
     # Load games from previous group
     games_in_g0x = read_file(INPUT_FILE)
 
-    # Compute all incomparable pairs
-    inc_pairs = incomparable_pairs(games_in_g0x)
+    # Compare all games once, then compute all incomparable pairs
+    order = game_order(games_in_g0x)
+    inc_pairs = incomparable_pairs(games_in_g0x, order)
 
     # Generate all subsets with only incomparable options
     inc_subsets = list(incomparable_subsets(inc_pairs))
 
     # Generate all games from these subsets
-    canonical_gen = canonicals_from_subsets(inc_subsets)
+    canonical_gen = canonicals_from_subsets(inc_subsets, games_in_g0x, order)
 
     # Empty iterator to file
     write_iterator(OUTPUT_FILE, canonical_gen, len(inc_subsets)**2)
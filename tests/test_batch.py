@@ -0,0 +1,54 @@
+import unittest
+from cg import canonical_forms
+from cg.game import Game
+from cg.universe import default_universe
+
+GAMES = [
+    "{*|*}",
+    "{^,*|0}",
+    "{^,*|^,0}",
+    "{2,1,0|-1,-3,2}",
+    "*",
+    "{{*,0|{*|*}},{*|*}|*,{*|*,{*|*}}}",
+]
+CANONICALS = ["0", "^*", "^*", "{2|-3}", "*", "{0,^*|*,v}"]
+
+
+class TestBatch(unittest.TestCase):
+    def test_canonical_forms(self):
+        # Sequential
+        results = list(canonical_forms(GAMES, workers=1, chunksize=4, ordered=True))
+        self.assertListEqual(results, list(zip(GAMES, CANONICALS)))
+
+        # Games are serialised
+        results = list(canonical_forms([Game("{*|*}")], workers=1))
+        self.assertListEqual(results, [("{*|*}", "0")])
+
+        # The games are reduced in a new universe with bounded tables
+        universe = default_universe()
+        sizes = [universe.canonicals.max_size, universe.outcomes.max_size]
+        results = list(canonical_forms(GAMES, workers=1, ordered=True, cache_size=2))
+        self.assertListEqual(results, list(zip(GAMES, CANONICALS)))
+        self.assertListEqual([universe.canonicals.max_size, universe.outcomes.max_size], sizes)
+
+        # Empty input
+        self.assertListEqual(list(canonical_forms([], workers=2)), [])
+
+        with self.assertRaises(ValueError):
+            list(canonical_forms(GAMES, chunksize=0))
+
+    def test_canonical_forms_parallel(self):
+        games = GAMES * 10
+        # Ordered
+        results = list(canonical_forms(iter(games), workers=2, chunksize=3, ordered=True))
+        self.assertListEqual(results, list(zip(games, CANONICALS * 10)))
+
+        # Unordered
+        results = list(canonical_forms(iter(games), workers=2, chunksize=3))
+        self.assertCountEqual(results, list(zip(games, CANONICALS * 10)))
+
+        # Errors of the workers are raised
+        with self.assertRaises(ValueError):
+            list(canonical_forms(["*", "abc"], workers=2, chunksize=1))
+        with self.assertRaises(ValueError):
+            list(canonical_forms(["*", "abc"], workers=2, chunksize=1, ordered=True))
@@ -0,0 +1,89 @@
+import unittest
+from cg.cache import Cache
+
+
+class TestCache(unittest.TestCase):
+    def test___init__(self):
+        self.assertEqual(Cache(4).max_size, 4)
+        with self.assertRaises(ValueError):
+            Cache(0)
+
+    def test___setitem__(self):
+        c = Cache(2)
+        c["a"] = 1
+        c["b"] = 2
+        c["a"] = 3
+        self.assertEqual(len(c), 2)
+        # The least recently used entry is evicted when full
+        c["c"] = 4
+        self.assertEqual(len(c), 2)
+        self.assertIn("a", c)
+        self.assertNotIn("b", c)
+        self.assertIn("c", c)
+        self.assertEqual(c.evictions, 1)
+
+    def test_get(self):
+        c = Cache(2)
+        self.assertIsNone(c.get("a"))
+        self.assertEqual(c.get("a", 5), 5)
+        c["a"] = None
+        self.assertIsNone(c.get("a", 5))
+        self.assertEqual(c.hits, 1)
+        self.assertEqual(c.misses, 2)
+
+        # A lookup marks the entry as recently used
+        c["b"] = 1
+        c.get("a")
+        c["c"] = 2
+        self.assertIn("a", c)
+        self.assertNotIn("b", c)
+
+    def test_resize(self):
+        c = Cache(4)
+        for i in range(4):
+            c[i] = i
+        c.resize(2)
+        self.assertEqual(c.max_size, 2)
+        self.assertEqual(len(c), 2)
+        self.assertEqual(c.evictions, 2)
+        self.assertIn(3, c)
+        with self.assertRaises(ValueError):
+            c.resize(0)
+
+    def test_clear(self):
+        c = Cache()
+        c["a"] = 1
+        c.get("a")
+        c.get("b")
+        c.clear()
+        self.assertEqual(len(c), 0)
+        self.assertEqual(c.hits, 0)
+        self.assertEqual(c.misses, 0)
+        self.assertEqual(c.evictions, 0)
+
+    def test_scoped(self):
+        c = Cache(4)
+        c["a"] = 1
+        c.get("a")
+        with c.scoped(max_size=1) as scoped:
+            self.assertIs(scoped, c)
+            self.assertEqual(len(c), 0)
+            self.assertEqual(c.max_size, 1)
+            c["b"] = 2
+            c["c"] = 3
+            self.assertEqual(c.evictions, 1)
+        # The previous state is restored
+        self.assertDictEqual(
+            c.stats(), {"hits": 1, "misses": 0, "evictions": 0, "size": 1, "max_size": 4}
+        )
+        self.assertIn("a", c)
+        self.assertNotIn("c", c)
+
+    def test_stats(self):
+        c = Cache(8)
+        c["a"] = 1
+        c.get("a")
+        c.get("b")
+        self.assertDictEqual(
+            c.stats(), {"hits": 1, "misses": 1, "evictions": 0, "size": 1, "max_size": 8}
+        )
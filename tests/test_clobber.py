@@ -1,5 +1,10 @@
+import io
+import os
+import pickle
+import tempfile
 import unittest
-from cg.clobber import Clobber
+from cg.clobber import Clobber, ClobberDatabase, ClobberTable, write_database
+from cg.game import DisjunctiveSum, Game
 
 
 class TestClobber(unittest.TestCase):
@@ -19,6 +24,9 @@ class TestClobber(unittest.TestCase):
         self.assertEqual(c.board, "LLR")
         c.board = "LRR"
         self.assertEqual(c.board, "LRR")
+        # The stones are stored as bitboards, the first cell is the lowest bit
+        c.board = "LR_|_RL"
+        self.assertEqual((c._left, c._right), (0b100001, 0b010010))
 
         # Test invalid characters
         with self.assertRaises(ValueError):
@@ -42,6 +50,62 @@ class TestClobber(unittest.TestCase):
         self.assertEqual(Clobber("LL").columns, 2)
         self.assertEqual(Clobber("L|L").columns, 1)
 
+    def test_left_options___get__(self):
+        # The options are generated when first accessed and then cached
+        c = Clobber("LLR")
+        self.assertIsNone(c._left_options)
+        self.assertEqual([o.board for o in c.left_options], ["L_L"])
+        self.assertIs(c.left_options, c.left_options)
+        self.assertIsNone(c.left_options[0]._left_options)
+
+        # Assigned options replace the generated ones
+        c.left_options = []
+        self.assertEqual(c.left_options, ())
+
+    def test_right_options___get__(self):
+        c = Clobber("LLR")
+        self.assertIsNone(c._right_options)
+        self.assertEqual([o.board for o in c.right_options], ["LR_"])
+        self.assertIs(c.right_options, c.right_options)
+
+    def test_geq(self):
+        # Positions are reduced with the table also when they are the other game,
+        # in a sum or in a number translation, instead of expanding their game tree
+        a, b = Clobber("LR" * 6), Clobber("LRLR")
+        self.assertFalse(b.geq(a))
+        self.assertFalse(a.geq(b))
+        self.assertTrue(Game("1").geq(a))
+        self.assertTrue(a == a)
+        self.assertEqual((Game("1") + a).outcome_class(), "L")
+        self.assertEqual(DisjunctiveSum([Game("^"), a]).outcome_class(), "L")
+
+    def test_outcome_class(self):
+        self.assertEqual(Clobber("LR").outcome_class(), "N")
+        self.assertEqual(Clobber("LLR").outcome_class(), "L")
+        self.assertEqual(Clobber("LRR").outcome_class(), "R")
+        self.assertEqual(Clobber("LR|RL").outcome_class(), "N")
+        self.assertEqual(Clobber("LRR").add(Clobber("LLR")).outcome_class(), "P")
+
+        # Only the positions visited by the search are generated
+        c = Clobber("LR" * 6)
+        self.assertEqual(c.outcome_class(), "N")
+        self.assertTrue(any(o._left_options is None for o in c.right_options))
+
+    def test_components(self):
+        # Groups of one colour are left out
+        c = Clobber("LR_RL_LL|_______R")
+        self.assertEqual(
+            [g.board for g in c.components()],
+            ["LR______|________", "___RL___|________", "______LL|_______R"],
+        )
+        c = Clobber("LR_RL_LL_R")
+        self.assertEqual([g.board for g in c.components()], ["LR________", "___RL_____"])
+        self.assertEqual(Clobber("LL_R|L__R").components(), [])
+        # Stones are connected horizontally and vertically, not diagonally
+        self.assertEqual([g.board for g in Clobber("L_|RR").components()], ["L_|RR"])
+        self.assertEqual(len(Clobber("L_|_R").components()), 0)
+        self.assertEqual(len(Clobber("LR|__|RL").components()), 2)
+
     def test_clone(self):
         # Check values
         self.assertEqual(Clobber("L").clone(), Clobber("L"))
@@ -143,3 +207,170 @@ class TestClobber(unittest.TestCase):
         c = Clobber("LRR")
         self.assertEqual(next(c.moves("L")), "_LR")
         self.assertEqual(next(c.moves("R")), "R_R")
+
+        # The stones are moved in order of their cell, each up, left, right and then down
+        c = Clobber("RLR|_L_|_R_")
+        self.assertEqual(list(c.moves("L")), ["L_R|_L_|_R_", "R_L|_L_|_R_", "RLR|___|_L_"])
+        self.assertEqual(list(c.moves("R")), ["_RR|_L_|_R_", "RR_|_L_|_R_", "RLR|_R_|___"])
+        self.assertEqual(list(Clobber("LR|RL").moves("X")), [])
+
+    def test_write_dot(self):
+        # Only the written subgames are labelled, large labels are not formatted
+        dot = io.StringIO()
+        Clobber("LR" * 6).write_dot(dot, max_depth=1)
+        self.assertEqual(dot.getvalue().count("->"), 22)
+        self.assertIn('\t0[label="#0"];', dot.getvalue())
+        self.assertIn('\t1[label="#1",style=dashed];', dot.getvalue())
+        self.assertLess(len(dot.getvalue()), 2000)
+
+
+class TestClobberTable(unittest.TestCase):
+    def test_geq_zero(self):
+        t = ClobberTable()
+        self.assertTrue(t.geq_zero(Clobber("LLR")))
+        self.assertFalse(t.geq_zero(Clobber("LRR")))
+        self.assertFalse(t.geq_zero(Clobber("LR")))
+        # A position with the colours swapped is stored as the negated position
+        size = len(t.outcomes)
+        self.assertFalse(t.geq_zero(Clobber("RRL")))
+        self.assertTrue(t.geq_zero(Clobber("RLL")))
+        self.assertEqual(len(t.outcomes), size)
+
+    def test_leq_zero(self):
+        t = ClobberTable()
+        self.assertTrue(t.leq_zero(Clobber("LRR")))
+        self.assertFalse(t.leq_zero(Clobber("LLR")))
+        self.assertTrue(t.leq_zero(Clobber("LRR").add(Clobber("LLR"))))
+
+        # Positions with assigned options are searched without the table
+        c = Clobber("LR")
+        c.left_options = []
+        t.clear()
+        self.assertTrue(t.leq_zero(c))
+        self.assertEqual(len(t.outcomes), 0)
+
+    def test_canonical_form(self):
+        t = ClobberTable()
+        self.assertEqual(str(t.canonical_form(Clobber("LLR"))), "^")
+        self.assertEqual(str(t.canonical_form(Clobber("LRR"))), "v")
+        self.assertEqual(str(t.canonical_form(Clobber("LR|RL"))), "*")
+        self.assertIs(t.canonical_form(Clobber("RRL")), t.canonical_form(Clobber("LLR")).inverse())
+
+        # Reflections, rotations, empty borders and swapped colours are stored once
+        t.clear()
+        t.canonical_form(Clobber("LLR"))
+        size = len(t.canonicals)
+        for board in ["RLL", "RRL", "L|L|R", "___|LLR|___", "_R_|_L_|_L_"]:
+            self.assertEqual(
+                str(t.canonical_form(Clobber(board))), str(Clobber(board).canonical_form())
+            )
+        self.assertEqual(len(t.canonicals), size)
+
+        c = Clobber("LR")
+        c.right_options = []
+        self.assertEqual(str(t.canonical_form(c)), "1")
+
+    def test_components(self):
+        # Boards with multiple groups are valued by the sum of their groups
+        t = ClobberTable()
+        self.assertEqual(str(t.canonical_form(Clobber("LR_LR"))), "0")
+        self.assertEqual(str(t.canonical_form(Clobber("LLR_LR|______|RRR_L_"))), "^*")
+        self.assertEqual(str(t.canonical_form(Clobber("LL_R"))), "0")
+        self.assertTrue(t.geq_zero(Clobber("LR_LR")))
+        self.assertTrue(t.leq_zero(Clobber("LR_LR")))
+        self.assertFalse(t.leq_zero(Clobber("LLR_LR")))
+
+        # Groups of one colour are left out of the key
+        t.canonical_form(Clobber("LLR"))
+        size = len(t.canonicals)
+        t.canonical_form(Clobber("LLR_L|_____|RR__R"))
+        self.assertEqual(len(t.canonicals), size)
+
+    def test_database(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "clobber.cgdb")
+        write_database(path, 4)
+
+        # Components in the database are looked up instead of searched
+        t = ClobberTable(database=ClobberDatabase(path))
+        c = Clobber("RLL_|____|LR_R|_L__")
+        self.assertEqual(t.canonical_form(c), ClobberTable().canonical_form(c))
+        self.assertTrue(all(g._left_options is None for g in c.components()))
+        c = Clobber("RLLR")
+        self.assertEqual(t.leq_zero(c), ClobberTable().leq_zero(c))
+        self.assertIsNone(c._right_options)
+
+        # Larger components are searched
+        c = Clobber("LRLRL")
+        self.assertEqual(t.canonical_form(c), ClobberTable().canonical_form(c))
+
+    def test_stats(self):
+        t = ClobberTable()
+        t.geq_zero(Clobber("LR"))
+        stats = t.stats()
+        # The options of * have no moves, they are not stored
+        self.assertEqual(stats["outcomes"]["size"], 1)
+        self.assertEqual(stats["canonicals"]["size"], 0)
+
+    def test_clear(self):
+        t = ClobberTable()
+        t.canonical_form(Clobber("LLR"))
+        t.clear()
+        self.assertEqual(len(t.canonicals), 0)
+        self.assertEqual(len(t.outcomes), 0)
+
+
+class TestClobberDatabase(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "clobber.cgdb")
+
+    def test___init__(self):
+        write_database(self.path, 3)
+        self.assertEqual(ClobberDatabase(self.path).path, self.path)
+        with open(self.path, "r+b") as file:
+            file.write(b"CGSTORE1")
+        with self.assertRaises(ValueError):
+            ClobberDatabase(self.path)
+
+    def test___len__(self):
+        write_database(self.path, 3)
+        # The domino, two strips and two corners of three stones
+        self.assertEqual(len(ClobberDatabase(self.path)), 5)
+        # And five strips of four stones
+        write_database(self.path, 2, max_strip=4)
+        self.assertEqual(len(ClobberDatabase(self.path)), 8)
+        write_database(self.path, 0)
+        self.assertEqual(len(ClobberDatabase(self.path)), 0)
+
+    def test___contains__(self):
+        write_database(self.path, 3)
+        db = ClobberDatabase(self.path)
+        self.assertIn(Clobber("LR"), db)
+        self.assertIn(Clobber("L__|RR_"), db)
+        self.assertIn(Clobber("___|_RL|___"), db)
+        self.assertNotIn(Clobber("LRLR"), db)
+        self.assertNotIn(Clobber("LL"), db)
+
+    def test___reduce__(self):
+        write_database(self.path, 3)
+        db = pickle.loads(pickle.dumps(ClobberDatabase(self.path)))
+        self.assertEqual(str(db.canonical_form(Clobber("LLR"))), "^")
+
+    def test_canonical_form(self):
+        write_database(self.path, 3, max_strip=5)
+        db = ClobberDatabase(self.path)
+        for board in ["LR", "LLR", "RLL", "RRL", "L|L|R", "LR|L_", "LRLR", "LRRLR", "R_|LR"]:
+            c = Clobber(board)
+            self.assertIs(db.canonical_form(c), ClobberTable().canonical_form(c))
+        self.assertIsNone(db.canonical_form(Clobber("LR|RL")))
+        self.assertIsNone(db.canonical_form(Clobber("LRLRLR")))
+
+    def test_write_database(self):
+        write_database(self.path, 4, max_strip=6)
+        db = ClobberDatabase(self.path)
+        self.assertIn(Clobber("LRL|_R_"), db)
+        self.assertIn(Clobber("LRLRLR"), db)
+        self.assertNotIn(Clobber("LRLRL|R____"), db)
@@ -1,89 +1,101 @@
+import io
 import unittest
-from cg.game import Game
+from fractions import Fraction
+from cg.game import DisjunctiveSum, Game, NegatedGame
 
 
 class TestGame(unittest.TestCase):
+    def test___init__(self):
+        self.assertEqual(str(Game("{^|v}")), "{^|v}")
+        self.assertFalse(Game("{^|v}")._canonical)
+
+        # Games read as canonical forms are trusted, with all their subgames
+        g = Game("{^|v}", assume_canonical=True)
+        self.assertTrue(g._canonical)
+        self.assertTrue(g.left_options[0].right_options[0]._canonical)
+        self.assertIs(g.remove_dominated(), g)
+        self.assertEqual(g.replace_reversible(return_change=True), (g, False))
+        self.assertEqual(str(g.canonical_form()), "{^|v}")
+
+        # Changing the options drops the mark
+        g.right_options = [Game("0")]
+        self.assertFalse(g._canonical)
+
     def test_str(self):
         g = Game()
         self.assertEqual(str(g), "0")
-        g.left_options.append(Game())
+        g.left_options += (Game(),)
         self.assertEqual(str(g), "1")
-        g.right_options.append(Game())
+        g.right_options += (Game(),)
         self.assertEqual(str(g), "*")
-        g.left_options.clear()
+        g.left_options = ()
         self.assertEqual(str(g), "-1")
 
     def test_repr(self):
         g = Game()
         self.assertEqual(g.__repr__(), "0")
-        g.left_options.append(Game())
+        g.left_options += (Game(),)
         self.assertEqual(g.__repr__(), "1")
-        g.right_options.append(Game())
+        g.right_options += (Game(),)
         self.assertEqual(g.__repr__(), "*")
-        g.left_options.clear()
+        g.left_options = ()
         self.assertEqual(g.__repr__(), "-1")
 
     def test_clear(self):
         g = Game()
-        g.left_options.append(Game())
-        g.right_options.append(Game())
+        g.left_options += (Game(),)
+        g.right_options += (Game(),)
         g.clear()
         self.assertFalse(g.left_options)
         self.assertFalse(g.right_options)
 
-    def test_set_node_cgn(self):
-        g = Game()
-        num = g._set_node_cgn("{|}", 1)
-        self.assertEqual(str(g), "0")
-        self.assertEqual(num, 2)
-        num = g._set_node_cgn("{|{|}}", 3)
-        self.assertEqual(str(g), "0")
-        self.assertEqual(num, 4)
-        num = g._set_node_cgn("{{|}|{|}}", 1)
-        self.assertEqual(str(g), "*")
-        self.assertEqual(num, 8)
+    def test_options(self):
+        # Options are stored as tuples, so they can be shared between games
+        g = Game("{0,*|1}")
+        self.assertIsInstance(g.left_options, tuple)
+        h = Game()
+        h.left_options = [g.left_options[0]]
+        self.assertEqual(h.left_options, (g.left_options[0],))
+        self.assertIs(h.left_options[0], g.left_options[0])
+        with self.assertRaises(AttributeError):
+            g.left_options.append(Game())
 
     def test_set_cgn(self):
         g = Game().set_cgn("0")
         self.assertEqual(str(g), "0")
         with self.assertRaises(ValueError):
             Game().set_cgn("abc")
+        self.assertEqual(str(Game("{up,star|down*}")), "{*,^|v*}")
+        self.assertEqual(str(Game("{3/4|-1/2}")), "{3/4|-1/2}")
+
+        # Subgames of nimbers are shared
+        g = Game("*10")
+        self.assertIs(g.left_options[9].left_options[3], g.right_options[3])
+
+        # Deep games do not hit the recursion limit
+        g = Game("{" * 5000 + "{|}" + "|}" * 5000)
+        self.assertEqual(g.integer_value(), 5000)
 
     def test_get_node_cgn(self):
         g = Game()
         self.assertEqual(g._get_node_cgn(), "0")
-        g.left_options.append(Game())
+        g.left_options += (Game(),)
         self.assertEqual(g._get_node_cgn(), "1")
-        g.right_options.append(Game())
+        g.right_options += (Game(),)
         self.assertEqual(g._get_node_cgn(), "*")
-        g.left_options.clear()
+        g.left_options = ()
         self.assertEqual(g._get_node_cgn(), "-1")
 
     def test_get_cgn(self):
         g = Game()
         self.assertEqual(g.get_cgn(), "0")
-        g.left_options.append(Game())
+        g.left_options += (Game(),)
         self.assertEqual(g.get_cgn(), "1")
-        g.right_options.append(Game())
+        g.right_options += (Game(),)
         self.assertEqual(g.get_cgn(), "*")
-        g.left_options.clear()
+        g.left_options = ()
         self.assertEqual(g.get_cgn(), "-1")
-
-    def test_get_node_cgn_dot(self):
-        dot_str, num = Game()._get_node_cgn_dot("", 0)
-        target_str = '\t0[label="0"];\n'
-        self.assertEqual(dot_str, target_str)
-        self.assertEqual(num, 0)
-
-        dot_str, num = Game("1")._get_node_cgn_dot("abc", 2)
-        target_str = 'abc\t2[label="1"];\n\t3[label="0"];\n\t2 -> 3[label="L"];\n'
-        self.assertEqual(dot_str, target_str)
-        self.assertEqual(num, 3)
-
-        dot_str, num = Game("*2")._get_node_cgn_dot("xyz", -2)
-        target_str = 'xyz\t-2[label="*2"];\n\t-1[label="0"];\n\t-2 -> -1[label="L"];\n\t0[label="*"];\n\t1[label="0"];\n\t0 -> 1[label="L"];\n\t2[label="0"];\n\t0 -> 2[label="R"];\n\t-2 -> 0[label="L"];\n\t3[label="0"];\n\t-2 -> 3[label="R"];\n\t4[label="*"];\n\t5[label="0"];\n\t4 -> 5[label="L"];\n\t6[label="0"];\n\t4 -> 6[label="R"];\n\t-2 -> 4[label="R"];\n'
-        self.assertEqual(dot_str, target_str)
-        self.assertEqual(num, 6)
+        self.assertEqual(Game("-2000").get_cgn(), "-2000")
 
     def test_get_cgn_dot(self):
         comp_str = Game().get_cgn_dot()
@@ -91,21 +103,62 @@ class TestGame(unittest.TestCase):
         self.assertEqual(comp_str, target_str)
 
         comp_str = Game("1").get_cgn_dot()
-        target_str = 'digraph Game {\n\t0[label="1"];\n\t1[label="0"];\n\t0 -> 1[label="L"];\n}'
-        self.assertEqual(comp_str, target_str)
-
-        comp_str = Game("*").get_cgn_dot()
-        target_str = 'digraph Game {\n\t0[label="*"];\n\t1[label="0"];\n\t0 -> 1[label="L"];\n\t2[label="0"];\n\t0 -> 2[label="R"];\n}'
+        target_str = 'digraph Game {\n\t0[label="1"];\n\t0 -> 1[label="L"];\n\t1[label="0"];\n}'
         self.assertEqual(comp_str, target_str)
 
         comp_str = Game("-1").get_cgn_dot()
-        target_str = 'digraph Game {\n\t0[label="-1"];\n\t1[label="0"];\n\t0 -> 1[label="R"];\n}'
+        target_str = 'digraph Game {\n\t0[label="-1"];\n\t0 -> 1[label="R"];\n\t1[label="0"];\n}'
         self.assertEqual(comp_str, target_str)
 
+        # Shared subgames are written once
         comp_str = Game("*2").get_cgn_dot()
-        target_str = 'digraph Game {\n\t0[label="*2"];\n\t1[label="0"];\n\t0 -> 1[label="L"];\n\t2[label="*"];\n\t3[label="0"];\n\t2 -> 3[label="L"];\n\t4[label="0"];\n\t2 -> 4[label="R"];\n\t0 -> 2[label="L"];\n\t5[label="0"];\n\t0 -> 5[label="R"];\n\t6[label="*"];\n\t7[label="0"];\n\t6 -> 7[label="L"];\n\t8[label="0"];\n\t6 -> 8[label="R"];\n\t0 -> 6[label="R"];\n}'
+        target_str = (
+            'digraph Game {\n\t0[label="*2"];\n\t0 -> 1[label="L"];\n\t0 -> 2[label="L"];\n'
+            '\t0 -> 1[label="R"];\n\t0 -> 2[label="R"];\n\t1[label="0"];\n'
+            '\t2[label="*"];\n\t2 -> 1[label="L"];\n\t2 -> 1[label="R"];\n}'
+        )
         self.assertEqual(comp_str, target_str)
 
+        # Subgames that are equal but not shared are written separately
+        g = Game()
+        g.left_options = [Game()]
+        g.right_options = [Game()]
+        self.assertEqual(g.get_cgn_dot().count("[label=\"0\"]"), 2)
+
+    def test_write_dot(self):
+        dot = io.StringIO()
+        Game("{" * 3000 + "{|}" + "|}" * 3000).write_dot(dot)
+        self.assertEqual(dot.getvalue().count("->"), 3000)
+
+        # The depth and the number of nodes can be limited
+        dot = io.StringIO()
+        Game("*3").write_dot(dot, max_depth=1)
+        self.assertEqual(dot.getvalue().count("label=\"*"), 3)
+        self.assertEqual(dot.getvalue().count("style=dashed"), 2)
+        dot = io.StringIO()
+        Game("{1,2,3|}").write_dot(dot, max_nodes=3)
+        self.assertIn('\t2[label="2"];', dot.getvalue())
+        self.assertNotIn("3[", dot.getvalue())
+        self.assertIn('0[label="{1,2,3|}",style=dashed]', dot.getvalue())
+
+        # Long labels are replaced by the number of the node
+        dot = io.StringIO()
+        Game("{1,2,3|}").write_dot(dot, max_label_length=3)
+        self.assertIn('\t0[label="#0"];', dot.getvalue())
+        self.assertIn('\t3[label="3"];', dot.getvalue())
+
+    def test_with_option(self):
+        self.assertEqual(Game("0").with_option(Game("0"), "L"), Game("1"))
+        self.assertEqual(str(Game("{*|*}").with_option(Game("0"), "L")), "1")
+        self.assertEqual(str(Game("*").with_option(Game("*"), "L")), "^*")
+        self.assertEqual(str(Game("^").with_option(Game("1"), "R")), "^")
+
+    def test_without_option(self):
+        self.assertEqual(str(Game("^").without_option(Game("*"), "R")), "1")
+        self.assertEqual(str(Game("{0,*|0}").without_option(Game("*"), "L")), "*")
+        with self.assertRaises(ValueError):
+            Game("*").without_option(Game("1"), "R")
+
     def test_left_incentive(self):
         # Check Game parameter
         self.assertEqual(Game("*").left_incentive(Game("0")), Game("*"))
@@ -168,12 +221,14 @@ class TestGame(unittest.TestCase):
         self.assertTrue(Game("2").is_integer())
         self.assertTrue(Game("3").is_integer())
         self.assertTrue(Game("{-1|1}").is_integer())
+        self.assertTrue(Game("{0|2}").is_integer())
 
         # Check non-integer games
         self.assertFalse(Game("*").is_integer())
         self.assertFalse(Game("^").is_integer())
         self.assertFalse(Game("v").is_integer())
         self.assertFalse(Game("{1|-1}").is_integer())
+        self.assertFalse(Game("{0|1}").is_integer())
 
     def test_integer_value(self):
         # Check integer games
@@ -184,6 +239,8 @@ class TestGame(unittest.TestCase):
         self.assertEqual(Game("1").integer_value(), 1)
         self.assertEqual(Game("2").integer_value(), 2)
         self.assertEqual(Game("3").integer_value(), 3)
+        self.assertEqual(Game("40").integer_value(), 40)
+        self.assertEqual(Game("{1|3}").integer_value(), 2)
 
         # Check ValueError on non-integer games
         with self.assertRaises(ValueError):
@@ -193,6 +250,50 @@ class TestGame(unittest.TestCase):
         with self.assertRaises(ValueError):
             Game("v").integer_value()
 
+    def test_is_number(self):
+        self.assertTrue(Game("0").is_number())
+        self.assertTrue(Game("-2").is_number())
+        self.assertTrue(Game("{0|1}").is_number())
+        self.assertTrue(Game("{0|2}").is_number())
+        self.assertTrue(Game("{-1|1}").is_number())
+
+        self.assertFalse(Game("*").is_number())
+        self.assertFalse(Game("^").is_number())
+        self.assertFalse(Game("{1|-1}").is_number())
+
+    def test_number_value(self):
+        self.assertEqual(Game("0").number_value(), 0)
+        self.assertEqual(Game("-2").number_value(), -2)
+        self.assertEqual(Game("{0|1}").number_value(), Fraction(1, 2))
+        self.assertEqual(Game("{0|2}").number_value(), 1)
+        self.assertEqual(Game("{{0|1}|1}").number_value(), Fraction(3, 4))
+        self.assertEqual((Game("{0|1}") + Game("{0|1}")).number_value(), 1)
+
+        with self.assertRaises(ValueError):
+            Game("*").number_value()
+        with self.assertRaises(ValueError):
+            Game("{1|-1}").number_value()
+
+    def test_is_impartial(self):
+        self.assertTrue(Game("0").is_impartial())
+        self.assertTrue(Game("*").is_impartial())
+        self.assertTrue(Game("*4").is_impartial())
+        self.assertTrue(Game("{*,*2|*2,*}").is_impartial())
+
+        self.assertFalse(Game("1").is_impartial())
+        self.assertFalse(Game("^").is_impartial())
+        self.assertFalse(Game("{*|*,1}").is_impartial())
+
+    def test_grundy_value(self):
+        self.assertEqual(Game("0").grundy_value(), 0)
+        self.assertEqual(Game("*").grundy_value(), 1)
+        self.assertEqual(Game("*4").grundy_value(), 4)
+        self.assertEqual(Game("{*,*2|*2,*}").grundy_value(), 0)
+        self.assertEqual((Game("*3") + Game("*5")).grundy_value(), 6)
+
+        with self.assertRaises(ValueError):
+            Game("^").grundy_value()
+
     def test_norton(self):
         # Integer times non-integer
         self.assertEqual(Game("-2").norton(Game("^")), Game("v") + Game("v"))
@@ -290,10 +391,44 @@ class TestGame(unittest.TestCase):
         self.assertEqual(Game("{v|}").inverse(), Game("{|^}"))
         self.assertEqual(Game("{|^}").inverse(), Game("{v|}"))
         self.assertEqual(Game("{|v}").inverse(), Game("{^|}"))
+        self.assertEqual(Game("2000").inverse().integer_value(), -2000)
+
+        # The inverse is a view, double negation gives the game back
+        g = Game("{1,*|^}")
+        h = g.inverse()
+        self.assertIsInstance(h, NegatedGame)
+        self.assertIs(h.inverse(), g)
+        self.assertIs(-h, g)
+        self.assertIs(g.inverse(), h)
+        self.assertEqual(str(h), "{v|*,-1}")
+        self.assertIs(h.right_options, h.right_options)
+        self.assertIs(h.right_options[0].inverse(), g.left_options[0])
+
+        # The view follows the game, and changes of the view change the game
+        g.right_options = ()
+        self.assertEqual(str(h), "{|*,-1}")
+        h.left_options = [Game("2")]
+        self.assertEqual(str(g), "{*,1|-2}")
+        h.clear()
+        self.assertEqual(str(g), "0")
+
+    def test_clone(self):
+        g = Game("{^|*}")
+        c = g.clone()
+        self.assertEqual(str(c), "{^|*}")
+        self.assertIsNot(c, g)
+        self.assertIsNot(c.left_options[0], g.left_options[0])
+        self.assertEqual(Game("2000").clone().integer_value(), 2000)
 
     def test_add(self):
         self.assertEqual(Game("0").add(Game("1")), Game("1"))
         self.assertEqual(Game("-1").add(Game("1")), Game("0"))
+        self.assertTrue(Game("4000").add(Game("^")).gtr(Game("4000")))
+        self.assertIsInstance(Game("^").add(Game("{1|-1}")), DisjunctiveSum)
+        # Sums are extended with their components, not folded
+        s = Game("^") + Game("{1|-1}") + Game("1") + Game("1")
+        self.assertEqual(len(s.components), 4)
+        self.assertEqual(s, Game("^") + Game("{1|-1}") + Game("2"))
 
     def test_subtract(self):
         g = Game("0").subtract(Game("1"))
@@ -314,6 +449,18 @@ class TestGame(unittest.TestCase):
         self.assertTrue(Game("1") == Game("1"))
         self.assertTrue(Game("1") - Game("1") == Game("0"))
         self.assertTrue(Game("*") == Game("*").inverse())
+        self.assertFalse(Game("*") == "*")
+
+    def test___hash__(self):
+        self.assertEqual(hash(Game("{1,0|}").canonical_form()), hash(Game("2").canonical_form()))
+        self.assertEqual(hash(Game("*") + Game("*")), hash(Game("0").canonical_form()))
+        games = [Game("*"), Game("{0|0}"), Game("^"), Game("{^,*|^,0}"), Game("^*")]
+        self.assertEqual(len({g.canonical_form() for g in games}), 3)
+        # Plain games can be changed, so they are not hashable
+        with self.assertRaises(TypeError):
+            hash(Game("*"))
+        s = DisjunctiveSum([Game("^"), Game("*")])
+        self.assertEqual(hash(s), hash(Game("^*").canonical_form()))
 
     def test___add__(self):
         self.assertEqual(Game("0") + Game("1"), Game("1"))
@@ -529,7 +676,7 @@ class TestGame(unittest.TestCase):
         self.assertTrue((Game("*") + Game("*")).canonical_form().equal_zero())
         self.assertEqual(str(Game("{^,*|^,0}").canonical_form()), "^*")
         self.assertEqual(str(Game("^*").canonical_form()), "^*")
-        self.assertEqual(str(Game("{2,1,0|-1,-3,2}").canonical_form()), "{{1|}|{|{|-1}}}")
+        self.assertEqual(str(Game("{2,1,0|-1,-3,2}").canonical_form()), "{2|-3}")
         self.assertEqual(str(Game("*").canonical_form()), "*")
         self.assertEqual(str(Game("{{*,0|{*|*}},{*|*}|*,{*|*,{*|*}}}").canonical_form()), "{0,^*|*,v}")
         self.assertEqual(str(Game("{*2,*3,{0|v*},{^|0,v*}|*,*2,*3,{*,^|0,v*},{0,^*|*,v},{0,^*|0,v*},{^,^*|v,v*}}").canonical_form()), "{0|*,*2,*3,{0,^*|*,v},{0,^*|0,v*}}")
@@ -552,3 +699,50 @@ class TestGame(unittest.TestCase):
         self.assertEqual(str(Game("{v,{*,*2,0|*,v},{^|0,v*}|*,{*,*2,0|*,v},{*,*2|0},{*,0|0,v*}}").canonical_form()), "{v,{*,*2,0|*,v},{^|0,v*}|0}")
         self.assertEqual(str(Game("{{*,0|0,^*},{0,^*|v,v*}|*,*2,*3,{*,^|*,v},{0,^*|*,v},{0|v*}}").canonical_form()), "0")
         self.assertEqual(str(Game("{*,0,{*,*2,0|0,v*},{*,0|*,*2,0},{0,^*|*,v}|{*,*2,0|*,0},{0|*2}}").canonical_form()), "{0|{*,*2,0|*,0},{0|*2}}")
+
+
+class TestDisjunctiveSum(unittest.TestCase):
+    def test___init__(self):
+        g, h = Game("^"), Game("{1|-1}")
+        s = DisjunctiveSum([g, DisjunctiveSum([h, g])])
+        self.assertEqual(s.components, (g, h, g))
+        self.assertEqual(DisjunctiveSum().components, ())
+        self.assertEqual(DisjunctiveSum(), Game("0"))
+
+    def test_left_options(self):
+        s = DisjunctiveSum([Game("^"), Game("{1|-1}")])
+        self.assertEqual([str(c) for o in s.left_options for c in o.components], ["0", "{1|-1}", "^", "1"])
+        self.assertIs(s.left_options, s.left_options)
+        self.assertEqual(len(s.right_options), 2)
+        with self.assertRaises(AttributeError):
+            s.left_options = ()
+        with self.assertRaises(AttributeError):
+            s.clear()
+
+        # Options reached in different ways are shared
+        s = DisjunctiveSum([Game("{1|-1}"), Game("{1|-1}")])
+        self.assertIs(s.left_options[0].right_options[0], s.right_options[1].left_options[0])
+        self.assertEqual(str(s), str(Game("{1|-1}") + Game("{1|-1}")))
+        self.assertEqual(s.clone().canonical_form(), Game("0"))
+
+    def test_inverse(self):
+        s = DisjunctiveSum([Game("^"), Game("{2|*}")])
+        self.assertIs(s.inverse().inverse(), s)
+        self.assertEqual(len(s.inverse().components), 2)
+        self.assertTrue((s - s).equal_zero())
+
+    def test_canonical_form(self):
+        s = DisjunctiveSum([Game("^"), Game("^"), Game("v"), Game("*"), Game("{0|1}")])
+        self.assertEqual(str(s.canonical_form()), str((Game("^") + Game("*") + Game("{0|1}")).clone().canonical_form()))
+        # Dozens of components are reduced without expanding the sum
+        s = DisjunctiveSum([Game("{1|-1}"), Game("^"), Game("{2|*}"), Game("1")] * 12)
+        self.assertTrue(s.gtr(Game("12")))
+        self.assertEqual(s, DisjunctiveSum([Game("{2|*}")] * 12 + [Game("12"), Game("^")] + [Game("^")] * 11))
+
+    def test_grundy_value(self):
+        s = DisjunctiveSum([Game("*"), Game("*2"), Game("{0,*|0,*}")])
+        self.assertTrue(s.is_impartial())
+        self.assertEqual(s.grundy_value(), 1)
+        self.assertFalse(DisjunctiveSum([Game("*"), Game("^")]).is_impartial())
+        with self.assertRaises(ValueError):
+            DisjunctiveSum([Game("*"), Game("^")]).grundy_value()
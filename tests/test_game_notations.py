@@ -20,6 +20,102 @@ class TestGameNotations(unittest.TestCase):
         self.assertEqual(gn.expand_integers("v*"), "v*")
         self.assertEqual(gn.expand_integers("{*|*}"), "{*|*}")
 
+    def test_expand_stars(self):
+        self.assertEqual(gn.expand_stars("*"), "{0|0}")
+        self.assertEqual(gn.expand_stars("*2"), "{0,{0|0}|0,{0|0}}")
+        self.assertEqual(gn.expand_stars("{*|*2}"), "{{0|0}|{0,{0|0}|0,{0|0}}}")
+        self.assertEqual(gn.expand_stars("{^|1}"), "{^|1}")
+
+    def test_expand_cgn(self):
+        self.assertEqual(gn.expand_cgn("0"), "{|}")
+        self.assertEqual(gn.expand_cgn("{up|star}"), "{{{|}|{{|}|{|}}}|{{|}|{|}}}")
+        with self.assertRaises(ValueError):
+            gn.expand_cgn("abc")
+
+    def test_parse_cgn(self):
+        def game(left, right):
+            return (tuple(left), tuple(right))
+
+        zero = ((), ())
+        star = ((zero,), (zero,))
+        self.assertEqual(gn.parse_cgn("0", game), zero)
+        self.assertEqual(gn.parse_cgn("{|}", game), zero)
+        self.assertEqual(gn.parse_cgn("*", game), star)
+        self.assertEqual(gn.parse_cgn("{0|*}", game), gn.parse_cgn("^", game))
+        self.assertEqual(gn.parse_cgn("up", game), gn.parse_cgn("^", game))
+        self.assertEqual(gn.parse_cgn("{0,*|0}", game), gn.parse_cgn("^*", game))
+        self.assertEqual(gn.parse_cgn("{0|0,*}", game), gn.parse_cgn("v*", game))
+        self.assertEqual(gn.parse_cgn("{{|}|}", game), gn.parse_cgn("1", game))
+        self.assertEqual(gn.parse_cgn("{|{|}}", game), gn.parse_cgn("-1", game))
+        self.assertEqual(gn.parse_cgn("{0|1}", game), gn.parse_cgn("1/2", game))
+        self.assertEqual(gn.parse_cgn("{-1/2|0}", game), gn.parse_cgn("-1/4", game))
+        self.assertEqual(gn.parse_cgn("{0,*|0,*}", game), gn.parse_cgn("*2", game))
+
+        # Numbers and nimbers can be created by value
+        parsed = gn.parse_cgn("{3/4,*7|-2}", game, number=str, nimber=str)
+        self.assertEqual(parsed, (("3/4", "7"), ("-2",)))
+
+        # Invalid notation
+        for cgn in [
+            "",
+            "abc",
+            "{",
+            "}",
+            "{|",
+            "{0|1|2}",
+            "{0,|1}",
+            "{,0|1}",
+            "{0|1}}",
+            "0 1",
+            "01{|}",
+            "1/3",
+        ]:
+            with self.assertRaises(ValueError):
+                gn.parse_cgn(cgn, game)
+
+        # The notation is never expanded
+        self.assertEqual(len(gn.parse_cgn("*60", game)[0]), 60)
+
+    def test_format_cgn(self):
+        self.assertEqual(gn.format_cgn([], []), "0")
+        self.assertEqual(gn.format_cgn(["0"], []), "1")
+        self.assertEqual(gn.format_cgn(["41"], []), "42")
+        self.assertEqual(gn.format_cgn([], ["-1"]), "-2")
+        self.assertEqual(gn.format_cgn(["0"], ["1"]), "1/2")
+        self.assertEqual(gn.format_cgn(["-1/2"], ["-1/4"]), "-3/8")
+        self.assertEqual(gn.format_cgn(["0"], ["0"]), "*")
+        self.assertEqual(gn.format_cgn(["*", "*2", "0"], ["*", "*2", "0"]), "*3")
+        self.assertEqual(gn.format_cgn(["0"], ["*"]), "^")
+        self.assertEqual(gn.format_cgn(["*", "0"], ["0"]), "^*")
+        self.assertEqual(gn.format_cgn(["0"], ["^*"]), "^2")
+        self.assertEqual(gn.format_cgn(["0"], ["^2"]), "^3*")
+        self.assertEqual(gn.format_cgn(["v"], ["0"]), "v2*")
+        self.assertEqual(gn.format_cgn(["0"], ["*", "0"]), "v*")
+
+        # Games that are not the canonical form of a value
+        self.assertEqual(gn.format_cgn(["-1"], []), "{-1|}")
+        self.assertEqual(gn.format_cgn(["-1"], ["1"]), "{-1|1}")
+        self.assertEqual(gn.format_cgn(["0"], ["2"]), "{0|2}")
+        self.assertEqual(gn.format_cgn(["*"], ["*"]), "{*|*}")
+        self.assertEqual(gn.format_cgn(["*", "0"], ["0", "*"]), "{*,0|0,*}")
+        self.assertEqual(gn.format_cgn(["0"], ["v"]), "{0|v}")
+        self.assertEqual(gn.format_cgn(["0", "0"], []), "{0,0|}")
+
+        # Formatted games are parsed to the same structure
+        def game(left, right):
+            return (tuple(sorted(left)), tuple(sorted(right)))
+
+        for cgn in [
+            "{0|*}",
+            "{0|{0,{0|0}|0}}",
+            "{{{{|}|}|}|{|{|}}}",
+            "{{|}|{{|}|}}",
+            "{{0|0}|0}",
+            "*5",
+        ]:
+            parsed = gn.parse_cgn(cgn, game)
+            self.assertEqual(gn.parse_cgn(_format(parsed), game), parsed)
+
     def test_compress_cgn(self):
         # Basic games
         self.assertEqual(gn.compress_cgn("{|}"), "0")
@@ -58,3 +154,9 @@ class TestGameNotations(unittest.TestCase):
         self.assertFalse(gn.is_valid_expanded_cgn("|}"))
         self.assertFalse(gn.is_valid_expanded_cgn("||"))
         self.assertFalse(gn.is_valid_expanded_cgn("."))
+
+
+def _format(game):
+    # Format a game of nested tuples
+    left, right = game
+    return gn.format_cgn(sorted(_format(g) for g in left), sorted(_format(g) for g in right))
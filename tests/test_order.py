@@ -0,0 +1,76 @@
+import unittest
+from itertools import combinations
+from cg.game import Game
+from cg.order import GameOrder
+from cg.universe import GameUniverse
+
+# The canonical games born by day 1
+DAY_1 = ["0", "*", "1", "-1"]
+
+
+class TestGameOrder(unittest.TestCase):
+    def test___init__(self):
+        u = GameUniverse()
+        order = GameOrder([Game(g) for g in DAY_1], u)
+        self.assertEqual(len(order), 4)
+        self.assertIs(order.universe, u)
+        self.assertIs(order.games[1], u.from_cgn("*"))
+
+        # The games are reduced to canonical form
+        self.assertIs(GameOrder([Game("{*|*}")], u).games[0], u.zero)
+
+        # A precomputed matrix is reused
+        copy = GameOrder([Game(g) for g in DAY_1], u, order.matrix)
+        self.assertTrue((copy.matrix == order.matrix).all())
+        with self.assertRaises(ValueError):
+            GameOrder([Game(g) for g in DAY_1], u, [[True]])
+
+    def test_matrix(self):
+        order = GameOrder([Game(g) for g in DAY_1])
+        self.assertEqual(order.matrix.tolist()[0], [True, False, True, False])
+        with self.assertRaises(ValueError):
+            order.matrix[0, 1] = True
+
+    def test_leq(self):
+        order = GameOrder([Game(g) for g in DAY_1])
+        self.assertTrue(order.leq(0, 0))
+        self.assertTrue(order.leq(3, 0))
+        self.assertTrue(order.leq(3, 2))
+        self.assertFalse(order.leq(2, 0))
+        self.assertFalse(order.leq(1, 0))
+
+    def test_incomparable(self):
+        order = GameOrder([Game(g) for g in DAY_1])
+        self.assertTrue(order.incomparable(0, 1))
+        self.assertFalse(order.incomparable(0, 0))
+        self.assertFalse(order.incomparable(1, 2))
+        self.assertFalse(order.incomparable(2, 3))
+
+    def test_canonical_form(self):
+        u = GameUniverse()
+        order = GameOrder([Game(g) for g in DAY_1], u)
+        self.assertIs(order.canonical_form([], []), u.zero)
+        self.assertEqual(str(order.canonical_form([0, 1], [0])), "^*")
+        self.assertEqual(str(order.canonical_form([0, 2, 3], [2])), "{1|1}")
+        # Reversible options are replaced
+        self.assertEqual(str(order.canonical_form([1], [1])), "0")
+        self.assertIs(order.canonical_form([0], [2]), u.canonical_form(u.from_cgn("{0|1}")))
+        with self.assertRaises(IndexError):
+            order.canonical_form([4], [])
+
+        # All games born by day 2 agree with the canonical forms of the games
+        subsets = [s for r in range(len(DAY_1) + 1) for s in combinations(range(len(DAY_1)), r)]
+        for left in subsets:
+            for right in subsets:
+                g = Game(
+                    "{"
+                    + ",".join(DAY_1[i] for i in left)
+                    + "|"
+                    + ",".join(DAY_1[i] for i in right)
+                    + "}"
+                )
+                self.assertIs(order.canonical_form(left, right), u.canonical_form(g))
+
+        # Equal games are kept once
+        order = GameOrder([Game("*"), Game("{0|0}")], u)
+        self.assertIs(order.canonical_form([0, 1], [0]), u.canonical_form(u.from_cgn("{*|*}")))
@@ -0,0 +1,97 @@
+import os
+import pickle
+import tempfile
+import unittest
+from cg.game import Game
+from cg.store import GameStore, write_games
+from cg.universe import GameUniverse
+
+GAMES = ["0", "*", "{^|v}", "{1,*|-1}", "{{2|1}|{-1|-2}}"]
+
+
+class TestGameStore(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "games.cgs")
+
+    def test___init__(self):
+        write_games(self.path, GAMES)
+        store = GameStore(self.path)
+        self.assertEqual(len(store), len(GAMES))
+        self.assertEqual(store.path, self.path)
+        # The table is mapped from the file
+        self.assertFalse(store.table.arrays()[1].flags.owndata)
+        self.assertEqual(len(GameStore(self.path, validate=True)), len(GAMES))
+
+        # A corrupt file in which * is its own option
+        write_games(self.path, ["*"])
+        with open(self.path, "r+b") as file:
+            # The Left option of game 1, after the header and three offsets
+            file.seek(48 + 3 * 4)
+            file.write((1).to_bytes(4, "little"))
+        store = GameStore(self.path)
+        with self.assertRaises(ValueError):
+            store.cgn(0)
+        with self.assertRaises(ValueError):
+            GameStore(self.path, validate=True)
+
+        with open(self.path, "r+b") as file:
+            file.write(b"CGSTORE0")
+        with self.assertRaises(ValueError):
+            GameStore(self.path)
+        write_games(self.path, GAMES)
+        with open(self.path, "ab") as file:
+            file.write(b"\0")
+        with self.assertRaises(ValueError):
+            GameStore(self.path)
+
+    def test___getitem__(self):
+        write_games(self.path, [Game(g) for g in GAMES])
+        store = GameStore(self.path)
+        for i, cgn in enumerate(GAMES):
+            self.assertEqual(str(store[i]), str(Game(cgn)))
+        self.assertEqual(str(store[-1]), str(Game(GAMES[-1])))
+        with self.assertRaises(IndexError):
+            store[len(GAMES)]
+
+    def test___reduce__(self):
+        write_games(self.path, GAMES)
+        store = pickle.loads(pickle.dumps(GameStore(self.path)))
+        self.assertEqual(store.cgn(2), "{^|v}")
+
+        # A store in a larger file
+        with open(self.path, "wb") as file:
+            file.write(b"header")
+            write_games(file, GAMES)
+        store = pickle.loads(pickle.dumps(GameStore(self.path, offset=6)))
+        self.assertEqual(store.cgn(2), "{^|v}")
+
+    def test_table(self):
+        write_games(self.path, ["{*|*}", "*"])
+        store = GameStore(self.path)
+        # Subgames are stored once, also across games
+        self.assertEqual(len(store.table), 3)
+        self.assertEqual(store.table_id(1), store.table.left_options(store.table_id(0))[0])
+
+        # The table can still grow, the file is not changed
+        idx = store.table.append([0])
+        self.assertEqual(store.table.cgn(idx), "1")
+        self.assertEqual(len(GameStore(self.path).table), 3)
+
+    def test_cgn(self):
+        u = GameUniverse()
+        write_games(self.path, [u.from_cgn("{^|v}"), "{" * 3000 + "|}" * 3000])
+        store = GameStore(self.path)
+        self.assertEqual(store.cgn(0), "{^|v}")
+        self.assertEqual(len(store.table), 2999 + 5)
+        with self.assertRaises(IndexError):
+            store.cgn(-3)
+
+    def test_write_games(self):
+        write_games(self.path, [])
+        self.assertEqual(len(GameStore(self.path)), 0)
+        write_games(self.path, iter(GAMES))
+        self.assertEqual(
+            [GameStore(self.path).cgn(i) for i in range(len(GAMES))], [str(Game(g)) for g in GAMES]
+        )
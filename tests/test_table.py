@@ -0,0 +1,98 @@
+import pickle
+import unittest
+from cg.game import Game
+from cg.table import GameTable
+from cg.universe import GameUniverse
+
+
+class TestGameTable(unittest.TestCase):
+    def test___init__(self):
+        self.assertEqual(len(GameTable()), 0)
+        with self.assertRaises(ValueError):
+            GameTable(0)
+
+    def test_append(self):
+        t = GameTable(capacity=1)
+        zero = t.append()
+        star = t.append([zero], [zero])
+        one = t.append([zero])
+        up = t.append([zero], [star])
+        self.assertEqual((zero, star, one, up), (0, 1, 2, 3))
+        self.assertEqual(len(t), 4)
+        self.assertEqual(list(t.left_options(up)), [zero])
+        self.assertEqual(list(t.right_options(up)), [star])
+        self.assertEqual(list(t.right_options(one)), [])
+
+        # Options must already be in the table
+        with self.assertRaises(ValueError):
+            t.append([4])
+        with self.assertRaises(ValueError):
+            t.append([], [-1])
+        self.assertEqual(len(t), 4)
+        with self.assertRaises(IndexError):
+            t.left_options(4)
+
+    def test_add_game(self):
+        t = GameTable()
+        idx = t.add_cgn("{^,*|0}")
+        self.assertEqual(t.cgn(idx), "{*,^|0}")
+        self.assertEqual(t.add_game(Game()), len(t) - 1)
+
+        # Shared subgames of a universe are added only once
+        u = GameUniverse()
+        g = u.from_cgn("{*|*}")
+        t = GameTable()
+        t.add_game(g)
+        self.assertEqual(len(t), 3)
+
+    def test_game(self):
+        t = GameTable()
+        for cgn in ["0", "*", "^", "{1|-1}", "{{2|1}|{-1|-2}}"]:
+            self.assertEqual(str(t.game(t.add_cgn(cgn))), str(Game(cgn)))
+        zero = t.append()
+        g = t.game(t.append([zero], [zero]))
+        self.assertIs(g.left_options[0], g.right_options[0])
+
+    def test_arrays(self):
+        t = GameTable()
+        t.add_cgn("{1|-1}")
+        left_offsets, left_index, right_offsets, right_index = t.arrays()
+        self.assertEqual(len(left_offsets), len(t) + 1)
+        self.assertEqual(left_offsets[-1], len(left_index))
+        self.assertEqual(right_offsets[-1], len(right_index))
+        with self.assertRaises(ValueError):
+            left_index[0] = 1
+
+    def test_from_arrays(self):
+        t = GameTable()
+        idx = t.add_cgn("{^|v}")
+        c = GameTable.from_arrays(*t.arrays())
+        self.assertEqual(len(c), len(t))
+        self.assertEqual(c.cgn(idx), t.cgn(idx))
+        # The copy can still grow
+        self.assertEqual(c.cgn(c.append([idx])), "{{^|v}|}")
+
+        with self.assertRaises(ValueError):
+            GameTable.from_arrays([0, 1], [0], [0, 0], [])
+        with self.assertRaises(ValueError):
+            GameTable.from_arrays([0, 0], [], [0], [])
+        with self.assertRaises(ValueError):
+            GameTable.from_arrays([0, 1, 0], [], [0, 0, 0], [])
+        # Options that refer to later games are only found when validating
+        with self.assertRaises(ValueError):
+            GameTable.from_arrays([0, 1], [0], [0, 0], [], copy=False)
+        self.assertEqual(len(GameTable.from_arrays([0, 1], [0], [0, 0], [], validate=False)), 1)
+        with self.assertRaises(ValueError):
+            GameTable.from_arrays([0, 0, 1], [-1], [0, 0, 0], [])
+        # Options are still checked when the games are read
+        t = GameTable.from_arrays([0, 0, 1], [1], [0, 0, 1], [1], validate=False)
+        self.assertEqual(t.cgn(0), "0")
+        with self.assertRaises(ValueError):
+            t.cgn(1)
+
+    def test_pickle(self):
+        t = GameTable()
+        idx = t.add_cgn("{1,*|-1}")
+        c = pickle.loads(pickle.dumps(t))
+        self.assertEqual(c.cgn(idx), t.cgn(idx))
+        self.assertEqual(len(c.arrays()[1]), len(t.arrays()[1]))
@@ -0,0 +1,37 @@
+import unittest
+from cg.traversal import UNKNOWN, evaluate, refute
+
+
+class TestTraversal(unittest.TestCase):
+    def test_evaluate(self):
+        # The length of the longest path in a chain deeper than the recursion limit
+        chain = {n: [n - 1] if n else [] for n in range(5000)}
+        computed = []
+
+        def depth(node, value):
+            computed.append(node)
+            return max((value(child) + 1 for child in chain[node]), default=0)
+
+        self.assertEqual(evaluate(4999, int, chain.get, depth), 4999)
+        self.assertEqual(len(computed), 5000)
+
+        # Known values and the table are used instead of visiting children
+        table = {10: 100}
+        self.assertEqual(evaluate(12, int, chain.get, depth, table), 102)
+        self.assertEqual(table[12], 102)
+        self.assertEqual(
+            evaluate(12, int, chain.get, depth, known=lambda n: 7 if n == 11 else UNKNOWN), 8
+        )
+
+    def test_refute(self):
+        # Positions of a subtraction game: a move removes 1 or 2, the player to move loses at 0
+        moves = {n: [n - k for k in (1, 2) if n >= k] for n in range(3000)}
+        # P holds for the losing positions, the multiples of 3
+        self.assertTrue(refute(2997, int, moves.get))
+        self.assertFalse(refute(2998, int, moves.get))
+
+        # The search stops at the first winning move
+        graph = {"a": ["b", "c"], "b": [], "c": ["d"], "d": []}
+        table = {}
+        self.assertFalse(refute("a", str, graph.get, table))
+        self.assertEqual(table, {"a": False, "b": True})
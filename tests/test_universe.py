@@ -0,0 +1,472 @@
+import pickle
+import unittest
+from fractions import Fraction
+from cg.game import Game
+from cg.universe import GameUniverse, InternedGame, default_universe
+
+
+class TestGameUniverse(unittest.TestCase):
+    def test_game(self):
+        u = GameUniverse()
+        self.assertIs(u.game(), u.zero)
+        star = u.game([u.zero], [u.zero])
+        self.assertIsInstance(star, InternedGame)
+        self.assertEqual(str(star), "*")
+        self.assertIs(u.game([Game()], [Game()]), star)
+
+        # The order of the options does not matter
+        up = u.game([u.zero], [star])
+        self.assertIs(u.game([star, up], [u.zero]), u.game([up, star], [u.zero]))
+
+    def test_uid(self):
+        u = GameUniverse()
+        self.assertEqual(u.zero.uid, 0)
+        one = u.game([u.zero])
+        minus_one = u.game([], [u.zero])
+        self.assertNotEqual(one.uid, minus_one.uid)
+        self.assertEqual(u.game([u.zero]).uid, one.uid)
+        self.assertEqual(len(u), 3)
+
+    def test_intern(self):
+        u = GameUniverse()
+        g = u.intern(Game("{*,^|*2}"))
+        self.assertIn(g, u)
+        self.assertNotIn(Game("{*,^|*2}"), u)
+        self.assertIs(u.intern(g), g)
+        self.assertIs(u.intern(Game("{^,*|*2}")), g)
+
+        # Games that are no longer used are dropped, their ids are not reused
+        size = len(u)
+        for n in range(1, 20):
+            u.intern(Game(f"{{{n}|*}}"))
+        self.assertEqual(len(u), size)
+        h = u.intern(Game("{1|*}"))
+        self.assertIs(u.game([u.game([u.zero])], [u.nimber(1)]), h)
+        self.assertGreater(h.uid, g.uid + 20)
+        self.assertIs(u.from_cgn("{*,^|*2}"), g)
+        self.assertEqual(str(g), "{*,^|*2}")
+
+        # Subgames are shared
+        self.assertIs(g.left_options[0].left_options[0], g.right_options[0].left_options[0])
+
+        # Negated views are interned as the inverse of their game
+        self.assertIs(u.intern(Game("{1|^}").inverse()), u.from_cgn("{v|-1}"))
+
+        # Games of other universes are interned again
+        v = GameUniverse()
+        h = v.intern(g)
+        self.assertIn(h, v)
+        self.assertNotIn(h, u)
+        self.assertEqual(str(h), str(g))
+
+    def test_from_cgn(self):
+        u = GameUniverse()
+        self.assertIs(u.from_cgn("0"), u.zero)
+        self.assertIs(u.from_cgn("-3/8"), u.number_game(Fraction(-3, 8)))
+        self.assertIs(u.from_cgn("*5"), u.nimber(5))
+        self.assertIs(u.from_cgn("{0,*|0}"), u.from_cgn("^*"))
+        self.assertIs(u.from_cgn("{{{|}|}|{|{|}}}"), u.from_cgn("{1|-1}"))
+        self.assertFalse(u.from_cgn("{1|-1}")._canonical)
+        self.assertTrue(u.from_cgn("{2|-2}", assume_canonical=True)._canonical)
+        with self.assertRaises(ValueError):
+            u.from_cgn("{1|")
+
+    def test_str(self):
+        u = GameUniverse()
+        g = u.from_cgn("{^2*,3/4|*4,v}")
+        self.assertEqual(str(g), "{3/4,^2*|*4,v}")
+        # Every node is formatted once
+        self.assertEqual({gl._cgn for gl in g.left_options}, {"3/4", "^2*"})
+        self.assertIs(str(g), str(g))
+
+    def test_immutable(self):
+        u = GameUniverse()
+        g = u.from_cgn("*")
+        self.assertIsInstance(g.left_options, tuple)
+        self.assertIsInstance(g.right_options, tuple)
+        with self.assertRaises(AttributeError):
+            g.left_options = []
+        with self.assertRaises(TypeError):
+            g.clear()
+        with self.assertRaises(TypeError):
+            g.set_cgn("0")
+        self.assertIs(g.clone(), g)
+
+    def test_pickle(self):
+        u = GameUniverse()
+        g = u.from_cgn("{0,0,*|{1|*}}")
+        h = pickle.loads(pickle.dumps(g))
+        # The game is interned in the default universe with the same structure
+        self.assertIs(h, default_universe().intern(g))
+        self.assertEqual(str(h), str(g))
+        self.assertEqual(len(h.left_options), 3)
+        canon = pickle.loads(pickle.dumps(Game("{^,*|^,0}").canonical_form()))
+        self.assertTrue(canon._canonical)
+        self.assertEqual(str(canon), "^*")
+        deep = u.from_cgn("{" * 3000 + "{|}" + "|^}" * 3000)
+        self.assertIs(pickle.loads(pickle.dumps(deep)), default_universe().intern(deep))
+
+    def test_hash(self):
+        u = GameUniverse()
+        v = GameUniverse()
+        # Equal games have the same hash, also in different universes
+        self.assertEqual(hash(u.from_cgn("{^,*|^,0}")), hash(u.from_cgn("^*")))
+        self.assertEqual(hash(u.from_cgn("^*")), hash(v.from_cgn("^*")))
+        self.assertEqual(hash(u.from_cgn("{1|}")), hash(Game("2").canonical_form()))
+        self.assertNotEqual(hash(u.from_cgn("^")), hash(u.from_cgn("v")))
+
+        # Canonical forms are deduplicated by sets and dicts
+        games = [
+            u.from_cgn(cgn).canonical_form() for cgn in ["*", "{0|0}", "^", "{0|*}", "{*|*}", "0"]
+        ]
+        self.assertEqual(len(set(games)), 3)
+        self.assertEqual({g: str(g) for g in games}[u.zero], "0")
+        self.assertEqual(
+            len({u.from_cgn("^*"), v.from_cgn("^*"), Game("{^,*|^,0}").canonical_form()}), 1
+        )
+
+    def test_eq(self):
+        u = GameUniverse()
+        v = GameUniverse()
+        up = u.from_cgn("^")
+        self.assertTrue(up == up.canonical_form())
+        self.assertTrue(up == v.from_cgn("^").canonical_form())
+        self.assertTrue(u.from_cgn("{^,*|^,0}") == u.from_cgn("^*"))
+        self.assertFalse(up == u.from_cgn("v"))
+        self.assertFalse(up == "^")
+
+        # Canonical forms are compared by their structure
+        size = len(u.comparisons)
+        self.assertFalse(u.from_cgn("^*").canonical_form() == u.from_cgn("^").canonical_form())
+        self.assertEqual(len(u.comparisons), size)
+
+    def test_structural_hash(self):
+        u = GameUniverse()
+        self.assertEqual(u.structural_hash(Game("^")), GameUniverse().structural_hash(Game("^")))
+        self.assertEqual(
+            u.structural_hash(u.game([u.zero, u.from_cgn("1")])), u.structural_hash(Game("{1,0|}"))
+        )
+        # Equal games with a different structure have different structural hashes
+        self.assertNotEqual(u.structural_hash(Game("{1,0|}")), u.structural_hash(Game("2")))
+        self.assertIsInstance(u.structural_hash(Game("{" * 3000 + "{|}" + "|^}" * 3000)), int)
+
+    def test_inverse(self):
+        u = GameUniverse()
+        up = u.from_cgn("^")
+        down = u.from_cgn("v")
+        self.assertIs(up.inverse(), down)
+        self.assertIs(-down, up)
+        self.assertIs(u.inverse(Game("{^|}")), u.from_cgn("{|v}"))
+        self.assertIs(u.zero.inverse(), u.zero)
+        self.assertIs(u.nimber(3).inverse(), u.nimber(3))
+
+    def test_inverse_impartial(self):
+        u = GameUniverse()
+        game = u.intern(Game("{0,0|0}"))
+        inverse = u.inverse(game)
+        self.assertEqual(len(inverse.left_options), 1)
+        self.assertEqual(len(inverse.right_options), 2)
+        self.assertIs(inverse.inverse(), game)
+        # The options are inverted too, even when they are impartial
+        outer = u.intern(Game("{{0,0|0}|{0,0|0}}"))
+        self.assertIs(outer.inverse().left_options[0], inverse)
+
+    def test_add(self):
+        u = GameUniverse()
+        one = u.from_cgn("1")
+        self.assertIs(one + u.zero, one)
+        self.assertIs(u.zero + one, one)
+        self.assertIs(one + one, u.from_cgn("2"))
+        self.assertIs(u.from_cgn("^") + u.from_cgn("^"), u.from_cgn("^") + u.from_cgn("^"))
+        self.assertEqual(len((u.from_cgn("^") + u.from_cgn("^")).left_options), 2)
+        self.assertIs(u.from_cgn("*") + u.from_cgn("^"), u.from_cgn("^") + u.from_cgn("*"))
+        self.assertIn(u.add(Game("^"), Game("v")), u)
+        self.assertTrue((u.from_cgn("^") + Game("v")).equal_zero())
+        self.assertEqual(u.from_cgn("^") - u.from_cgn("^"), Game("0"))
+
+        # Sums are memoised
+        two = u.from_cgn("2")
+        self.assertIs(two + two, two + two)
+        self.assertEqual(two + two, Game("4"))
+
+        # Deep games are added and inverted without recursion
+        g = u.from_cgn("{" * 3000 + "{|}" + "|^}" * 3000)
+        self.assertTrue(-(-g) is g)
+        self.assertTrue(u.geq(g + u.from_cgn("^"), g))
+
+    def test_sum(self):
+        u = GameUniverse()
+        self.assertIs(u.sum([]), u.zero)
+        # Numbers are added by value and nimbers by XOR
+        summed = u.sum([Game("1"), Game("{0|1}"), Game("*"), Game("*2")])
+        self.assertIs(summed, u.canonical_form(u.add(u.number_game(Fraction(3, 2)), u.nimber(3))))
+
+        # G+(-G) cancels, repeated games are added by doubling
+        pm = Game("{1|-1}")
+        self.assertIs(u.sum([Game("^"), pm, Game("v"), pm.inverse()]), u.zero)
+        up = u.from_cgn("^")
+        self.assertIs(u.sum([Game("^")] * 5), u.canonical_form(up + up + up + up + up))
+        hot = u.from_cgn("{2|*}")
+        self.assertIs(
+            u.sum([Game("{2|*}")] * 2 + [Game("1")]), u.canonical_form(hot + hot + u.from_cgn("1"))
+        )
+
+    def test_translate(self):
+        u = GameUniverse()
+        self.assertIs(u.translate(u.from_cgn("^"), Fraction(0)), u.from_cgn("^"))
+        self.assertIs(u.translate(u.from_cgn("{1|-1}"), Fraction(1)), u.from_cgn("{2|0}"))
+        self.assertIs(
+            u.translate(u.from_cgn("*"), Fraction(-2)), u.canonical_form(u.from_cgn("{-2|-2}"))
+        )
+        self.assertIs(u.translate(u.from_cgn("1"), Fraction(1, 2)), u.number_game(Fraction(3, 2)))
+
+    def test_geq_zero(self):
+        u = GameUniverse()
+        self.assertTrue(u.geq_zero(u.zero))
+        self.assertTrue(u.geq_zero(Game("^")))
+        self.assertFalse(u.geq_zero(Game("*")))
+        self.assertFalse(u.geq_zero(Game("v")))
+
+        # Solved games are answered from the transposition table
+        g = u.from_cgn("{^,*|^,0}") + u.from_cgn("v*")
+        u.outcomes.clear()
+        self.assertTrue(u.geq_zero(g))
+        hits, misses = u.outcomes.hits, u.outcomes.misses
+        self.assertTrue(u.geq_zero(g))
+        self.assertTrue(g.geq_zero())
+        self.assertEqual(u.outcomes.misses, misses)
+        self.assertEqual(u.outcomes.hits, hits + 2)
+
+    def test_leq_zero(self):
+        u = GameUniverse()
+        self.assertTrue(u.leq_zero(u.zero))
+        self.assertTrue(u.leq_zero(Game("v")))
+        self.assertFalse(u.leq_zero(Game("*")))
+        self.assertFalse(u.leq_zero(Game("^")))
+
+        # The outcome predicates share the table
+        g = u.from_cgn("{1|^}")
+        u.outcomes.clear()
+        self.assertEqual(g.outcome_class(), "L")
+        misses = u.outcomes.misses
+        self.assertTrue(g.gtr_zero())
+        self.assertFalse(g.equal_zero())
+        self.assertEqual(u.outcomes.misses, misses)
+
+    def test_geq(self):
+        u = GameUniverse()
+        self.assertTrue(u.geq(Game("^"), Game("v")))
+        self.assertTrue(u.geq(Game("1"), Game("^")))
+        self.assertTrue(u.geq(Game("{1|-1}"), Game("{1|-1}")))
+        self.assertTrue(u.geq(Game("{^,*|^,0}"), Game("^*")))
+        self.assertFalse(u.geq(Game("v"), Game("v*")))
+        self.assertFalse(u.geq(Game("*"), Game("*2")))
+        self.assertFalse(u.geq(Game("^"), Game("1")))
+
+        # The difference is not constructed and comparisons are memoised
+        g = u.from_cgn("{*2,*3,{0|v*},{^|0,v*}|*,*2,*3,{*,^|0,v*},{0,^*|*,v}}")
+        h = u.from_cgn("{0|*,*2,*3,{0,^*|*,v}}")
+        size = len(u)
+        self.assertTrue(u.geq(g, h))
+        self.assertEqual(len(u), size)
+        hits = u.comparisons.hits
+        self.assertTrue(g.geq(h))
+        self.assertTrue(h.leq(g))
+        self.assertEqual(u.comparisons.hits, hits + 2)
+
+        # Deep games are compared without recursion
+        g = u.from_cgn("{" * 3000 + "{|}" + "|^}" * 3000)
+        self.assertTrue(u.geq(g, u.zero))
+        self.assertTrue(u.geq(u.from_cgn("3001"), g))
+        self.assertFalse(u.geq(g, u.from_cgn("{" * 3000 + "{|}" + "|*}" * 3000)))
+
+    def test_canonical_form(self):
+        u = GameUniverse()
+        g = u.from_cgn("{^,*|^,0}")
+        canon = g.canonical_form()
+        self.assertIn(canon, u)
+        self.assertIs(canon, u.from_cgn("^*"))
+        self.assertIs(canon.canonical_form(), canon)
+        self.assertIs(u.canonical_form(Game("{^,*|^,0}")), canon)
+        self.assertIs((u.from_cgn("*") + u.from_cgn("*")).canonical_form(), u.zero)
+        self.assertEqual(
+            str(
+                u.from_cgn(
+                    "{*2,*3,{0|v*},{^|0,v*}|*,*2,*3,{*,^|0,v*},{0,^*|*,v},{0,^*|0,v*},{^,^*|v,v*}}"
+                ).canonical_form()
+            ),
+            "{0|*,*2,*3,{0,^*|*,v},{0,^*|0,v*}}",
+        )
+
+        # Deep games are reduced without recursion
+        g = u.from_cgn("{" * 3000 + "{|}" + "|^}" * 3000)
+        self.assertTrue(g.canonical_form() is g)
+        self.assertTrue(
+            u.canonical_form(Game("{" * 3000 + "{|}" + ",0|}" * 3000)) is u.number_game(3000)
+        )
+
+    def test_with_option(self):
+        u = GameUniverse()
+        star = u.from_cgn("*")
+        self.assertIs(u.with_option(u.zero, u.zero, "L"), u.from_cgn("1"))
+        self.assertIs(u.with_option(u.from_cgn("1"), u.zero, "R"), star)
+        # A dominated option does not change the game
+        self.assertIs(u.with_option(u.from_cgn("{1|-1}"), star, "L"), u.from_cgn("{1|-1}"))
+        # Dominated options are removed
+        self.assertIs(
+            u.with_option(u.from_cgn("{*|0}"), u.from_cgn("1"), "L"),
+            u.canonical_form(u.from_cgn("{1|0}")),
+        )
+        # Options that become reversible are replaced
+        self.assertIs(u.with_option(star, star, "L"), u.canonical_form(u.from_cgn("{0,*|0}")))
+        self.assertIs(u.with_option(u.zero, u.from_cgn("{*|*}"), "L"), u.from_cgn("1"))
+        self.assertTrue(u.with_option(u.from_cgn("^"), star, "R")._canonical)
+        with self.assertRaises(ValueError):
+            u.with_option(u.zero, u.zero, "X")
+
+    def test_without_option(self):
+        u = GameUniverse()
+        g = u.canonical_form(u.from_cgn("{0,*|0}"))
+        self.assertIs(u.without_option(g, u.from_cgn("*"), "L"), u.from_cgn("*"))
+        self.assertIs(u.without_option(u.from_cgn("*"), u.zero, "R"), u.from_cgn("1"))
+        # Right options that become reversible are replaced
+        g = u.canonical_form(u.from_cgn("{1|{0|-1}}"))
+        self.assertIs(
+            u.without_option(g, u.from_cgn("1"), "L"), u.canonical_form(u.from_cgn("{|{0|-1}}"))
+        )
+        with self.assertRaises(ValueError):
+            u.without_option(u.from_cgn("*"), u.from_cgn("1"), "L")
+
+    def test_canonicals(self):
+        u = GameUniverse()
+        g = u.from_cgn("{{^,*|^,0},*|{^,*|^,0}}")
+        canon = g.canonical_form()
+        stats = u.canonicals.stats()
+        self.assertIs(g.canonical_form(), canon)
+        self.assertEqual(u.canonicals.hits, stats["hits"] + 1)
+
+        # Options that were reduced before are not reduced again
+        h = u.game([g, u.zero], [g])
+        h.canonical_form()
+        self.assertEqual(u.canonicals.misses, stats["misses"] + 1)
+
+        # Games read as canonical forms are not reduced
+        v = GameUniverse()
+        c = v.from_cgn(str(canon), assume_canonical=True)
+        self.assertIs(c.canonical_form(), c)
+        self.assertIs(v.canonical_form(v.inverse(c)), v.inverse(c))
+        self.assertEqual(len(v.canonicals), 0)
+        # Only the root of a game with canonical options is reduced
+        v.game([c, v.zero], [c.inverse()]).canonical_form()
+        self.assertEqual(len(v.canonicals), 1)
+
+        # Use a scoped, empty cache
+        stats = u.canonicals.stats()
+        with u.canonicals.scoped(max_size=2) as cache:
+            self.assertIs(g.canonical_form(), canon)
+            self.assertGreater(cache.misses, 0)
+            self.assertGreater(cache.evictions, 0)
+        self.assertDictEqual(u.canonicals.stats(), stats)
+
+    def test_stats(self):
+        u = GameUniverse(table_size=16)
+        u.from_cgn("{^|*}").canonical_form()
+        stats = u.stats()
+        self.assertEqual(stats["games"], len(u))
+        self.assertEqual(stats["canonicals"]["max_size"], 16)
+        self.assertGreater(stats["canonicals"]["misses"], 0)
+        self.assertGreater(stats["comparisons"]["misses"], 0)
+
+    def test_clear(self):
+        u = GameUniverse()
+        g = u.from_cgn("{^|*}")
+        canon = g.canonical_form()
+        u.clear()
+        self.assertEqual(len(u.canonicals), 0)
+        self.assertEqual(len(u.comparisons), 0)
+        self.assertEqual(len(u.outcomes), 0)
+        self.assertIs(g.canonical_form(), canon)
+
+    def test_number(self):
+        u = GameUniverse()
+        self.assertEqual(u.number(u.zero), 0)
+        self.assertEqual(u.number(Game("3")), 3)
+        self.assertEqual(u.number(Game("-2")), -2)
+        self.assertEqual(u.number(Game("{0|1}")), Fraction(1, 2))
+        self.assertEqual(u.number(Game("{{0|1}|1}")), Fraction(3, 4))
+        self.assertEqual(u.number(Game("{-1|{-1|0}}")), Fraction(-3, 4))
+
+        # Only canonical forms of numbers are recognised
+        self.assertIsNone(u.number(Game("{-1|1}")))
+        self.assertIsNone(u.number(Game("{0|2}")))
+        self.assertIsNone(u.number(Game("{0,1|}")))
+        self.assertIsNone(u.number(Game("*")))
+        self.assertIsNone(u.number(Game("^")))
+        self.assertIsNone(u.number(Game("{1|0}")))
+
+    def test_number_game(self):
+        u = GameUniverse()
+        self.assertIs(u.number_game(0), u.zero)
+        self.assertIs(u.number_game(2), u.from_cgn("2"))
+        self.assertIs(u.number_game(-1), u.from_cgn("-1"))
+        self.assertIs(u.number_game(Fraction(1, 2)), u.from_cgn("{0|1}"))
+        self.assertIs(u.number_game(Fraction(-5, 4)), u.from_cgn("{{-2|-1}|-1}"))
+        for value in [Fraction(7, 8), Fraction(-13, 16), 5]:
+            self.assertEqual(u.number(u.number_game(value)), value)
+        with self.assertRaises(ValueError):
+            u.number_game(Fraction(1, 3))
+        self.assertTrue(u.number_game(-5000) is u.from_cgn("-5000"))
+        self.assertEqual(u.number(u.number_game(Fraction(10001, 2))), Fraction(10001, 2))
+
+        # The numbers are kept in a bounded table
+        u = GameUniverse(table_size=2)
+        for value in [3, -2, 0, 5, Fraction(3, 4), 1]:
+            self.assertEqual(u.number(u.number_game(value)), value)
+        self.assertEqual(len(u._number_games), 2)
+
+    def test_number_shortcuts(self):
+        u = GameUniverse()
+        half = u.number_game(Fraction(1, 2))
+        quarter = u.number_game(Fraction(1, 4))
+        self.assertIs(half + quarter, u.number_game(Fraction(3, 4)))
+        self.assertIs(half + half, u.number_game(1))
+        self.assertIs(-quarter, u.number_game(Fraction(-1, 4)))
+        self.assertTrue(u.geq(half, quarter))
+        self.assertFalse(u.geq(quarter, half))
+        self.assertEqual(len(u.comparisons), 0)
+
+    def test_grundy(self):
+        u = GameUniverse()
+        self.assertEqual(u.grundy(u.zero), 0)
+        self.assertEqual(u.grundy(Game("*")), 1)
+        self.assertEqual(u.grundy(Game("*3")), 3)
+        self.assertEqual(u.grundy(Game("{*,*2|*2,*}")), 0)
+        self.assertEqual(u.grundy(Game("{0,*2|*2,0}")), 1)
+        self.assertEqual(u.grundy(Game("{0,0,*|*,0}")), 2)
+
+        # Partizan games
+        self.assertIsNone(u.grundy(Game("1")))
+        self.assertIsNone(u.grundy(Game("^")))
+        self.assertIsNone(u.grundy(Game("{*|*,1}")))
+        self.assertIsNone(u.grundy(Game("{^|^}")))
+
+    def test_nimber(self):
+        u = GameUniverse()
+        self.assertIs(u.nimber(0), u.zero)
+        self.assertIs(u.nimber(1), u.from_cgn("*"))
+        self.assertIs(u.nimber(3), u.from_cgn("*3"))
+        self.assertEqual(str(u.nimber(2)), "*2")
+        self.assertEqual(u.grundy(u.nimber(40)), 40)
+        self.assertIs(u.nimber(40).left_options[39], u.nimber(39))
+
+    def test_nimber_shortcuts(self):
+        u = GameUniverse()
+        self.assertIs(u.from_cgn("{0,*2|*2,0}").canonical_form(), u.nimber(1))
+        self.assertIs(u.from_cgn("{*,*2|*2,*}").canonical_form(), u.zero)
+        self.assertIs(u.nimber(5) + u.nimber(3), u.nimber(6))
+        self.assertIs(u.nimber(12) + u.nimber(12), u.zero)
+        self.assertIs(-u.nimber(7), u.nimber(7))
+        self.assertTrue(u.geq(u.nimber(30), u.nimber(30)))
+        self.assertFalse(u.geq(u.nimber(30), u.nimber(31)))
+        self.assertTrue(u.nimber(20).incomparable(u.nimber(21)))
+        self.assertEqual(len(u.comparisons), 0)